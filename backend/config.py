@@ -0,0 +1,131 @@
+# backend/config.py
+import os
+from dotenv import load_dotenv
+
+load_dotenv()
+
+# ✅ MongoDB (프로세스당 하나의 공유 클라이언트 / 커넥션 풀)
+MONGO_URI = os.getenv("MONGO_URI")
+DB_NAME = os.getenv("DB_NAME")
+COLLECTION_NAME = os.getenv("COLLECTION_NAME")
+MONGO_MAX_POOL_SIZE = int(os.getenv("MONGO_MAX_POOL_SIZE", "50"))
+
+# ✅ 프레젠테이션 저장 (내용 주소 파일 + MongoDB 메타데이터 인덱스, 묶음 쓰기)
+PRESENTATION_STORE_DIR = os.getenv("PRESENTATION_STORE_DIR", "storage/presentations")
+STORAGE_EXECUTOR_WORKERS = int(os.getenv("STORAGE_EXECUTOR_WORKERS", "8"))       # 저장소 I/O 스레드 수
+STORAGE_BATCH_SIZE = int(os.getenv("STORAGE_BATCH_SIZE", "64"))                  # 한 번에 기록할 최대 건수
+STORAGE_FLUSH_INTERVAL_SEC = float(os.getenv("STORAGE_FLUSH_INTERVAL_SEC", "0.5"))  # 최대 쓰기 지연
+STORAGE_WRITE_RETRIES = int(os.getenv("STORAGE_WRITE_RETRIES", "3"))            # 묶음 쓰기 실패 시 바로 재시도할 횟수
+STORAGE_RETRY_BACKOFF_SEC = float(os.getenv("STORAGE_RETRY_BACKOFF_SEC", "0.2"))  # 재시도 간격 (시도마다 두 배)
+STORAGE_REQUEUE_SEC = float(os.getenv("STORAGE_REQUEUE_SEC", "30"))              # 재시도도 실패한 기록을 다시 대기열에 넣기까지
+
+# ✅ 슬라이드 저장소 (슬라이드 텍스트는 내용 해시로 한 번만 보관, 그래프 상태에는 참조만)
+SLIDE_STORE_PATH = os.getenv("SLIDE_STORE_PATH", "storage/slides.sqlite")
+SLIDE_STORE_MEMORY_MB = float(os.getenv("SLIDE_STORE_MEMORY_MB", "64"))    # 메모리에 둘 슬라이드 최대 용량
+SLIDE_STORE_MAX_DISK_MB = float(os.getenv("SLIDE_STORE_MAX_DISK_MB", "1024"))  # 디스크 최대 용량 (넘으면 오래 안 쓴 것부터 삭제)
+STATE_MAX_MESSAGES = int(os.getenv("STATE_MAX_MESSAGES", "4"))              # 상태에 남길 최근 메시지 수 (0이면 전부)
+
+# ✅ LangGraph 체크포인터 (sqlite | mongo | memory)
+CHECKPOINT_BACKEND = os.getenv("CHECKPOINT_BACKEND", "sqlite")
+CHECKPOINT_SQLITE_PATH = os.getenv("CHECKPOINT_SQLITE_PATH", "storage/checkpoints.sqlite")
+
+# ✅ 사용자 피드백 대기 (스레드별 채널)
+FEEDBACK_TIMEOUT_SEC = float(os.getenv("FEEDBACK_TIMEOUT_SEC", "600"))      # 피드백 없으면 그대로 진행
+FEEDBACK_MAX_WAITING = int(os.getenv("FEEDBACK_MAX_WAITING", "500"))        # 동시에 대기 가능한 세션 수
+FEEDBACK_CHANNEL_TTL_SEC = float(os.getenv("FEEDBACK_CHANNEL_TTL_SEC", "900"))  # 대기자 없는 채널 보관 시간
+FEEDBACK_MAX_PENDING = int(os.getenv("FEEDBACK_MAX_PENDING", "8"))          # 채널당 쌓아 둘 수 있는 피드백 수
+FEEDBACK_MAX_ROUNDS = int(os.getenv("FEEDBACK_MAX_ROUNDS", "5"))            # 수정 요청으로 다시 도는 최대 횟수
+
+# ✅ LLM 응답 캐시 (메모리 LRU + 디스크 SQLite)
+LLM_CACHE_ENABLED = os.getenv("LLM_CACHE_ENABLED", "true").lower() == "true"
+LLM_CACHE_MEMORY_ITEMS = int(os.getenv("LLM_CACHE_MEMORY_ITEMS", "1024"))
+LLM_CACHE_PATH = os.getenv("LLM_CACHE_PATH", "storage/llm_cache.sqlite")
+LLM_CACHE_MAX_DISK_MB = float(os.getenv("LLM_CACHE_MAX_DISK_MB", "256"))
+LLM_CACHE_TTL_SEC = float(os.getenv("LLM_CACHE_TTL_SEC", str(7 * 24 * 3600)))
+# temperature > 0 인 호출(창작형: 디자인 / 요약 / 스크립트 등)은 기본적으로 캐시하지 않음 (같은 입력에도 매번 새 결과)
+# 그래도 캐시할 agent 이름 (쉼표 구분, 예: "check_relevance,condense_slides")
+LLM_CACHE_OPT_IN = {a.strip() for a in os.getenv("LLM_CACHE_OPT_IN", "").split(",") if a.strip()}
+# temperature 와 관계없이 캐시하지 않을 agent 이름 (쉼표 구분, 예: "generate_outline")
+LLM_CACHE_OPT_OUT = {a.strip() for a in os.getenv("LLM_CACHE_OPT_OUT", "").split(",") if a.strip()}
+
+# ✅ 개요 보강(refine) 병렬 처리
+REFINE_CONCURRENCY = int(os.getenv("REFINE_CONCURRENCY", "4"))
+REFINE_MAX_RETRIES = int(os.getenv("REFINE_MAX_RETRIES", "2"))
+REFINE_RETRY_BACKOFF_SEC = float(os.getenv("REFINE_RETRY_BACKOFF_SEC", "0.5"))
+# 개요를 스트리밍으로 받는 동안 항목이 완성되는 즉시 보강을 미리 시작
+REFINE_PREFETCH = os.getenv("REFINE_PREFETCH", "true").lower() == "true"
+
+# ✅ LLM / DALL·E 호출 스케줄러 (모델별 RPM·TPM 토큰 버킷 + 동시 실행 제한)
+def _parse_rate_limits(value: str):
+    """'model=rpm:tpm,...' → {model: (rpm, tpm)} (0이면 제한 없음)"""
+    limits = {}
+    for item in filter(None, (v.strip() for v in value.split(","))):
+        model, _, rates = item.partition("=")
+        rpm, _, tpm = rates.partition(":")
+        limits[model.strip()] = (int(rpm or 0), int(tpm or 0))
+    return limits
+
+
+SCHEDULER_RATE_LIMITS = _parse_rate_limits(
+    os.getenv("SCHEDULER_RATE_LIMITS", "gpt-4o-mini=500:200000,dall-e-3=7:0")
+)
+SCHEDULER_MAX_IN_FLIGHT = int(os.getenv("SCHEDULER_MAX_IN_FLIGHT", "16"))   # 모델별 동시 호출 수
+SCHEDULER_MAX_RETRIES = int(os.getenv("SCHEDULER_MAX_RETRIES", "4"))
+SCHEDULER_RETRY_BACKOFF_SEC = float(os.getenv("SCHEDULER_RETRY_BACKOFF_SEC", "1.0"))
+
+# ✅ 프롬프트 토큰 예산 (agent별 슬라이드 문맥 토큰 수, 넘으면 묶음별로 압축한 뒤 합침)
+def _parse_budgets(value: str):
+    """'agent=tokens,...' → {agent: tokens}"""
+    budgets = {}
+    for item in filter(None, (v.strip() for v in value.split(","))):
+        agent, _, tokens = item.partition("=")
+        budgets[agent.strip()] = int(tokens)
+    return budgets
+
+
+PROMPT_TOKEN_BUDGETS = _parse_budgets(os.getenv(
+    "PROMPT_TOKEN_BUDGETS",
+    "generate_summary=4000,generate_narration=8000,condense_slides=3000",
+))
+PROMPT_TOKENIZER = os.getenv("PROMPT_TOKENIZER", "tiktoken")       # tiktoken | estimate (바이트 길이 기반 추정)
+PROMPT_TOKENIZER_MODEL = os.getenv("PROMPT_TOKENIZER_MODEL", "gpt-4o-mini")
+
+# ✅ LLM 응답 스트리밍 (디자인 / 요약 / 스크립트 생성 중 조각을 이벤트로 전송, 구독자가 있을 때만)
+LLM_STREAMING = os.getenv("LLM_STREAMING", "true").lower() == "true"
+STREAM_TOKEN_INTERVAL_SEC = float(os.getenv("STREAM_TOKEN_INTERVAL_SEC", "0.05"))  # 조각을 모아 보내는 간격
+
+# ✅ 이미지 저장소 (내용 주소 기반, 개념/설명 해시로 재사용)
+IMAGE_STORE_DIR = os.getenv("IMAGE_STORE_DIR", "storage/images")
+IMAGE_STORE_MAX_MB = float(os.getenv("IMAGE_STORE_MAX_MB", "1024"))
+IMAGE_PUBLIC_BASE = os.getenv("IMAGE_PUBLIC_BASE", "/images")   # 슬라이드 Markdown에서 참조할 경로
+
+# ✅ 백그라운드 작업 큐 (SQLite, 외부 서비스 불필요)
+JOB_DB_PATH = os.getenv("JOB_DB_PATH", "storage/jobs.sqlite")
+JOB_WORKERS = int(os.getenv("JOB_WORKERS", "2"))                   # 노드당 워커 프로세스 수
+JOB_POLL_INTERVAL_SEC = float(os.getenv("JOB_POLL_INTERVAL_SEC", "1.0"))
+JOB_LEASE_SEC = float(os.getenv("JOB_LEASE_SEC", "60"))            # 하트비트 없이 이만큼 지나면 다른 워커가 다시 가져감
+JOB_MAX_ATTEMPTS = int(os.getenv("JOB_MAX_ATTEMPTS", "3"))          # 임대가 만료되어 다시 가져가는 최대 횟수
+
+# ✅ API 동시 실행 제한 (워커 프로세스당, 피드백을 기다리는 실행은 슬롯을 내려놓음)
+ADMISSION_MAX_RUNNING = int(os.getenv("ADMISSION_MAX_RUNNING", "32"))       # 동시에 실행할 그래프 수
+ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "64"))           # 대기열이 가득 차면 바로 429
+ADMISSION_QUEUE_TIMEOUT_SEC = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_SEC", "30"))  # 더 기다려야 하면 503
+ADMISSION_RETRY_AFTER_SEC = int(os.getenv("ADMISSION_RETRY_AFTER_SEC", "5"))  # Retry-After 최솟값 (초)
+
+# ✅ JSONL 일괄 생성 (피드백 없이 여러 덱을 동시에, 결과는 출력 디렉터리에 기록)
+BATCH_PARALLELISM = int(os.getenv("BATCH_PARALLELISM", "4"))         # 동시에 실행할 덱 수
+BATCH_OUTPUT_DIR = os.getenv("BATCH_OUTPUT_DIR", "storage/batches")
+# 일괄 생성에서는 창작형 호출도 덱 사이에 공유 (같은 프롬프트면 같은 결과, 그 배치 안에서만 — 영구 캐시에는 쓰지 않음)
+BATCH_SHARE_CREATIVE = os.getenv("BATCH_SHARE_CREATIVE", "true").lower() == "true"
+
+# ✅ PDF / PPTX 내보내기 (marp CLI 묶음 실행 + 결과 캐시)
+MARP_BIN = os.getenv("MARP_BIN", "marp")
+RENDER_WORKERS = int(os.getenv("RENDER_WORKERS", "2"))                # 동시에 실행할 marp 프로세스 수
+RENDER_BATCH_SIZE = int(os.getenv("RENDER_BATCH_SIZE", "8"))          # marp 한 번에 변환할 덱 수
+RENDER_QUEUE_MAX = int(os.getenv("RENDER_QUEUE_MAX", "64"))           # 넘으면 503 (backpressure)
+RENDER_TIMEOUT_SEC = float(os.getenv("RENDER_TIMEOUT_SEC", "180"))
+RENDER_CACHE_DIR = os.getenv("RENDER_CACHE_DIR", "storage/renders")
+RENDER_CACHE_MAX_MB = float(os.getenv("RENDER_CACHE_MAX_MB", "512"))
+
+# ✅ HTML 미리보기 (슬라이드별 HTML 캐시 항목 수)
+PREVIEW_CACHE_ITEMS = int(os.getenv("PREVIEW_CACHE_ITEMS", "4096"))
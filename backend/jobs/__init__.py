@@ -0,0 +1,3 @@
+from .queue import JobQueue, JobStatus
+
+__all__ = ["JobQueue", "JobStatus"]
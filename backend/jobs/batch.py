@@ -0,0 +1,242 @@
+"""
+JSONL 일괄 생성 (웹 스택 없이 실행).
+
+    python -m backend.jobs.batch decks.jsonl [--out DIR] [--parallel N]
+
+입력 파일의 한 줄은 {"topic": ..., "style": ..., "message": ...} (선택: "id").
+피드백 단계 없이 (skip_feedback) 최대 N개의 덱을 동시에 생성하고, 덱이 끝나는 대로
+<out>/<번호>-<id>/slides.md, summary.md, script.md 를 쓰고 <out>/results.jsonl 에 한 줄씩 추가한다.
+slides.md 의 이미지는 이미지 저장소 파일을 file:// URL 로 가리킨다 (웹 서버 없이 marp 로 열 수 있도록).
+모든 덱이 끝나면 처리량과 덱별 소요 시간을 <out>/summary.json 에 기록한다.
+
+덱 사이의 같은 하위 요청은 한 번만 실행된다 (창작형 호출 포함, BATCH_SHARE_CREATIVE=false 면 temperature 0 호출만).
+- 같은 프롬프트의 LLM 호출 (같은 개요 보강, 같은 스타일 / 슬라이드의 디자인, 같은 주제 / 개념의 이미지 설명):
+  진행 중 호출 공유 (single-flight) + temperature 0 호출은 LLM 캐시, 창작형 호출은 이 배치 안에서만 쓰는 dict
+  (창작형 응답은 영구 캐시에 남기지 않으므로 다른 배치 / 요청은 새로 생성한다)
+- 같은 (주제, 개념)의 이미지: 이미지 저장소
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import re
+import threading
+import uuid
+from time import perf_counter
+from typing import Any, Dict, Iterable, List, Optional
+
+from backend.config import BATCH_OUTPUT_DIR, BATCH_PARALLELISM, BATCH_SHARE_CREATIVE
+from backend.storage.persistence import run_in_storage
+
+logger = logging.getLogger(__name__)
+
+REQUIRED_FIELDS = ("topic", "style", "message")
+OUTPUT_FILES = (("slides_marp", "slides.md"), ("summary", "summary.md"), ("script", "script.md"))
+_UNSAFE = re.compile(r"[^\w.-]+")
+
+
+def parse_records(lines: Iterable[str]) -> List[Dict[str, str]]:
+    """JSONL 줄들을 레코드 목록으로 (빈 줄은 무시, 형식이 틀리면 줄 번호와 함께 ValueError)"""
+    records = []
+    for lineno, line in enumerate(lines, 1):
+        if not line.strip():
+            continue
+        try:
+            data = json.loads(line)
+        except json.JSONDecodeError as e:
+            raise ValueError(f"line {lineno}: invalid JSON ({e.msg})") from None
+        if not isinstance(data, dict):
+            raise ValueError(f"line {lineno}: expected a JSON object")
+        missing = [k for k in REQUIRED_FIELDS if not isinstance(data.get(k), str)]
+        if missing:
+            raise ValueError(f"line {lineno}: missing {', '.join(missing)}")
+        records.append({**{k: data[k] for k in REQUIRED_FIELDS}, "id": str(data.get("id") or len(records) + 1)})
+    return records
+
+
+def load_records(path: str) -> List[Dict[str, str]]:
+    with open(path, encoding="utf-8") as f:
+        return parse_records(f)
+
+
+def _percentile(values: List[float], q: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(q * len(ordered)))]
+
+
+class BatchRun:
+    """JSONL 일괄 생성 한 건 (진행 상황 / 결과 / 처리량)"""
+
+    def __init__(self, records: List[Dict[str, str]], out_dir: Optional[str] = None,
+                 parallel: int = BATCH_PARALLELISM, batch_id: Optional[str] = None):
+        self.id = batch_id or uuid.uuid4().hex[:12]
+        self.records = records
+        self.out_dir = out_dir or os.path.join(BATCH_OUTPUT_DIR, self.id)
+        self.parallel = max(1, parallel)
+        self.status = "pending"
+        self.results: List[Dict[str, Any]] = []
+        self.started: Optional[float] = None
+        self.seconds = 0.0
+        self._shared_before = 0
+        self._shared = 0
+        self._task: Optional[asyncio.Task] = None
+        self._file_lock = threading.Lock()
+
+    # 🟢 출력 (저장소 스레드에서 실행)
+    def _write_record(self, index: int, record: Dict[str, str], entry: Dict[str, Any], presentation: Dict[str, Any]):
+        from backend.workflow.providers import providers
+
+        directory = os.path.join(self.out_dir, f"{index:04d}-{_UNSAFE.sub('_', record['id'])[:64]}")
+        files = {}
+        for key, name in OUTPUT_FILES:
+            if presentation.get(key):
+                os.makedirs(directory, exist_ok=True)
+                path = os.path.join(directory, name)
+                # slides.md 는 웹 서버 없이 열리므로 이미지 참조를 저장소 파일 경로로
+                text = providers.image_store.localize(presentation[key]) if key == "slides_marp" else presentation[key]
+                with open(path, "w", encoding="utf-8") as f:
+                    f.write(text)
+                files[key] = path
+        entry["files"] = files
+        with self._file_lock, open(os.path.join(self.out_dir, "results.jsonl"), "a", encoding="utf-8") as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + "\n")
+
+    def _write_summary(self, summary: Dict[str, Any]):
+        with open(os.path.join(self.out_dir, "summary.json"), "w", encoding="utf-8") as f:
+            json.dump(summary, f, ensure_ascii=False, indent=2)
+
+    # 🟢 실행
+    async def _run_record(self, index: int, record: Dict[str, str], semaphore: asyncio.Semaphore):
+        from backend.workflow import generate_presentation
+
+        thread_id = f"batch-{self.id}-{index}"
+        user_input = {**{k: record[k] for k in REQUIRED_FIELDS}, "skip_feedback": True}
+        async with semaphore:
+            start = perf_counter()
+            try:
+                presentation = await generate_presentation(user_input, thread_id)
+                if presentation.get("status") == "failed":
+                    error = "workflow failed"
+                else:
+                    error = None if presentation.get("slides_marp") else "workflow did not finish"
+            except Exception as e:
+                logger.exception("Batch %s record %s failed", self.id, record["id"])
+                presentation, error = {}, str(e)
+            seconds = perf_counter() - start
+
+        run = presentation.get("metrics") or {}
+        entry = {
+            "index": index,
+            "id": record["id"],
+            "topic": record["topic"],
+            "thread_id": thread_id,
+            "status": "failed" if error else "succeeded",
+            "seconds": round(seconds, 3),
+            "slides": run.get("slides", 0),
+            "cache": run.get("cache"),
+            "error": error,
+        }
+        await run_in_storage(self._write_record, index, record, entry, presentation)
+        self.results.append(entry)
+        logger.info("Batch %s: %d/%d done (%s, %.2fs)", self.id, len(self.results), len(self.records),
+                    entry["status"], seconds)
+
+    async def run(self) -> Dict[str, Any]:
+        """모든 레코드를 parallel 개씩 동시에 실행하고 요약을 반환"""
+        from backend.workflow.llm_cache import creative_share, llm_cache
+
+        self.status = "running"
+        self.started = perf_counter()
+        self._shared_before = llm_cache.inflight.joined
+        await run_in_storage(lambda: os.makedirs(self.out_dir, exist_ok=True))
+        semaphore = asyncio.Semaphore(self.parallel)
+        token = creative_share.set({} if BATCH_SHARE_CREATIVE else None)  # gather 로 만든 레코드 태스크에 전파
+        try:
+            await asyncio.gather(*(self._run_record(i, r, semaphore) for i, r in enumerate(self.records, 1)))
+            self.status = "finished"
+        except BaseException:
+            self.status = "failed"
+            raise
+        finally:
+            creative_share.reset(token)
+            self.seconds = perf_counter() - self.started
+            self._shared = llm_cache.inflight.joined - self._shared_before
+        summary = self.summary()
+        await run_in_storage(self._write_summary, summary)
+        return summary
+
+    def start(self) -> asyncio.Task:
+        """백그라운드에서 실행 (API용)"""
+        if self._task is None:
+            self._task = asyncio.create_task(self.run())
+            self._task.add_done_callback(self._log_failure)
+        return self._task
+
+    def _log_failure(self, task: asyncio.Task):
+        if not task.cancelled() and task.exception() is not None:
+            logger.error("Batch %s failed: %s", self.id, task.exception())
+
+    # 🟢 진행 상황 / 처리량
+    def summary(self) -> Dict[str, Any]:
+        done = sorted(self.results, key=lambda r: r["index"])
+        succeeded = [r for r in done if r["status"] == "succeeded"]
+        if self.status == "running":
+            from backend.workflow.llm_cache import llm_cache
+
+            elapsed, shared = perf_counter() - self.started, llm_cache.inflight.joined - self._shared_before
+        else:
+            elapsed, shared = self.seconds, self._shared
+        times = [r["seconds"] for r in done]
+        slides = sum(r["slides"] for r in succeeded)
+        return {
+            "batch_id": self.id,
+            "status": self.status,
+            "out_dir": self.out_dir,
+            "parallel": self.parallel,
+            "records": len(self.records),
+            "finished": len(done),
+            "succeeded": len(succeeded),
+            "failed": len(done) - len(succeeded),
+            "seconds": round(elapsed, 3),
+            "throughput": {
+                "decks_per_min": round(len(succeeded) / elapsed * 60, 2) if elapsed else 0.0,
+                "slides_per_sec": round(slides / elapsed, 2) if elapsed else 0.0,
+            },
+            "record_seconds": {
+                "p50": _percentile(times, 0.5),
+                "p95": _percentile(times, 0.95),
+                "max": max(times, default=0.0),
+            },
+            # 프로세스 전체 기준 (같은 프로세스에서 다른 세션이 돌고 있으면 그 공유분도 포함)
+            "llm_calls_shared": shared,
+            "results": done,
+        }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate presentations from a JSONL file of {topic, style, message}")
+    parser.add_argument("input", help="JSONL file, one record per line")
+    parser.add_argument("--out", default=None, help=f"output directory (default: {BATCH_OUTPUT_DIR}/<batch id>)")
+    parser.add_argument("--parallel", type=int, default=BATCH_PARALLELISM, help="decks generated at the same time")
+    args = parser.parse_args()
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(name)s %(message)s")
+
+    batch = BatchRun(load_records(args.input), args.out, args.parallel)
+
+    async def run() -> Dict[str, Any]:
+        try:
+            return await batch.run()
+        finally:
+            from backend.workflow import shutdown_workflows
+
+            await shutdown_workflows()
+
+    summary = asyncio.run(run())
+    print(json.dumps({k: v for k, v in summary.items() if k != "results"}, ensure_ascii=False, indent=2))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,185 @@
+import json
+import os
+import sqlite3
+import threading
+import uuid
+from time import time
+from typing import Any, Dict, Optional
+
+from backend.config import JOB_DB_PATH, JOB_LEASE_SEC, JOB_MAX_ATTEMPTS
+
+
+class JobStatus:
+    QUEUED = "queued"
+    RUNNING = "running"
+    SUCCEEDED = "succeeded"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+    FINISHED = (SUCCEEDED, FAILED, CANCELLED)
+
+
+class JobQueue:
+    """
+    SQLite 기반 작업 큐 (API 프로세스와 워커 프로세스가 같은 파일을 공유).
+    - 우선순위가 높은 작업부터, 같으면 먼저 들어온 작업부터 꺼냄
+    - claim()은 BEGIN IMMEDIATE 트랜잭션으로 여러 워커가 같은 작업을 가져가지 않게 함
+    - 실행 중인 작업의 취소는 cancel_requested 표시 → 워커가 확인 후 중단
+    - claim()한 워커는 lease 초 동안 작업을 임대하고 heartbeat()로 연장한다. 워커가 죽어 임대가 만료되면
+      다음 claim()이 작업을 대기열로 되돌리고 (max_attempts 번째였다면 실패, 취소 요청이 있었다면 취소로 마무리)
+    연결 하나를 여러 스레드(API 의 저장소 스레드 풀)가 함께 쓰므로 호출은 잠금으로 직렬화한다.
+    """
+
+    def __init__(self, path: str = JOB_DB_PATH, lease: float = JOB_LEASE_SEC, max_attempts: int = JOB_MAX_ATTEMPTS):
+        os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+        self.path = path
+        self.lease = lease
+        self.max_attempts = max_attempts
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, timeout=30, isolation_level=None, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS jobs (
+                id TEXT PRIMARY KEY,
+                status TEXT NOT NULL,
+                priority INTEGER NOT NULL DEFAULT 0,
+                payload TEXT NOT NULL,
+                result TEXT,
+                error TEXT,
+                worker TEXT,
+                cancel_requested INTEGER NOT NULL DEFAULT 0,
+                created REAL NOT NULL,
+                started REAL,
+                finished REAL,
+                lease_until REAL,
+                attempts INTEGER NOT NULL DEFAULT 0
+            );
+            CREATE INDEX IF NOT EXISTS jobs_pending ON jobs(status, priority DESC, created);
+            """
+        )
+        columns = {row[1] for row in self._conn.execute("PRAGMA table_info(jobs)")}
+        if "lease_until" not in columns:  # 임대 도입 전에 만든 파일
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN lease_until REAL")
+            self._conn.execute("ALTER TABLE jobs ADD COLUMN attempts INTEGER NOT NULL DEFAULT 0")
+        self._conn.execute("CREATE INDEX IF NOT EXISTS jobs_lease ON jobs(status, lease_until)")
+
+    def enqueue(self, payload: Dict[str, Any], priority: int = 0) -> str:
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            self._conn.execute(
+                "INSERT INTO jobs (id, status, priority, payload, created) VALUES (?, ?, ?, ?, ?)",
+                (job_id, JobStatus.QUEUED, priority, json.dumps(payload, ensure_ascii=False), time()),
+            )
+        return job_id
+
+    def _reclaim_expired(self, now: float):
+        """임대가 만료된 실행 중 작업 정리 (claim 트랜잭션 안에서 호출)"""
+        self._conn.execute(
+            "UPDATE jobs SET status = ?, finished = ?, lease_until = NULL "
+            "WHERE status = ? AND lease_until < ? AND cancel_requested = 1",
+            (JobStatus.CANCELLED, now, JobStatus.RUNNING, now),
+        )
+        self._conn.execute(
+            "UPDATE jobs SET status = ?, error = ?, finished = ?, lease_until = NULL "
+            "WHERE status = ? AND lease_until < ? AND attempts >= ?",
+            (JobStatus.FAILED, "worker lease expired", now, JobStatus.RUNNING, now, self.max_attempts),
+        )
+        self._conn.execute(
+            "UPDATE jobs SET status = ?, worker = NULL, lease_until = NULL WHERE status = ? AND lease_until < ?",
+            (JobStatus.QUEUED, JobStatus.RUNNING, now),
+        )
+
+    def claim(self, worker: str) -> Optional[Dict[str, Any]]:
+        """대기 중인 작업 하나를 원자적으로 가져와 running으로 표시 (임대가 만료된 작업은 먼저 되돌림)"""
+        with self._lock:
+            self._conn.execute("BEGIN IMMEDIATE")
+            try:
+                now = time()
+                self._reclaim_expired(now)
+                row = self._conn.execute(
+                    "SELECT id FROM jobs WHERE status = ? ORDER BY priority DESC, created LIMIT 1",
+                    (JobStatus.QUEUED,),
+                ).fetchone()
+                if row is None:
+                    self._conn.execute("COMMIT")
+                    return None
+                self._conn.execute(
+                    "UPDATE jobs SET status = ?, worker = ?, started = ?, lease_until = ?, attempts = attempts + 1 "
+                    "WHERE id = ?",
+                    (JobStatus.RUNNING, worker, now, now + self.lease, row["id"]),
+                )
+                self._conn.execute("COMMIT")
+            except Exception:
+                self._conn.execute("ROLLBACK")
+                raise
+            return self.get(row["id"])
+
+    def heartbeat(self, job_id: str, worker: str) -> bool:
+        """임대 연장. 임대를 잃었으면 (만료되어 다시 대기열로 갔거나 끝남) False → 워커는 작업을 멈춰야 함"""
+        with self._lock:
+            cur = self._conn.execute(
+                "UPDATE jobs SET lease_until = ? WHERE id = ? AND worker = ? AND status = ?",
+                (time() + self.lease, job_id, worker, JobStatus.RUNNING),
+            )
+        return bool(cur.rowcount)
+
+    def _finish(self, job_id: str, status: str, result: Any = None, error: Optional[str] = None):
+        with self._lock:
+            self._conn.execute(
+                "UPDATE jobs SET status = ?, result = ?, error = ?, finished = ?, lease_until = NULL WHERE id = ?",
+                (
+                    status,
+                    json.dumps(result, ensure_ascii=False, default=str) if result is not None else None,
+                    error,
+                    time(),
+                    job_id,
+                ),
+            )
+
+    def complete(self, job_id: str, result: Any):
+        self._finish(job_id, JobStatus.SUCCEEDED, result=result)
+
+    def fail(self, job_id: str, error: str):
+        self._finish(job_id, JobStatus.FAILED, error=error)
+
+    def mark_cancelled(self, job_id: str):
+        self._finish(job_id, JobStatus.CANCELLED)
+
+    def cancel(self, job_id: str) -> bool:
+        """대기 중이면 바로 취소, 실행 중이면 취소 요청만 표시. 이미 끝난 작업이면 False."""
+        with self._lock:
+            cur = self._conn.execute(
+                "UPDATE jobs SET status = ?, finished = ? WHERE id = ? AND status = ?",
+                (JobStatus.CANCELLED, time(), job_id, JobStatus.QUEUED),
+            )
+            if cur.rowcount:
+                return True
+            cur = self._conn.execute(
+                "UPDATE jobs SET cancel_requested = 1 WHERE id = ? AND status = ?",
+                (job_id, JobStatus.RUNNING),
+            )
+        return bool(cur.rowcount)
+
+    def is_cancel_requested(self, job_id: str) -> bool:
+        with self._lock:
+            row = self._conn.execute("SELECT cancel_requested FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        return bool(row and row["cancel_requested"])
+
+    def get(self, job_id: str, with_result: bool = False) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM jobs WHERE id = ?", (job_id,)).fetchone()
+        if row is None:
+            return None
+        job = {k: row[k] for k in row.keys() if k != "result"}
+        job["payload"] = json.loads(row["payload"])
+        job["cancel_requested"] = bool(row["cancel_requested"])
+        if with_result:
+            job["result"] = json.loads(row["result"]) if row["result"] else None
+        return job
+
+    def queue_depth(self) -> Dict[str, int]:
+        with self._lock:
+            rows = self._conn.execute("SELECT status, COUNT(*) AS n FROM jobs GROUP BY status").fetchall()
+        return {row["status"]: row["n"] for row in rows}
@@ -0,0 +1,139 @@
+"""
+프레젠테이션 생성 워커 (웹 스택 없이 실행).
+
+    python -m backend.jobs.worker [--workers N]
+
+각 워커 프로세스는 JobQueue에서 작업을 하나씩 꺼내 워크플로우를 실행한다.
+작업은 사람의 피드백을 기다리지 않고 끝까지 진행한다 (skip_feedback).
+"""
+import argparse
+import asyncio
+import logging
+import multiprocessing
+import os
+import signal
+from time import monotonic, sleep
+
+from backend.config import JOB_POLL_INTERVAL_SEC, JOB_WORKERS
+from .queue import JobQueue
+
+logger = logging.getLogger(__name__)
+
+
+async def _stop(task: asyncio.Task):
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+
+
+async def _execute(queue: JobQueue, job: dict, worker_id: str):
+    from backend.workflow import generate_presentation
+
+    payload = job["payload"]
+    user_input = {**payload["input"], "skip_feedback": True}
+    task = asyncio.create_task(generate_presentation(user_input, payload.get("thread_id") or job["id"]))
+
+    # 실행 중 취소 요청 확인 + 임대 연장 (임대의 1/3 마다, SQLite 호출은 스레드에서)
+    renewed = monotonic()
+    while not task.done():
+        await asyncio.wait({task}, timeout=JOB_POLL_INTERVAL_SEC)
+        if task.done():
+            break
+        if await asyncio.to_thread(queue.is_cancel_requested, job["id"]):
+            await _stop(task)
+            await asyncio.to_thread(queue.mark_cancelled, job["id"])
+            logger.info("Job %s cancelled", job["id"])
+            return
+        if monotonic() - renewed >= queue.lease / 3:
+            if not await asyncio.to_thread(queue.heartbeat, job["id"], worker_id):
+                # 임대가 만료되어 다른 워커가 가져갔거나 이미 끝남 → 결과를 쓰지 않고 멈춤
+                await _stop(task)
+                logger.warning("Job %s lease lost; stopped without recording a result", job["id"])
+                return
+            renewed = monotonic()
+
+    try:
+        presentation = task.result()
+    except Exception as e:
+        queue.fail(job["id"], str(e))
+        logger.exception("Job %s failed", job["id"])
+        return
+    # generate_presentation 은 워크플로우 예외를 잡고 부분 결과를 돌려주므로 결과로 성공 여부를 판단
+    if presentation.get("status") == "failed" or not presentation.get("slides_marp"):
+        queue.fail(job["id"], "workflow failed" if presentation.get("status") == "failed" else "workflow did not finish")
+        logger.error("Job %s failed", job["id"])
+        return
+    queue.complete(job["id"], presentation)
+    logger.info("Job %s succeeded", job["id"])
+
+
+def run_worker(worker_id: str):
+    """작업을 하나씩 꺼내 실행하는 워커 루프 (SIGTERM 시 현재 작업을 마치고 종료)"""
+    queue = JobQueue()
+    stopping = False
+
+    def stop(*_):
+        nonlocal stopping
+        stopping = True
+
+    signal.signal(signal.SIGTERM, stop)
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    logging.basicConfig(level=logging.INFO, format="%(asctime)s %(processName)s %(name)s %(message)s")
+    logger.info("Worker %s started (pid %d)", worker_id, os.getpid())
+    try:
+        while not stopping:
+            job = queue.claim(worker_id)
+            if job is None:
+                sleep(JOB_POLL_INTERVAL_SEC)
+                continue
+            loop.run_until_complete(_execute(queue, job, worker_id))
+    finally:
+        from backend.workflow import shutdown_workflows
+
+        loop.run_until_complete(shutdown_workflows())
+        loop.close()
+
+
+class WorkerPool:
+    """워커 프로세스 묶음"""
+
+    def __init__(self, workers: int = JOB_WORKERS):
+        self.workers = workers
+        self.processes = []
+
+    def start(self):
+        ctx = multiprocessing.get_context("spawn")
+        for i in range(self.workers):
+            p = ctx.Process(target=run_worker, args=(f"{os.uname().nodename}-{os.getpid()}-{i}",), daemon=False)
+            p.start()
+            self.processes.append(p)
+
+    def stop(self):
+        for p in self.processes:
+            p.terminate()
+        for p in self.processes:
+            p.join()
+
+    def join(self):
+        for p in self.processes:
+            p.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Presentation generation worker pool")
+    parser.add_argument("--workers", type=int, default=JOB_WORKERS)
+    args = parser.parse_args()
+
+    pool = WorkerPool(args.workers)
+    pool.start()
+    try:
+        pool.join()
+    except KeyboardInterrupt:
+        pool.stop()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,13 +1,33 @@
 from fastapi import FastAPI, Request, HTTPException
-from fastapi.responses import HTMLResponse
+from fastapi.responses import FileResponse, HTMLResponse, StreamingResponse, PlainTextResponse
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.templating import Jinja2Templates
+from fastapi.staticfiles import StaticFiles
 from pydantic import BaseModel
-from backend.workflow import generate_presentation, feedback_queue
-from backend.storage import FileManager
-from backend.presentation_engine import MarpRenderer
+import asyncio
+import json
+import logging
+from typing import Dict, List, Optional, Set
+from starlette.background import BackgroundTask
+from backend.config import BATCH_PARALLELISM, IMAGE_PUBLIC_BASE, IMAGE_STORE_DIR
+from backend.workflow import generate_presentation, stream_presentation, shutdown_workflows, format_sse, feedback_broker, graph_registry, DEFAULT_WORKFLOW
+from backend.workflow.scheduler import scheduler
+from backend.workflow.prompt_packing import load_encoder
+from backend.utils.metrics import metrics
+from backend.utils.admission import AdmissionRejected, admission
+from backend.utils.singleflight import SingleFlight
+from backend.utils.text_utils import content_hash
+from backend.storage import file_manager, close_mongo_client
+from backend.storage.file_manager import close_http_client
+from backend.storage.persistence import run_in_storage
+from backend.workflow.providers import providers
+from backend.presentation_engine.render_service import RenderError, RenderQueueFull, render_service
+from backend.jobs import JobStatus
+from backend.jobs.batch import BatchRun, parse_records
 
 
+logger = logging.getLogger(__name__)
+
 app = FastAPI(title="Auto-Presentation Generator 🚀")
 app.add_middleware(
     CORSMiddleware,
@@ -17,18 +37,54 @@ app.add_middleware(
     allow_headers=["*"],
 )
 templates = Jinja2Templates(directory="templates")
+# 이미지 저장소 디렉터리는 시작 시 만들어지므로 import 시점에는 확인하지 않음
+app.mount(IMAGE_PUBLIC_BASE, StaticFiles(directory=IMAGE_STORE_DIR, check_dir=False), name="images")
+
+
+batch_runs: Dict[str, BatchRun] = {}
+# 진행 중인 생성 요청 (thread_id / 요청 내용 해시 → 실행 하나), 스트리밍 중인 thread_id
+presentation_runs: SingleFlight[dict] = SingleFlight("presentation")
+streaming_threads: Set[str] = set()
 
+@app.on_event("startup")
+async def warmup_workflows():
+    """서버 시작 시 기본 워크플로우 그래프를 미리 컴파일 (staged 는 필요할 때 컴파일)하고 토큰 인코더와 저장소를 불러옴"""
+    graph_registry.warmup(DEFAULT_WORKFLOW)
+    await asyncio.to_thread(load_encoder)
+    await run_in_storage(providers.get, "image_store")
+    await run_in_storage(providers.get, "job_queue")
+
+
+@app.on_event("shutdown")
+async def close_clients():
+    """공유 HTTP / MongoDB 커넥션 풀과 체크포인터 연결 정리"""
+    await close_http_client()
+    await shutdown_workflows()
+    unwritten = await file_manager.flush()
+    if unwritten:
+        logger.error("Shutting down with %d presentation version(s) not written to storage", unwritten)
+    await render_service.close()
+    close_mongo_client()
 
-file_manager = FileManager()
-renderer = MarpRenderer()
 
 class UserInput(BaseModel):
     message: str
     topic: str
     style: str
+    skip_feedback: bool = False  # 피드백을 기다리지 않고 끝까지 생성
 
 class FeedbackInput(BaseModel):
     feedback: str
+    slides: List[int] = []    # 수정할 슬라이드 번호 (1부터, 비우면 전체 대상)
+    outlines: List[int] = []  # 수정할 개요 번호 (1부터)
+
+class PreviewDiffInput(BaseModel):
+    hashes: List[str] = []
+    version: Optional[int] = None
+
+class JobInput(UserInput):
+    thread_id: Optional[str] = None
+    priority: int = 0
 
 @app.get("/", response_class=HTMLResponse)
 async def serve_html(request: Request):
@@ -38,23 +94,246 @@ async def serve_html(request: Request):
     return templates.TemplateResponse("index.html", {"request": request})
 
 
+def _request_key(user_input: UserInput) -> str:
+    return content_hash(json.dumps(user_input.model_dump(), sort_keys=True))
+
+def _busy(e: AdmissionRejected) -> HTTPException:
+    return HTTPException(status_code=e.status_code, detail=f"Server is busy: {e}",
+                         headers={"Retry-After": str(e.retry_after)})
+
+def _already_streaming(thread_id: str) -> HTTPException:
+    return HTTPException(status_code=409, detail=f"Presentation for thread {thread_id} is already being streamed")
+
+def _different_request(thread_id: str) -> HTTPException:
+    return HTTPException(status_code=409, detail=f"Thread {thread_id} is already running a different request")
+
 @app.post("/generate_presentation/{thread_id}")
 async def create_presentation(user_input: UserInput, thread_id: str):
-    """프레젠테이션 생성 요청"""
-    try:
-        print(f"📩 Received JSON Request: {user_input.model_dump()}")  # ✅ FastAPI 로그 출력
+    """
+    프레젠테이션 생성 요청.
+    - 같은 thread_id 의 같은 요청(재시도)이 이미 실행 중이면 새로 실행하지 않고 그 실행의 결과를 함께 받는다
+      (coalesced=true). 같은 thread_id 에서 내용이 다른 요청이 실행 중이면 409
+    - 피드백을 기다리지 않는 요청(skip_feedback)은 같은 내용(topic/style/message)이면 thread_id 가 달라도 합친다
+      (응답의 thread_id 는 실제로 실행한 thread). 피드백을 받는 실행은 thread 마다 따로 돌아야 하므로 합치지 않음
+    - 동시 실행 한도를 넘으면 대기열에서 기다리고, 대기열이 가득 차거나 오래 기다리면 429 / 503 + Retry-After
+    """
+    logger.info("📩 Received JSON Request: %s", user_input.model_dump())
+    if thread_id in streaming_threads:
+        raise _already_streaming(thread_id)
 
-        presentation = await generate_presentation(user_input.model_dump(), thread_id)
-        file_path = 'test' # file_manager.save_presentation(thread_id, presentation)
+    async def run() -> dict:
+        async with admission.admit():
+            presentation = await generate_presentation(user_input.model_dump(), thread_id)
+        # 저장은 대기열에 넣고 바로 반환 (파일 / 인덱스 쓰기는 백그라운드에서 묶어서 처리,
+        # 실패하면 재시도 후 다시 기록 — /storage/stats 와 /metrics 의 storage_writes_total 로 확인)
+        file_path = None
+        if presentation.get("slides_marp"):
+            saved = await file_manager.save_presentation_async(thread_id, presentation["slides_marp"])
+            file_path = saved["path"]
+        return {"presentation": presentation, "file_path": file_path, "thread_id": thread_id}
 
-        return {"presentation": presentation, "file_path": file_path}
+    request_key = _request_key(user_input)
+    key = ("thread", thread_id, request_key)
+    running = presentation_runs.get(("thread", thread_id))
+    if running is not None and presentation_runs.get(key) is not running:
+        raise _different_request(thread_id)
+    # ("thread", thread_id): 이 thread 에서 실행 중인 요청 (스트리밍 / 다른 내용 요청의 충돌 확인용)
+    aliases = [("thread", thread_id)] + ([("request", request_key)] if user_input.skip_feedback else [])
+    try:
+        response, coalesced = await presentation_runs.do(key, run, aliases=aliases)
+    except AdmissionRejected as e:
+        logger.warning("🚦 Rejected request for thread %s: %s", thread_id, e)
+        raise _busy(e)
     except Exception as e:
-        print(f"🔥 Error: {e}")  # ✅ FastAPI 터미널에서 오류 로그 확인
+        logger.exception("🔥 Error while generating presentation for thread %s", thread_id)
         raise HTTPException(status_code=500, detail=f"Internal Server Error: {str(e)}")
+    if coalesced:
+        logger.info("🔗 Request for thread %s joined the run of thread %s", thread_id, response["thread_id"])
+    return {**response, "coalesced": coalesced}
+
+@app.post("/generate_presentation/{thread_id}/stream")
+async def create_presentation_stream(user_input: UserInput, thread_id: str):
+    """프레젠테이션 생성 요청 (노드/슬라이드 진행 상황을 Server-Sent Events로 스트리밍)"""
+    logger.info("📩 Received JSON Request (stream): %s", user_input.model_dump())
+    if thread_id in streaming_threads or ("thread", thread_id) in presentation_runs:
+        raise _already_streaming(thread_id)
+    try:
+        slot = await admission.enter()
+    except AdmissionRejected as e:
+        logger.warning("🚦 Rejected stream request for thread %s: %s", thread_id, e)
+        raise _busy(e)
+    streaming_threads.add(thread_id)
+
+    def finish():
+        slot.close()
+        streaming_threads.discard(thread_id)
+
+    async def events():
+        try:
+            with slot.bound():
+                async for event in stream_presentation(user_input.model_dump(), thread_id):
+                    yield format_sse(event)
+        finally:
+            finish()
+
+    return StreamingResponse(
+        events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+        background=BackgroundTask(finish),  # 스트림이 시작되지 못하고 끝난 경우에도 슬롯 반납
+    )
 
 @app.post("/feedback/{thread_id}")
 async def receive_feedback(thread_id: str, feedback: FeedbackInput):
-    """사용자의 피드백을 받아 LangGraph에 전달"""
-    await feedback_queue.put(feedback.feedback)  # ✅ 비동기 큐 사용
-    print(f"📩 Feedback received for thread {thread_id}: {feedback.feedback}")
-    return {"status": "received", "thread_id": thread_id, "feedback": feedback.feedback}
+    """사용자의 피드백을 받아 해당 thread의 LangGraph에 전달"""
+    # 슬라이드/개요를 지정하면 해당 부분만 다시 생성
+    payload = feedback.model_dump() if feedback.slides or feedback.outlines else feedback.feedback
+    if not feedback_broker.publish(thread_id, payload):  # ✅ thread별 채널 사용
+        raise HTTPException(status_code=429, detail=f"Too many pending feedbacks for thread {thread_id}")
+    logger.info("📩 Feedback received for thread %s: %s", thread_id, payload)
+    return {"status": "received", "thread_id": thread_id, "feedback": payload}
+
+@app.delete("/feedback/{thread_id}")
+async def cancel_feedback(thread_id: str):
+    """피드백 대기 중인 세션을 취소"""
+    if not feedback_broker.cancel(thread_id):
+        raise HTTPException(status_code=404, detail=f"No feedback session for thread {thread_id}")
+    return {"status": "cancelled", "thread_id": thread_id}
+
+@app.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Prometheus 형식 지표 (노드/agent 시간, LLM 대기·API 시간, 토큰·비용, 캐시 적중, 슬라이드 수)"""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+@app.get("/scheduler/stats")
+async def scheduler_stats():
+    """모델별 호출 대기열 깊이 / 대기 시간 / 재시도 지표"""
+    return scheduler.stats()
+
+@app.get("/admission/stats")
+async def admission_stats():
+    """동시 실행 / 대기열 / 거절 수와 합쳐진(coalesced) 요청 수"""
+    return {**admission.stats(), "requests": presentation_runs.stats()}
+
+@app.post("/jobs")
+async def create_job(job_input: JobInput):
+    """프레젠테이션 생성 작업을 큐에 넣고 job_id 반환 (워커 프로세스가 처리, 피드백 단계 없음)"""
+    payload = {
+        "input": job_input.model_dump(include={"message", "topic", "style"}),
+        "thread_id": job_input.thread_id,
+    }
+    job_id = await run_in_storage(providers.job_queue.enqueue, payload, job_input.priority)
+    return {"job_id": job_id, "status": JobStatus.QUEUED}
+
+@app.get("/jobs/{job_id}")
+async def get_job(job_id: str):
+    """작업 상태 조회"""
+    job = await run_in_storage(providers.job_queue.get, job_id)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    return job
+
+@app.get("/jobs/{job_id}/result")
+async def get_job_result(job_id: str):
+    """완료된 작업의 결과 조회"""
+    job = await run_in_storage(providers.job_queue.get, job_id, True)
+    if job is None:
+        raise HTTPException(status_code=404, detail=f"Job {job_id} not found")
+    if job["status"] not in JobStatus.FINISHED:
+        raise HTTPException(status_code=409, detail=f"Job {job_id} is {job['status']}")
+    return {"job_id": job_id, "status": job["status"], "result": job["result"], "error": job["error"]}
+
+@app.delete("/jobs/{job_id}")
+async def cancel_job(job_id: str):
+    """대기 중인 작업은 바로, 실행 중인 작업은 워커가 확인하는 즉시 취소"""
+    if not await run_in_storage(providers.job_queue.cancel, job_id):
+        raise HTTPException(status_code=409, detail=f"Job {job_id} cannot be cancelled")
+    return {"job_id": job_id, "status": "cancelling"}
+
+@app.post("/batches")
+async def create_batch(request: Request, parallel: int = BATCH_PARALLELISM):
+    """
+    JSONL 본문(한 줄에 {"topic", "style", "message"}, 선택 "id")으로 일괄 생성 시작 (피드백 단계 없음).
+    덱은 끝나는 대로 출력 디렉터리에 기록되고, 진행 상황 / 처리량은 GET /batches/{batch_id}로 조회.
+    """
+    try:
+        records = parse_records((await request.body()).decode("utf-8").splitlines())
+    except (UnicodeDecodeError, ValueError) as e:
+        raise HTTPException(status_code=400, detail=f"Invalid JSONL: {e}")
+    if not records:
+        raise HTTPException(status_code=400, detail="No records in request body")
+    batch = BatchRun(records, parallel=parallel)
+    batch_runs[batch.id] = batch
+    batch.start()
+    logger.info("📦 Batch %s started: %d record(s), parallel=%d", batch.id, len(records), batch.parallel)
+    return {"batch_id": batch.id, "records": len(records), "out_dir": batch.out_dir}
+
+@app.get("/batches/{batch_id}")
+async def get_batch(batch_id: str):
+    """일괄 생성 진행 상황 (완료된 덱별 시간 / 파일, 처리량)"""
+    batch = batch_runs.get(batch_id)
+    if batch is None:
+        raise HTTPException(status_code=404, detail=f"Batch {batch_id} not found")
+    return batch.summary()
+
+@app.get("/presentations/{thread_id}/history")
+async def presentation_history(thread_id: str, limit: int = 20):
+    """저장된 프레젠테이션 버전 목록 (최신순)"""
+    return {"thread_id": thread_id, "versions": await file_manager.history(thread_id, limit)}
+
+@app.get("/presentations/{thread_id}")
+async def get_saved_presentation(thread_id: str, version: Optional[int] = None):
+    """저장된 프레젠테이션 조회 (version이 없으면 최신)"""
+    doc = await file_manager.load_presentation(thread_id, version)
+    if doc is None:
+        raise HTTPException(status_code=404, detail=f"No saved presentation for thread {thread_id}")
+    return doc
+
+@app.post("/presentations/{thread_id}/export")
+async def export_presentation(thread_id: str, format: str = "pdf", version: Optional[int] = None,
+                              theme: Optional[str] = None):
+    """저장된 프레젠테이션을 PDF / PPTX 로 내보내기 (같은 내용은 캐시된 파일 재사용)"""
+    doc = await file_manager.load_presentation(thread_id, version)
+    if doc is None:
+        raise HTTPException(status_code=404, detail=f"No saved presentation for thread {thread_id}")
+    try:
+        # marp 는 임시 디렉터리에서 실행되므로 /images/... 참조를 저장소 파일 경로로 바꿔서 넘김
+        path = await render_service.render(providers.image_store.localize(doc["content"]), format, theme)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    except RenderQueueFull as e:
+        raise HTTPException(status_code=503, detail=f"Export queue is full: {e}", headers={"Retry-After": "5"})
+    except RenderError as e:
+        logger.error("Export failed for thread %s: %s", thread_id, e)
+        raise HTTPException(status_code=500, detail=f"Export failed: {e}")
+    return FileResponse(path, filename=f"{thread_id}-v{doc['version']}.{format}")
+
+@app.get("/storage/stats")
+async def storage_stats():
+    """프레젠테이션 저장 대기열 (대기 / 기록 / 실패 / 재시도 대기 건수)"""
+    return file_manager.stats()
+
+@app.get("/render/stats")
+async def render_stats():
+    """내보내기 대기열 / 캐시 상태"""
+    return render_service.stats()
+
+@app.get("/presentations/{thread_id}/preview", response_class=HTMLResponse)
+async def preview_presentation(thread_id: str, version: Optional[int] = None):
+    """저장된 프레젠테이션의 HTML 미리보기 (슬라이드별 캐시 사용)"""
+    from backend.presentation_engine import HTMLRenderer
+
+    doc = await file_manager.load_presentation(thread_id, version)
+    if doc is None:
+        raise HTTPException(status_code=404, detail=f"No saved presentation for thread {thread_id}")
+    return HTMLResponse(HTMLRenderer.render(doc["content"]))
+
+@app.post("/presentations/{thread_id}/preview/diff")
+async def preview_diff(thread_id: str, diff_input: PreviewDiffInput):
+    """클라이언트가 가진 슬라이드 해시와 비교해 바뀐 슬라이드 HTML만 반환 (화면 부분 갱신용)"""
+    from backend.presentation_engine import HTMLRenderer
+
+    doc = await file_manager.load_presentation(thread_id, diff_input.version)
+    if doc is None:
+        raise HTTPException(status_code=404, detail=f"No saved presentation for thread {thread_id}")
+    return {"version": doc["version"], **HTMLRenderer.diff(doc["content"], diff_input.hashes)}
@@ -1,2 +1,19 @@
-from .html_renderer import HTMLRenderer
-from .marp_renderer import MarpRenderer
\ No newline at end of file
+# 렌더러는 markdown / jinja2 등을 불러오므로 실제로 사용할 때 import 한다
+_RENDERERS = {
+    "HTMLRenderer": ".html_renderer",
+    "MarpRenderer": ".marp_renderer",
+    "RenderService": ".render_service",
+    "RenderQueueFull": ".render_service",
+    "RenderError": ".render_service",
+    "render_service": ".render_service",
+}
+
+__all__ = list(_RENDERERS)
+
+
+def __getattr__(name):
+    if name in _RENDERERS:
+        from importlib import import_module
+
+        return getattr(import_module(_RENDERERS[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
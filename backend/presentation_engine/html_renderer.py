@@ -1,8 +1,57 @@
+import hashlib
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
 import markdown
 from jinja2 import Template
 
+from backend.config import PREVIEW_CACHE_ITEMS
+
+
+_YAML_KEY = re.compile(r"^[A-Za-z_][\w-]*\s*:(\s|$)")
+
+
+def _is_front_matter(block: List[str]) -> bool:
+    """'---' 사이 블록이 YAML 지시문인지 (키: 값 줄이 하나 이상이고, 나머지는 빈 줄 / 주석 / 들여쓴 줄 / 목록)"""
+    lines = [line for line in block if line.strip()]
+    return any(_YAML_KEY.match(line) for line in lines) and all(
+        _YAML_KEY.match(line) or line.startswith((" ", "\t", "#", "- ")) for line in lines
+    )
+
+
+def split_slides(md_content: str) -> Tuple[str, List[str]]:
+    """
+    Marp Markdown 을 (front-matter, 슬라이드 목록)으로 분리.
+    맨 앞의 '---' ~ '---' 블록은 YAML 키가 있을 때만 지시문(front-matter)이고,
+    그 밖의 '---' 한 줄은 슬라이드 구분자.
+    """
+    lines = md_content.strip("\n").split("\n")
+    front_matter = ""
+    if lines and lines[0].strip() == "---":
+        end = next((i for i in range(1, len(lines)) if lines[i].strip() == "---"), None)
+        if end is not None and _is_front_matter(lines[1:end]):
+            front_matter = "\n".join(lines[1:end])
+            lines = lines[end + 1:]
+
+    slides, current = [], []
+    for line in lines:
+        if line.strip() == "---":
+            slides.append("\n".join(current).strip("\n"))
+            current = []
+        else:
+            current.append(line)
+    slides.append("\n".join(current).strip("\n"))
+    return front_matter, [s for s in slides if s.strip()]
+
+
 class HTMLRenderer:
-    """MARP Markdown을 HTML로 변환하여 미리보기 지원"""
+    """
+    MARP Markdown을 HTML로 변환하여 미리보기 지원.
+    템플릿은 한 번만 컴파일하고, 슬라이드별 HTML 을 내용 해시로 캐시하여
+    피드백으로 일부 슬라이드만 바뀌면 바뀐 슬라이드만 다시 변환한다.
+    """
 
     HTML_TEMPLATE = """
     <!DOCTYPE html>
@@ -15,15 +64,75 @@ class HTMLRenderer:
     </head>
     <body>
         <div class="marpit">
-            {{ content | safe }}
+            {% for slide in slides %}<section id="slide-{{ loop.index0 }}" data-hash="{{ slide.hash }}">
+            {{ slide.html | safe }}
+            </section>
+            {% endfor %}
         </div>
     </body>
     </html>
     """
 
-    @staticmethod
-    def render(md_content: str) -> str:
+    _template: Optional[Template] = None
+    _md: Optional[markdown.Markdown] = None
+    # (슬라이드 위치, 내용 해시) → HTML. 제목 id 가 위치에 따라 달라지므로 위치도 키에 포함
+    _cache: "OrderedDict[Tuple[int, str], str]" = OrderedDict()
+    _lock = threading.Lock()
+    _slide_index = 0
+
+    @classmethod
+    def _slugify(cls, value: str, separator: str) -> str:
+        """슬라이드를 따로 변환해도 덱 안에서 제목 id 가 겹치지 않도록 슬라이드 위치를 앞에 붙임"""
+        from markdown.extensions.toc import slugify
+
+        return f"slide-{cls._slide_index}{separator}{slugify(value, separator)}"
+
+    @classmethod
+    def _render_slide(cls, index: int, slide: str) -> Dict[str, str]:
+        digest = hashlib.sha256(slide.encode("utf-8")).hexdigest()[:16]
+        key = (index, digest)
+        with cls._lock:
+            html = cls._cache.get(key)
+            if html is not None:
+                cls._cache.move_to_end(key)
+            else:
+                if cls._md is None:
+                    cls._md = markdown.Markdown(
+                        extensions=["extra", "toc", "sane_lists"],
+                        extension_configs={"toc": {"slugify": cls._slugify}},
+                    )
+                cls._slide_index = index
+                html = cls._md.reset().convert(slide)
+                cls._cache[key] = html
+                while len(cls._cache) > PREVIEW_CACHE_ITEMS:
+                    cls._cache.popitem(last=False)
+        return {"hash": digest, "html": html}
+
+    @classmethod
+    def render_slides(cls, md_content: str) -> List[Dict[str, str]]:
+        """슬라이드별 {hash, html} 목록 (캐시에 있는 슬라이드는 다시 변환하지 않음)"""
+        _, slides = split_slides(md_content)
+        return [cls._render_slide(i, slide) for i, slide in enumerate(slides)]
+
+    @classmethod
+    def render(cls, md_content: str) -> str:
         """Markdown을 HTML로 변환하여 미리보기 제공"""
-        html_content = markdown.markdown(md_content, extensions=["extra", "toc", "sane_lists"])
-        template = Template(HTMLRenderer.HTML_TEMPLATE)
-        return template.render(content=html_content)
+        if cls._template is None:
+            cls._template = Template(cls.HTML_TEMPLATE)
+        return cls._template.render(slides=cls.render_slides(md_content))
+
+    @classmethod
+    def diff(cls, md_content: str, known_hashes: Sequence[str]) -> Dict[str, Any]:
+        """
+        클라이언트가 가진 슬라이드 해시 목록과 비교해 바뀐 슬라이드만 반환.
+        - count   : 현재 슬라이드 수 (클라이언트는 그 이후 슬라이드를 제거)
+        - changed : 위치(index)가 새로 생겼거나 내용이 달라진 슬라이드의 {index, hash, html}
+        - hashes  : 현재 전체 해시 목록 (다음 diff 요청에 사용)
+        """
+        slides = cls.render_slides(md_content)
+        changed = [
+            {"index": i, **slide}
+            for i, slide in enumerate(slides)
+            if i >= len(known_hashes) or known_hashes[i] != slide["hash"]
+        ]
+        return {"count": len(slides), "changed": changed, "hashes": [s["hash"] for s in slides]}
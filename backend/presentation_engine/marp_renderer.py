@@ -1,13 +1,29 @@
 import subprocess
+from typing import List, Optional
+
+FORMATS = ("pdf", "pptx")
+
 
 class MarpRenderer:
     """MARP 기반 프레젠테이션 변환기"""
 
     @staticmethod
     def render(md_file: str, output_format: str) -> str:
-        if output_format not in ["pdf", "pptx"]:
+        if output_format not in FORMATS:
             raise ValueError("지원되지 않는 형식입니다. (pdf 또는 pptx 선택)")
 
         output_file = md_file.replace(".md", f".{output_format}")
         subprocess.run(["marp", md_file, f"--{output_format}", "-o", output_file], check=True)
         return output_file
+
+    @staticmethod
+    def batch_command(marp_bin: str, input_dir: str, output_dir: str, output_format: str,
+                      theme: Optional[str] = None) -> List[str]:
+        """input_dir의 모든 .md 를 한 번의 marp 실행(브라우저 1회 기동)으로 output_dir에 변환하는 명령"""
+        if output_format not in FORMATS:
+            raise ValueError("지원되지 않는 형식입니다. (pdf 또는 pptx 선택)")
+        cmd = [marp_bin, "--input-dir", input_dir, "--output", output_dir, f"--{output_format}",
+               "--allow-local-files"]
+        if theme:
+            cmd += ["--theme", theme]
+        return cmd
@@ -0,0 +1,259 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from collections import OrderedDict
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Dict, List, Optional
+
+from backend.config import (
+    MARP_BIN,
+    RENDER_BATCH_SIZE,
+    RENDER_CACHE_DIR,
+    RENDER_CACHE_MAX_MB,
+    RENDER_QUEUE_MAX,
+    RENDER_TIMEOUT_SEC,
+    RENDER_WORKERS,
+)
+from backend.utils.metrics import metrics
+from .marp_renderer import FORMATS, MarpRenderer
+
+logger = logging.getLogger(__name__)
+
+RENDER_REQUESTS = metrics.counter("render_requests_total", "Export requests by outcome", ["result"])
+RENDER_BATCH_SECONDS = metrics.histogram("render_batch_seconds", "Wall time per marp invocation", ["format"])
+
+
+class RenderQueueFull(Exception):
+    """내보내기 대기열이 가득 참 (잠시 후 재시도)"""
+
+
+class RenderError(Exception):
+    """marp 실행 실패"""
+
+
+@dataclass
+class _Job:
+    key: str
+    fmt: str
+    theme: Optional[str]
+    markdown: str
+    future: asyncio.Future
+
+
+class RenderService:
+    """
+    PDF / PPTX 내보내기 서비스.
+    - 결과 캐시: (Markdown, 테마, 형식) 해시 → 파일, 용량을 넘으면 오래 안 쓴 것부터 삭제 (LRU)
+    - 같은 내용을 동시에 요청하면 한 번만 변환 (single-flight)
+    - 워커 수만큼만 marp 를 동시에 실행하고, 대기 중인 같은 형식/테마 작업은 한 번의 marp 실행으로 묶어
+      Node.js / 헤드리스 브라우저 기동 비용을 나눠 낸다
+    - 대기열이 max_queue 를 넘으면 RenderQueueFull (API 는 503 + Retry-After)
+    """
+
+    def __init__(self, cache_dir: str = RENDER_CACHE_DIR, max_bytes: int = int(RENDER_CACHE_MAX_MB * 1024 * 1024),
+                 workers: int = RENDER_WORKERS, batch_size: int = RENDER_BATCH_SIZE, max_queue: int = RENDER_QUEUE_MAX,
+                 timeout: float = RENDER_TIMEOUT_SEC, marp_bin: str = MARP_BIN):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self.workers = workers
+        self.batch_size = batch_size
+        self.max_queue = max_queue
+        self.timeout = timeout
+        self.marp_bin = marp_bin
+        self._queue: Optional[asyncio.Queue] = None
+        self._tasks: List[asyncio.Task] = []
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.batches = 0
+        self._index: "OrderedDict[str, int]" = OrderedDict()
+        self._total_bytes = 0
+        self._indexed = False
+
+    @staticmethod
+    def cache_key(markdown: str, fmt: str, theme: Optional[str] = None) -> str:
+        return hashlib.sha256(json.dumps([fmt, theme or "", markdown]).encode("utf-8")).hexdigest()
+
+    def path(self, key: str, fmt: str) -> str:
+        return os.path.join(self.cache_dir, f"{key}.{fmt}")
+
+    @property
+    def queue_depth(self) -> int:
+        return self._queue.qsize() if self._queue is not None else 0
+
+    # 🟢 결과 캐시 (LRU)
+    def _ensure_index(self):
+        """처음 사용할 때 캐시 디렉터리를 만들고, 남아 있는 결과를 최근 사용 순으로 색인 (재시작 후에도 캐시 유지)"""
+        if self._indexed:
+            return
+        os.makedirs(self.cache_dir, exist_ok=True)
+        entries = []
+        for entry in os.scandir(self.cache_dir):
+            if entry.is_file() and entry.name.rsplit(".", 1)[-1] in FORMATS:
+                stat = entry.stat()
+                entries.append((stat.st_mtime, entry.name, stat.st_size))
+        self._index = OrderedDict((name, size) for _, name, size in sorted(entries))
+        self._total_bytes = sum(self._index.values())
+        self._indexed = True
+
+    def _lookup(self, key: str, fmt: str) -> Optional[str]:
+        self._ensure_index()
+        name = f"{key}.{fmt}"
+        if name not in self._index:
+            return None
+        path = self.path(key, fmt)
+        try:
+            os.utime(path)  # 재시작 후에도 최근 사용 순서가 유지되도록
+        except FileNotFoundError:
+            self._total_bytes -= self._index.pop(name)
+            return None
+        self._index.move_to_end(name)
+        return path
+
+    def _store(self, src: str, key: str, fmt: str) -> str:
+        self._ensure_index()
+        path = self.path(key, fmt)
+        os.replace(src, path)
+        name = f"{key}.{fmt}"
+        self._total_bytes += os.path.getsize(path) - self._index.pop(name, 0)
+        self._index[name] = os.path.getsize(path)
+        while self._total_bytes > self.max_bytes and len(self._index) > 1:
+            old, size = self._index.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                os.remove(os.path.join(self.cache_dir, old))
+            except FileNotFoundError:
+                pass
+        return path
+
+    # 🟢 공개 API
+    async def render(self, markdown: str, fmt: str = "pdf", theme: Optional[str] = None) -> str:
+        """Markdown 을 fmt(pdf | pptx)로 변환한 파일 경로 (캐시에 있으면 바로 반환)"""
+        if fmt not in FORMATS:
+            raise ValueError("지원되지 않는 형식입니다. (pdf 또는 pptx 선택)")
+        key = self.cache_key(markdown, fmt, theme)
+        if (path := self._lookup(key, fmt)) is not None:
+            RENDER_REQUESTS.inc(result="hit")
+            return path
+        if key in self._inflight:
+            RENDER_REQUESTS.inc(result="joined")
+            return await asyncio.shield(self._inflight[key])
+
+        self._start()
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait(_Job(key, fmt, theme, markdown, future))
+        except asyncio.QueueFull:
+            RENDER_REQUESTS.inc(result="rejected")
+            raise RenderQueueFull(f"{self.queue_depth} exports already queued") from None
+        RENDER_REQUESTS.inc(result="miss")
+        self._inflight[key] = future
+        future.add_done_callback(lambda _: self._inflight.pop(key, None))
+        # 요청이 끊겨도 변환은 끝까지 진행해 캐시에 남김
+        return await asyncio.shield(future)
+
+    def _start(self):
+        if self._queue is None:
+            self._queue = asyncio.Queue(maxsize=self.max_queue)
+            self._tasks = [asyncio.create_task(self._worker()) for _ in range(self.workers)]
+
+    async def _worker(self):
+        while True:
+            job = await self._queue.get()
+            batch, others = [job], []
+            # 이미 대기 중인 같은 형식/테마 작업을 한 번의 marp 실행으로 묶음
+            while len(batch) < self.batch_size and not self._queue.empty():
+                nxt = self._queue.get_nowait()
+                (batch if (nxt.fmt, nxt.theme) == (job.fmt, job.theme) else others).append(nxt)
+            for nxt in others:
+                self._queue.put_nowait(nxt)
+            try:
+                await self._run_batch(batch)
+            except Exception as e:
+                logger.exception("Render batch failed")
+                for j in batch:
+                    if not j.future.done():
+                        j.future.set_exception(e)
+
+    async def _run_batch(self, batch: List[_Job]):
+        fmt, theme = batch[0].fmt, batch[0].theme
+        work_dir = await asyncio.to_thread(tempfile.mkdtemp, dir=self.cache_dir, prefix=".batch-")
+        try:
+            input_dir = os.path.join(work_dir, "in")
+            output_dir = os.path.join(work_dir, "out")
+
+            def prepare():
+                os.makedirs(input_dir)
+                os.makedirs(output_dir)
+                for j in batch:
+                    with open(os.path.join(input_dir, f"{j.key}.md"), "w", encoding="utf-8") as f:
+                        f.write(j.markdown)
+
+            await asyncio.to_thread(prepare)
+            cmd = MarpRenderer.batch_command(self.marp_bin, input_dir, output_dir, fmt, theme)
+            start = perf_counter()
+            error = await self._exec(cmd)
+            RENDER_BATCH_SECONDS.observe(perf_counter() - start, format=fmt)
+            self.batches += 1
+
+            if error and len(batch) > 1:
+                # 덱 하나 때문에 묶음 전체가 실패했을 수 있으므로 하나씩 다시 변환
+                logger.warning("Render batch of %d failed (%s); retrying individually", len(batch), error)
+                for j in batch:
+                    await self._run_batch([j])
+                return
+
+            for j in batch:
+                out = os.path.join(output_dir, f"{j.key}.{fmt}")
+                if not error and os.path.exists(out):
+                    j.future.set_result(self._store(out, j.key, fmt))
+                else:
+                    j.future.set_exception(RenderError(error or f"marp produced no output for {j.key}"))
+        finally:
+            await asyncio.to_thread(shutil.rmtree, work_dir, True)
+
+    async def _exec(self, cmd: List[str]) -> Optional[str]:
+        """marp 실행. 실패하면 오류 메시지, 성공하면 None"""
+        try:
+            proc = await asyncio.create_subprocess_exec(
+                *cmd, stdout=asyncio.subprocess.DEVNULL, stderr=asyncio.subprocess.PIPE
+            )
+        except FileNotFoundError:
+            return f"{self.marp_bin} not found"
+        try:
+            _, stderr = await asyncio.wait_for(proc.communicate(), self.timeout)
+        except asyncio.TimeoutError:
+            proc.kill()
+            await proc.wait()
+            return f"marp timed out after {self.timeout:.0f}s"
+        if proc.returncode != 0:
+            return stderr.decode("utf-8", "replace").strip()[-500:] or f"marp exited with {proc.returncode}"
+        return None
+
+    async def close(self):
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
+        for future in list(self._inflight.values()):
+            future.cancel()
+        self._queue = None
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "queue_depth": self.queue_depth,
+            "in_flight": len(self._inflight),
+            "batches": self.batches,
+            "cached": len(self._index),
+            "bytes": self._total_bytes,
+            "max_bytes": self.max_bytes,
+        }
+
+
+# 🟢 프로세스 전역 내보내기 서비스
+render_service = RenderService()
+
+metrics.gauge("render_queue_depth", "Exports waiting for a marp worker", fn=lambda: {(): render_service.queue_depth})
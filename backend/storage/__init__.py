@@ -1,3 +1,6 @@
-from .file_manager import FileManager
+from .file_manager import FileManager, file_manager
+from .image_store import ImageStore
+from .slide_store import SlideMissing, SlideStore, slide_store
+from .mongo import get_mongo_client, close_mongo_client
 
-__all__ = ["FileManager"]
+__all__ = ["FileManager", "file_manager", "ImageStore", "SlideMissing", "SlideStore", "slide_store", "get_mongo_client", "close_mongo_client"]
@@ -1,43 +1,179 @@
-import os, requests
-from dotenv import load_dotenv
-from pymongo import MongoClient
+import os
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 from datetime import datetime
+from backend.config import COLLECTION_NAME, DB_NAME, PRESENTATION_STORE_DIR
+from backend.utils.text_utils import content_hash
+from .mongo import get_mongo_client
+from .persistence import WriteBatcher, atomic_write, run_in_storage
 
-load_dotenv()
-MONGO_URI = os.getenv("MONGO_URI")
-DB_NAME = os.getenv("DB_NAME")
-COLLECTION_NAME = os.getenv("COLLECTION_NAME")
+if TYPE_CHECKING:
+    import httpx
+
+# 🟢 이미지 다운로드용 공유 HTTP 클라이언트 (커넥션 풀 재사용, image_store 가 사용)
+_http_client: Optional["httpx.AsyncClient"] = None
+
+
+def get_http_client() -> "httpx.AsyncClient":
+    global _http_client
+    if _http_client is None or _http_client.is_closed:
+        import httpx
+
+        _http_client = httpx.AsyncClient(
+            timeout=httpx.Timeout(60.0, connect=10.0),
+            limits=httpx.Limits(max_connections=32, max_keepalive_connections=16),
+            follow_redirects=True,
+        )
+    return _http_client
+
+
+async def close_http_client():
+    global _http_client
+    if _http_client is not None:
+        await _http_client.aclose()
+        _http_client = None
 
 
 class FileManager:
     """파일 저장 및 관리"""
 
-    def __init__(self, base_dir="storage/images"):
-        os.makedirs(base_dir, exist_ok=True)
-        self.base_dir = base_dir
-        self.client = MongoClient(MONGO_URI)
-        self.db = self.client[DB_NAME]
-        self.collection = self.db[COLLECTION_NAME]
-
-    def save_image(self, image_url: str, thread_id: str) -> str:
-        """이미지 URL을 다운로드하고 로컬에 저장"""
-        response = requests.get(image_url)
-        if response.status_code == 200:
-            file_path = os.path.join(self.base_dir, f"{thread_id}.png")
-            with open(file_path, "wb") as img_file:
-                img_file.write(response.content)
-            return file_path
-        return ""
-    
-    def save_presentation(self, thread_id: str, presentation: str):
-        """프레젠테이션 저장 (MongoDB + 파일)"""
-        timestamp = datetime.now()
-        self.collection.insert_one({"thread_id": thread_id, "content": presentation, "timestamp": timestamp})
-
-        # 파일 저장 (Markdown)
-        os.makedirs(f"presentations/{thread_id}", exist_ok=True)
-        file_path = f"presentations/{thread_id}/presentation_{timestamp}.md"
-        with open(file_path, "w", encoding="utf-8") as f:
-            f.write(presentation)
-        
-        return file_path
+    def __init__(self, presentations_dir=PRESENTATION_STORE_DIR):
+        self.presentations_dir = presentations_dir
+        self._indexed = False
+        self._versions: WriteBatcher[Dict[str, Any]] = WriteBatcher("presentation", self._write_versions)
+
+    # MongoDB 연결은 프로세스 전역 클라이언트를 공유하고, 처음 사용할 때 얻는다
+    @property
+    def client(self):
+        return get_mongo_client()
+
+    @property
+    def db(self):
+        return self.client[DB_NAME]
+
+    @property
+    def collection(self):
+        """프레젠테이션 버전 메타데이터 인덱스 (thread_id, version, timestamp, hash, path)"""
+        return self.db[COLLECTION_NAME]
+
+    @property
+    def counters(self):
+        return self.db[f"{COLLECTION_NAME}_counters"]
+
+    # 🟢 프레젠테이션 버전 저장 (내용 주소 파일 + 메타데이터 인덱스)
+    def presentation_path(self, digest: str) -> str:
+        return os.path.join(self.presentations_dir, digest[:2], f"{digest}.md")
+
+    def _ensure_indexes(self):
+        if self._indexed:
+            return
+        self.collection.create_index([("thread_id", 1), ("version", -1)], unique=True)
+        self.collection.create_index("hash")
+        self._indexed = True
+
+    def _new_record(self, thread_id: str, presentation: str) -> Dict[str, Any]:
+        data = presentation.encode("utf-8")
+        digest = content_hash(presentation)
+        return {
+            "thread_id": thread_id,
+            "hash": digest,
+            "path": self.presentation_path(digest),
+            "size": len(data),
+            "timestamp": datetime.now(),
+            "data": data,
+        }
+
+    def _write_versions(self, records: List[Dict[str, Any]]):
+        """
+        파일을 원자적으로 쓰고, 스레드별 버전 번호를 한 번에 발급받아 인덱스에 일괄 삽입.
+        (저장소 스레드 풀에서 실행, 실패한 묶음을 다시 받아도 같은 버전으로 한 번만 기록)
+        """
+        for r in records:
+            atomic_write(r["path"], r["data"])
+
+        from pymongo import ReturnDocument
+        from pymongo.errors import BulkWriteError
+
+        self._ensure_indexes()
+        by_thread: Dict[str, List[Dict[str, Any]]] = {}
+        for r in records:
+            by_thread.setdefault(r["thread_id"], []).append(r)
+
+        docs = []
+        for thread_id, items in by_thread.items():
+            # 재시도하는 기록은 처음 받은 번호를 그대로 사용
+            new = [r for r in items if "version" not in r]
+            if new:
+                # 여러 프로세스가 같은 스레드에 써도 번호가 겹치지 않도록 카운터를 원자적으로 증가
+                counter = self.counters.find_one_and_update(
+                    {"_id": thread_id}, {"$inc": {"seq": len(new)}}, upsert=True, return_document=ReturnDocument.AFTER
+                )
+                first = counter["seq"] - len(new) + 1
+                for version, r in enumerate(new, start=first):
+                    r["version"] = version
+            docs.extend({k: v for k, v in r.items() if k != "data"} for r in items)
+        try:
+            self.collection.insert_many(docs, ordered=False)
+        except BulkWriteError as e:
+            # 지난 시도에서 이미 들어간 문서는 (thread_id, version) 중복으로 거절됨 → 성공으로 취급
+            details = e.details or {}
+            if details.get("writeConcernErrors") or any(
+                err.get("code") != 11000 for err in details.get("writeErrors", [])
+            ):
+                raise
+
+    def save_presentation(self, thread_id: str, presentation: str) -> str:
+        """프레젠테이션 저장 (동기: 파일 + 인덱스 기록이 끝난 뒤 반환)"""
+        record = self._new_record(thread_id, presentation)
+        self._write_versions([record])
+        return record["path"]
+
+    async def save_presentation_async(self, thread_id: str, presentation: str, wait: bool = False) -> Dict[str, Any]:
+        """
+        프레젠테이션 저장 (비동기, write-behind).
+        내용 해시로 경로가 정해지므로 기록을 대기열에 넣고 바로 경로를 반환하며,
+        파일 / 인덱스 쓰기는 다른 요청의 저장과 묶어서 저장소 스레드 풀에서 수행한다.
+        쓰기가 실패하면 재시도하고 그래도 안 되면 나중에 다시 기록한다 (stats() / storage_writes_total).
+        wait=True 면 기록이 끝날 때까지 기다리고, 재시도까지 실패하면 예외를 올린다.
+        """
+        record = self._new_record(thread_id, presentation)
+        saved = self._versions.submit(record)
+        if wait:
+            await saved
+        return {"path": record["path"], "hash": record["hash"], "size": record["size"]}
+
+    async def flush(self) -> int:
+        """대기 중인 저장을 모두 기록 (실패해 보관 중이던 것도 다시 시도). 아직 기록되지 않은 수를 반환"""
+        return await self._versions.flush()
+
+    async def history(self, thread_id: str, limit: int = 20) -> List[Dict[str, Any]]:
+        """스레드의 저장 버전 목록 (최신순, 인덱스 조회)"""
+        await self.flush()
+
+        def query():
+            cursor = self.collection.find({"thread_id": thread_id}, {"_id": 0})
+            return list(cursor.sort("version", -1).limit(limit))
+
+        return await run_in_storage(query)
+
+    async def load_presentation(self, thread_id: str, version: Optional[int] = None) -> Optional[Dict[str, Any]]:
+        """스레드의 특정(없으면 최신) 버전 메타데이터와 내용"""
+        await self.flush()
+
+        def load():
+            query: Dict[str, Any] = {"thread_id": thread_id}
+            if version is not None:
+                query["version"] = version
+            doc = self.collection.find_one(query, {"_id": 0}, sort=[("version", -1)])
+            if doc is None:
+                return None
+            with open(doc["path"], encoding="utf-8") as f:
+                return {**doc, "content": f.read()}
+
+        return await run_in_storage(load)
+
+    def stats(self) -> Dict[str, int]:
+        return self._versions.stats()
+
+
+# 🟢 프로세스 전역 FileManager (MongoDB 커넥션 풀 / 쓰기 묶음 공유)
+file_manager = FileManager()
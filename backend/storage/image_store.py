@@ -0,0 +1,188 @@
+import asyncio
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+from time import time
+from pathlib import Path
+from typing import Awaitable, Callable, Dict, Iterable, Optional
+
+from backend.config import IMAGE_PUBLIC_BASE, IMAGE_STORE_DIR, IMAGE_STORE_MAX_MB, STORAGE_BATCH_SIZE
+from .file_manager import get_http_client
+
+
+class ImageStore:
+    """
+    내용 주소 기반(content-addressed) 이미지 저장소.
+    - 이미지 파일은 바이트의 sha256으로 저장 ({digest}.png) → 같은 이미지는 한 번만 저장
+    - 별칭 인덱스: 개념 키 / 정규화된 설명 해시 → 이미지 digest
+    - 같은 키를 동시에 요청하면 한 번만 생성 (single-flight)
+    - 디스크 용량(max_bytes)을 넘으면 가장 오래 안 쓴 이미지부터 삭제 (LRU)
+    """
+
+    def __init__(self, base_dir: str = IMAGE_STORE_DIR, max_bytes: int = int(IMAGE_STORE_MAX_MB * 1024 * 1024),
+                 public_base: str = IMAGE_PUBLIC_BASE):
+        os.makedirs(base_dir, exist_ok=True)
+        self.base_dir = base_dir
+        self.max_bytes = max_bytes
+        self.public_base = public_base.rstrip("/")
+        self._public_ref = re.compile(re.escape(self.public_base) + r"/([0-9a-f]{64})\.png")
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(os.path.join(base_dir, "index.sqlite"), check_same_thread=False)
+        self._conn.executescript(
+            """
+            CREATE TABLE IF NOT EXISTS images (digest TEXT PRIMARY KEY, size INTEGER, created REAL, accessed REAL);
+            CREATE INDEX IF NOT EXISTS images_accessed ON images(accessed);
+            CREATE TABLE IF NOT EXISTS aliases (key TEXT PRIMARY KEY, digest TEXT);
+            CREATE INDEX IF NOT EXISTS aliases_digest ON aliases(digest);
+            """
+        )
+        self._total_bytes = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM images").fetchone()[0]
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self._touched: Dict[str, float] = {}
+
+    def path(self, digest: str) -> str:
+        return os.path.join(self.base_dir, f"{digest}.png")
+
+    def public_url(self, digest: str) -> str:
+        return f"{self.public_base}/{digest}.png"
+
+    def localize(self, markdown: str) -> str:
+        """
+        슬라이드 Markdown 의 이미지 참조(public_url)를 저장소 파일의 절대 file:// URL 로 바꾼다.
+        웹 서버 밖에서 읽는 Markdown (marp 내보내기, 일괄 생성 slides.md) 용.
+        public_base 가 이미 절대 URL(http/https)이면 그대로 둔다.
+        """
+        if "://" in self.public_base:
+            return markdown
+        return self._public_ref.sub(lambda m: Path(self.path(m.group(1))).resolve().as_uri(), markdown)
+
+    # 🟢 인덱스 (SQLite, 스레드에서 실행)
+    def _lookup(self, key: str) -> Optional[str]:
+        with self._lock:
+            row = self._conn.execute("SELECT digest FROM aliases WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if not os.path.exists(self.path(row[0])):
+                self._conn.execute("DELETE FROM aliases WHERE digest = ?", (row[0],))
+                self._conn.commit()
+                return None
+            # 조회마다 커밋하지 않고 접근 시각을 모아 두었다가 다음 쓰기 때 함께 기록
+            self._touched[row[0]] = time()
+            if len(self._touched) >= STORAGE_BATCH_SIZE:
+                self._flush_touched()
+                self._conn.commit()
+            return row[0]
+
+    def _flush_touched(self):
+        if self._touched:
+            self._conn.executemany(
+                "UPDATE images SET accessed = ? WHERE digest = ?",
+                [(accessed, digest) for digest, accessed in self._touched.items()],
+            )
+            self._touched.clear()
+
+    def _link(self, digest: str, keys: Iterable[str]):
+        with self._lock:
+            self._conn.executemany(
+                "INSERT OR REPLACE INTO aliases (key, digest) VALUES (?, ?)", [(k, digest) for k in keys]
+            )
+            self._flush_touched()
+            self._conn.commit()
+
+    def _register(self, digest: str, size: int):
+        now = time()
+        with self._lock:
+            existing = self._conn.execute("SELECT size FROM images WHERE digest = ?", (digest,)).fetchone()
+            self._conn.execute(
+                "INSERT OR REPLACE INTO images (digest, size, created, accessed) VALUES (?, ?, ?, ?)",
+                (digest, size, now, now),
+            )
+            if existing is None:
+                self._total_bytes += size
+            self._flush_touched()  # LRU 순서가 최신 접근 시각을 반영하도록
+            self._evict(keep=digest)
+            self._conn.commit()
+
+    def _evict(self, keep: str):
+        while self._total_bytes > self.max_bytes:
+            row = self._conn.execute(
+                "SELECT digest, size FROM images WHERE digest != ? ORDER BY accessed LIMIT 1", (keep,)
+            ).fetchone()
+            if row is None:
+                break
+            digest, size = row
+            self._conn.execute("DELETE FROM images WHERE digest = ?", (digest,))
+            self._conn.execute("DELETE FROM aliases WHERE digest = ?", (digest,))
+            try:
+                os.remove(self.path(digest))
+            except FileNotFoundError:
+                pass
+            self._total_bytes -= size
+
+    # 🟢 공개 API
+    async def lookup(self, key: str) -> Optional[str]:
+        """키(개념/설명 해시)에 연결된 이미지 digest"""
+        return await asyncio.to_thread(self._lookup, key)
+
+    async def link(self, digest: str, *keys: str):
+        await asyncio.to_thread(self._link, digest, keys)
+
+    async def put_from_url(self, image_url: str, keys: Iterable[str] = ()) -> str:
+        """URL의 이미지를 스트리밍 다운로드하여 내용 해시로 저장하고 digest를 반환"""
+        hasher = hashlib.sha256()
+        tmp_path = os.path.join(self.base_dir, f".{os.getpid()}-{id(hasher)}.part")
+        size = 0
+        async with get_http_client().stream("GET", image_url) as response:
+            response.raise_for_status()
+            f = await asyncio.to_thread(open, tmp_path, "wb")
+            try:
+                async for chunk in response.aiter_bytes(64 * 1024):
+                    hasher.update(chunk)
+                    size += len(chunk)
+                    await asyncio.to_thread(f.write, chunk)
+            finally:
+                await asyncio.to_thread(f.close)
+
+        digest = hasher.hexdigest()
+        await asyncio.to_thread(os.replace, tmp_path, self.path(digest))
+        await asyncio.to_thread(self._register, digest, size)
+        if keys:
+            await self.link(digest, *keys)
+        return digest
+
+    async def get_or_create(self, key: str, factory: Callable[[], Awaitable[str]]) -> str:
+        """
+        key에 연결된 이미지가 있으면 재사용하고, 없으면 factory()로 만든 digest를 key에 연결.
+        같은 key로 동시에 들어온 요청은 하나의 factory 실행을 공유.
+        """
+        if key in self._inflight:
+            return await asyncio.shield(self._inflight[key])
+        if (digest := await self.lookup(key)) is not None:
+            return digest
+        if key in self._inflight:  # lookup 도중 다른 요청이 생성을 시작함
+            return await asyncio.shield(self._inflight[key])
+
+        fut = asyncio.get_running_loop().create_future()
+        self._inflight[key] = fut
+        try:
+            digest = await factory()
+            await self.link(digest, key)
+            fut.set_result(digest)
+            return digest
+        except asyncio.CancelledError:
+            fut.cancel()
+            raise
+        except Exception as e:
+            fut.set_exception(e)
+            fut.exception()  # 대기자가 없어도 "never retrieved" 경고가 나지 않도록
+            raise
+        finally:
+            del self._inflight[key]
+
+    def stats(self) -> Dict[str, int]:
+        with self._lock:
+            images = self._conn.execute("SELECT COUNT(*) FROM images").fetchone()[0]
+            aliases = self._conn.execute("SELECT COUNT(*) FROM aliases").fetchone()[0]
+        return {"images": images, "aliases": aliases, "bytes": self._total_bytes, "max_bytes": self.max_bytes}
@@ -0,0 +1,33 @@
+import threading
+from typing import TYPE_CHECKING, Optional
+
+from backend.config import MONGO_MAX_POOL_SIZE, MONGO_URI
+
+if TYPE_CHECKING:
+    from pymongo import MongoClient
+
+_client: Optional["MongoClient"] = None
+_lock = threading.Lock()
+
+
+def get_mongo_client() -> "MongoClient":
+    """
+    프로세스 전역 MongoClient (커넥션 풀 공유).
+    pymongo 는 처음 호출될 때 불러오고, 클라이언트는 실제 명령이 실행될 때 연결한다.
+    """
+    global _client
+    if _client is None:
+        with _lock:
+            if _client is None:
+                from pymongo import MongoClient
+
+                _client = MongoClient(MONGO_URI, maxPoolSize=MONGO_MAX_POOL_SIZE)
+    return _client
+
+
+def close_mongo_client():
+    global _client
+    with _lock:
+        if _client is not None:
+            _client.close()
+            _client = None
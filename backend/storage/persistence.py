@@ -0,0 +1,207 @@
+import asyncio
+import logging
+import os
+import tempfile
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Dict, Generic, List, Optional, Set, Tuple, TypeVar
+
+from backend.config import (
+    STORAGE_BATCH_SIZE,
+    STORAGE_EXECUTOR_WORKERS,
+    STORAGE_FLUSH_INTERVAL_SEC,
+    STORAGE_REQUEUE_SEC,
+    STORAGE_RETRY_BACKOFF_SEC,
+    STORAGE_WRITE_RETRIES,
+)
+from backend.utils.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+STORAGE_WRITES = metrics.counter("storage_writes_total", "Records written by batched storage writes", ["batcher", "result"])
+
+# 🟢 저장소 I/O 전용 스레드 풀 (pymongo / 파일 쓰기가 이벤트 루프를 막지 않도록)
+storage_executor = ThreadPoolExecutor(max_workers=STORAGE_EXECUTOR_WORKERS, thread_name_prefix="storage")
+
+
+async def run_in_storage(fn: Callable[..., T], *args: Any) -> T:
+    return await asyncio.get_running_loop().run_in_executor(storage_executor, fn, *args)
+
+
+def atomic_write(path: str, data: bytes) -> bool:
+    """
+    같은 디렉터리의 임시 파일에 쓴 뒤 os.replace 로 교체 (반쯤 쓴 파일이 보이지 않음).
+    내용 주소 경로라면 이미 있는 파일은 같은 내용이므로 다시 쓰지 않고 False 를 반환.
+    """
+    if os.path.exists(path):
+        return False
+    directory = os.path.dirname(path) or "."
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, suffix=".part")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, path)
+    except BaseException:
+        try:
+            os.remove(tmp_path)
+        except FileNotFoundError:
+            pass
+        raise
+    return True
+
+
+class WriteBatcher(Generic[T]):
+    """
+    비동기 쓰기 모음(write-behind).
+    submit()은 항목을 대기열에 넣고 바로 반환하며, batch_size 개가 모이거나
+    flush_interval 초가 지나면 handler(items)를 저장소 스레드 풀에서 한 번에 실행한다.
+    - 쓰기가 실패하면 retry_backoff 초부터 두 배씩 늘려 max_retries 번 다시 시도
+    - 그래도 실패한 항목은 버리지 않고 보관했다가 requeue_delay 초 뒤 다시 대기열에 넣는다
+      (handler 는 같은 항목을 다시 받아도 안전해야 함)
+    - submit()이 돌려주는 future 로 그 항목의 기록 결과(실패 시 예외)를 확인할 수 있다
+    """
+
+    def __init__(self, name: str, handler: Callable[[List[T]], None],
+                 batch_size: int = STORAGE_BATCH_SIZE, flush_interval: float = STORAGE_FLUSH_INTERVAL_SEC,
+                 max_retries: int = STORAGE_WRITE_RETRIES, retry_backoff: float = STORAGE_RETRY_BACKOFF_SEC,
+                 requeue_delay: float = STORAGE_REQUEUE_SEC):
+        self.name = name
+        self.handler = handler
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_retries = max_retries
+        self.retry_backoff = retry_backoff
+        self.requeue_delay = requeue_delay
+        self._pending: List[Tuple[T, Optional[asyncio.Future]]] = []
+        self._failed: List[T] = []  # 재시도까지 실패해 다시 넣기를 기다리는 항목
+        self._timer: Optional[asyncio.TimerHandle] = None
+        self._requeue_timer: Optional[asyncio.TimerHandle] = None
+        self._tasks: Set[asyncio.Task] = set()
+        self._lock = asyncio.Lock()
+        self.flushed = 0
+        self.failed = 0
+        self.retries = 0
+        _batchers.add(self)
+
+    @property
+    def pending(self) -> int:
+        return len(self._pending)
+
+    @property
+    def retrying(self) -> int:
+        return len(self._failed)
+
+    def submit(self, item: T) -> asyncio.Future:
+        """대기열에 넣고 바로 반환. 돌려준 future 는 기록되면 None, 재시도까지 실패하면 예외로 끝난다"""
+        future = asyncio.get_running_loop().create_future()
+        future.add_done_callback(_retrieve)  # 기다리는 쪽이 없어도 경고가 나지 않도록 (실패는 로그 / 지표로 남음)
+        self._pending.append((item, future))
+        if len(self._pending) >= self.batch_size:
+            self._schedule(0)
+        elif self._timer is None:
+            self._schedule(self.flush_interval)
+        return future
+
+    def _schedule(self, delay: float):
+        if self._timer is not None:
+            self._timer.cancel()
+        loop = asyncio.get_running_loop()
+
+        def start():
+            self._timer = None
+            task = loop.create_task(self.flush())
+            self._tasks.add(task)
+            task.add_done_callback(self._tasks.discard)
+
+        self._timer = loop.call_later(delay, start)
+
+    async def flush(self) -> int:
+        """
+        대기 중인 항목과 다시 넣기를 기다리던 실패 항목을 모두 기록 (flush는 한 번에 하나씩만 실행).
+        재시도까지 실패해 아직 기록되지 않은 항목 수를 반환 (종료 시 0이 아니면 유실 위험).
+        """
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        async with self._lock:
+            if self._requeue_timer is not None:
+                self._requeue_timer.cancel()
+            self._requeue()
+            if self._timer is not None:  # _requeue 가 예약한 flush 는 여기서 바로 처리
+                self._timer.cancel()
+                self._timer = None
+            while self._pending:
+                batch, self._pending = self._pending[: self.batch_size], self._pending[self.batch_size:]
+                await self._write(batch)
+            return len(self._failed)
+
+    async def _write(self, batch: List[Tuple[T, Optional[asyncio.Future]]]):
+        items = [item for item, _ in batch]
+        for attempt in range(self.max_retries + 1):
+            try:
+                await run_in_storage(self.handler, items)
+                break
+            except Exception as e:
+                error = e
+                if attempt == self.max_retries:
+                    self._give_up(batch, error)
+                    return
+                self.retries += 1
+                STORAGE_WRITES.inc(len(items), batcher=self.name, result="retried")
+                delay = self.retry_backoff * 2 ** attempt
+                logger.warning("Failed to write %d %s record(s) (%s); retrying in %.2fs", len(items), self.name, e, delay)
+                await asyncio.sleep(delay)
+
+        self.flushed += len(items)
+        STORAGE_WRITES.inc(len(items), batcher=self.name, result="written")
+        for _, future in batch:
+            if future is not None and not future.done():
+                future.set_result(None)
+
+    def _give_up(self, batch: List[Tuple[T, Optional[asyncio.Future]]], error: Exception):
+        """재시도까지 실패: 기다리는 쪽에는 예외를 알리고, 항목은 보관했다가 나중에 다시 대기열로"""
+        self.failed += len(batch)
+        STORAGE_WRITES.inc(len(batch), batcher=self.name, result="failed")
+        logger.error("Failed to write %d %s record(s) after %d retries; requeueing in %.1fs",
+                     len(batch), self.name, self.max_retries, self.requeue_delay, exc_info=error)
+        for item, future in batch:
+            self._failed.append(item)
+            if future is not None and not future.done():
+                future.set_exception(error)
+        if self._requeue_timer is None:
+            self._requeue_timer = asyncio.get_running_loop().call_later(self.requeue_delay, self._requeue)
+
+    def _requeue(self):
+        self._requeue_timer = None
+        failed, self._failed = self._failed, []
+        self._pending[:0] = [(item, None) for item in failed]
+        if failed:
+            self._schedule(0)
+
+    def stats(self) -> Dict[str, int]:
+        return {"pending": self.pending, "flushed": self.flushed, "failed": self.failed,
+                "retries": self.retries, "retrying": self.retrying}
+
+
+def _retrieve(future: asyncio.Future):
+    if not future.cancelled():
+        future.exception()
+
+
+# 🟢 살아 있는 WriteBatcher 들 (/metrics 게이지용)
+_batchers: "weakref.WeakSet[WriteBatcher]" = weakref.WeakSet()
+
+
+def _backlog() -> Dict[Tuple[str, str], int]:
+    values: Dict[Tuple[str, str], int] = {}
+    for b in list(_batchers):
+        values[(b.name, "pending")] = values.get((b.name, "pending"), 0) + b.pending
+        values[(b.name, "retrying")] = values.get((b.name, "retrying"), 0) + b.retrying
+    return values
+
+
+metrics.gauge("storage_write_backlog", "Records not yet written by batched storage writes",
+              ["batcher", "state"], fn=_backlog)
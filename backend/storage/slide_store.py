@@ -0,0 +1,247 @@
+import logging
+import os
+import re
+import sqlite3
+import sys
+import threading
+from collections import OrderedDict
+from time import time
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from backend.config import SLIDE_STORE_MAX_DISK_MB, SLIDE_STORE_MEMORY_MB, SLIDE_STORE_PATH
+from backend.utils.metrics import metrics
+from backend.utils.text_utils import content_hash
+from .persistence import run_in_storage
+
+logger = logging.getLogger(__name__)
+
+REF_LENGTH = 32  # sha256 앞 128비트
+_REF = re.compile(rf"[0-9a-f]{{{REF_LENGTH}}}")
+_QUERY_CHUNK = 500  # SQLite 변수 개수 제한 안에서 한 번에 조회할 ref 수
+
+
+class SlideMissing(KeyError):
+    """ref 의 텍스트가 저장소에 없음 (디스크 삭제 / 다른 저장소 경로 / 용량 초과로 밀려남)"""
+
+    def __init__(self, refs: Sequence[str]):
+        super().__init__(f"{len(refs)} slide(s) missing from slide store: {', '.join(refs[:5])}")
+        self.refs = list(refs)
+
+
+class SlideStore:
+    """
+    내용 주소 기반(content-addressed) 슬라이드 텍스트 저장소.
+    - 텍스트는 내용 해시(ref)로 한 번만 보관하고, 그래프 상태 / 체크포인트에는 ref만 둔다
+      (피드백을 기다리는 세션과 체크포인트 버전마다 덱 전체를 복사해 두지 않음)
+    - 1차: 메모리 LRU (max_bytes), 2차: 디스크 SQLite (재시작 후 체크포인트에서 재개할 때 사용)
+      디스크는 max_disk_bytes 를 넘으면 오래 안 쓴 것부터 삭제 (쓰기 / 디스크 조회 때 사용 시각 갱신)
+    - put()은 메모리에만 넣고, flush() / aflush()가 새 항목을 한 번의 트랜잭션으로 기록
+      (기록 전 항목은 _pending 에 남아 LRU 에서 밀려나도 사라지지 않음)
+    - ref가 아닌 값(예전 체크포인트에 그대로 들어 있던 원문)은 조회 시 그대로 돌려준다
+    - 어디에도 없는 ref 는 SlideMissing (ref 를 슬라이드 텍스트로 내보내지 않도록)
+    """
+
+    def __init__(self, path: str = SLIDE_STORE_PATH, max_bytes: int = int(SLIDE_STORE_MEMORY_MB * 1024 * 1024),
+                 max_disk_bytes: int = int(SLIDE_STORE_MAX_DISK_MB * 1024 * 1024)):
+        self.path = path
+        self.max_bytes = max_bytes
+        self.max_disk_bytes = max_disk_bytes
+        self._disk_bytes = 0
+        self._memory: "OrderedDict[str, str]" = OrderedDict()
+        self._memory_bytes = 0
+        self._pending: Dict[str, str] = {}
+        self._lock = threading.Lock()      # 메모리 계층 (동기 노드는 스레드에서 실행됨)
+        self._db_lock = threading.Lock()   # 디스크 계층
+        self._conn: Optional[sqlite3.Connection] = None
+        self.disk_reads = 0
+        self.disk_writes = 0
+        self.disk_evictions = 0
+
+    @staticmethod
+    def ref(text: str) -> str:
+        return content_hash(text)[:REF_LENGTH]
+
+    @staticmethod
+    def is_ref(value) -> bool:
+        return isinstance(value, str) and len(value) == REF_LENGTH and _REF.fullmatch(value) is not None
+
+    # 🟢 디스크 계층
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute("CREATE TABLE IF NOT EXISTS slides (ref TEXT PRIMARY KEY, text TEXT, size INTEGER, accessed REAL)")
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(slides)")}
+            if "accessed" not in columns:  # 용량 제한 도입 전에 만든 파일
+                conn.execute("ALTER TABLE slides ADD COLUMN size INTEGER")
+                conn.execute("ALTER TABLE slides ADD COLUMN accessed REAL")
+                conn.execute("UPDATE slides SET size = LENGTH(CAST(text AS BLOB)), accessed = ?", (time(),))
+                conn.commit()
+            conn.execute("CREATE INDEX IF NOT EXISTS slides_accessed ON slides(accessed)")
+            self._disk_bytes = conn.execute("SELECT COALESCE(SUM(size), 0) FROM slides").fetchone()[0]
+            self._conn = conn
+        return self._conn
+
+    def _disk_put(self, items: List[Tuple[str, str]]):
+        now = time()
+        with self._db_lock:
+            db = self._db()
+            for ref, text in items:
+                size = len(text.encode("utf-8"))
+                cur = db.execute(
+                    "INSERT OR IGNORE INTO slides (ref, text, size, accessed) VALUES (?, ?, ?, ?)",
+                    (ref, text, size, now),
+                )
+                if cur.rowcount:
+                    self._disk_bytes += size
+                else:
+                    db.execute("UPDATE slides SET accessed = ? WHERE ref = ?", (now, ref))
+            self._evict(db, keep={ref for ref, _ in items})
+            db.commit()
+        self.disk_writes += len(items)
+
+    def _evict(self, db: sqlite3.Connection, keep: set):
+        """디스크 용량을 넘으면 오래 안 쓴 슬라이드부터 삭제 (방금 쓴 항목은 남김)"""
+        while self._disk_bytes > self.max_disk_bytes:
+            rows = db.execute("SELECT ref, size FROM slides ORDER BY accessed LIMIT 64").fetchall()
+            rows = [(ref, size) for ref, size in rows if ref not in keep]
+            if not rows:
+                break
+            db.executemany("DELETE FROM slides WHERE ref = ?", [(ref,) for ref, _ in rows])
+            self._disk_bytes -= sum(size or 0 for _, size in rows)
+            self.disk_evictions += len(rows)
+
+    def _disk_get(self, refs: Sequence[str]) -> Dict[str, str]:
+        found: Dict[str, str] = {}
+        with self._db_lock:
+            db = self._db()
+            for i in range(0, len(refs), _QUERY_CHUNK):
+                chunk = refs[i: i + _QUERY_CHUNK]
+                rows = db.execute(
+                    f"SELECT ref, text FROM slides WHERE ref IN ({','.join('?' * len(chunk))})", chunk
+                ).fetchall()
+                found.update(rows)
+            if found:
+                db.executemany("UPDATE slides SET accessed = ? WHERE ref = ?", [(time(), ref) for ref in found])
+                db.commit()
+        self.disk_reads += len(found)
+        with self._lock:
+            for ref, text in found.items():
+                self._memory_put(ref, text)
+        return found
+
+    # 🟢 메모리 계층 (self._lock 안에서 호출)
+    def _memory_get(self, ref: str) -> Optional[str]:
+        text = self._memory.get(ref)
+        if text is not None:
+            self._memory.move_to_end(ref)
+            return text
+        return self._pending.get(ref)
+
+    def _memory_put(self, ref: str, text: str):
+        if ref in self._memory:
+            self._memory.move_to_end(ref)
+            return
+        self._memory[ref] = text
+        self._memory_bytes += sys.getsizeof(text)
+        while self._memory_bytes > self.max_bytes and len(self._memory) > 1:
+            _, old = self._memory.popitem(last=False)
+            self._memory_bytes -= sys.getsizeof(old)
+
+    # 🟢 저장
+    def put(self, text: str) -> str:
+        return self.put_many([text])[0]
+
+    def put_many(self, texts: Iterable[str]) -> List[str]:
+        """텍스트마다 ref를 반환 (처음 보는 텍스트는 다음 flush 때 디스크에 기록)"""
+        refs = []
+        with self._lock:
+            for text in texts:
+                ref = self.ref(text)
+                if ref not in self._memory and ref not in self._pending:
+                    self._pending[ref] = text
+                self._memory_put(ref, text)
+                refs.append(ref)
+        return refs
+
+    def _take_pending(self) -> List[Tuple[str, str]]:
+        with self._lock:
+            return list(self._pending.items())
+
+    def _release_pending(self, items: List[Tuple[str, str]]):
+        with self._lock:
+            for ref, _ in items:
+                self._pending.pop(ref, None)
+
+    def flush(self):
+        """기록되지 않은 항목을 디스크에 기록 (동기 노드용)"""
+        if items := self._take_pending():
+            self._disk_put(items)
+            self._release_pending(items)
+
+    async def aflush(self):
+        """flush()를 저장소 스레드에서 실행 (노드가 ref를 상태로 내보내기 전에 호출)"""
+        if items := self._take_pending():
+            await run_in_storage(self._disk_put, items)
+            self._release_pending(items)
+
+    # 🟢 조회
+    def _lookup(self, values: Sequence[str]) -> Tuple[Dict[str, str], List[str]]:
+        found, missing = {}, []
+        with self._lock:
+            for value in values:
+                if value in found or not self.is_ref(value):
+                    continue
+                text = self._memory_get(value)
+                if text is None:
+                    missing.append(value)
+                else:
+                    found[value] = text
+        return found, missing
+
+    def get(self, value: str) -> str:
+        return self.get_many([value])[0]
+
+    @staticmethod
+    def _resolve(values: Sequence[str], found: Dict[str, str], missing: List[str]) -> List[str]:
+        if lost := [ref for ref in missing if ref not in found]:
+            logger.error("%d slide(s) missing from slide store", len(lost))
+            raise SlideMissing(lost)
+        return [found.get(v, v) for v in values]
+
+    def get_many(self, values: Sequence[str]) -> List[str]:
+        """ref 목록을 텍스트 목록으로 (메모리에 없으면 디스크에서 읽음, 어디에도 없으면 SlideMissing)"""
+        found, missing = self._lookup(values)
+        if missing:
+            found.update(self._disk_get(missing))
+        return self._resolve(values, found, missing)
+
+    async def aget(self, value: str) -> str:
+        return (await self.aget_many([value]))[0]
+
+    async def aget_many(self, values: Sequence[str]) -> List[str]:
+        """get_many()와 같지만 디스크 조회는 저장소 스레드에서 수행 (이벤트 루프 차단 방지)"""
+        found, missing = self._lookup(values)
+        if missing:
+            found.update(await run_in_storage(self._disk_get, missing))
+        return self._resolve(values, found, missing)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "memory_items": len(self._memory),
+            "memory_bytes": self._memory_bytes,
+            "max_bytes": self.max_bytes,
+            "pending": len(self._pending),
+            "disk_reads": self.disk_reads,
+            "disk_writes": self.disk_writes,
+            "disk_bytes": self._disk_bytes,
+            "max_disk_bytes": self.max_disk_bytes,
+            "disk_evictions": self.disk_evictions,
+        }
+
+
+# 🟢 프로세스 전역 슬라이드 저장소
+slide_store = SlideStore()
+
+metrics.gauge("slide_store_memory_bytes", "Slide text held in memory by the slide store",
+              fn=lambda: {(): slide_store.stats()["memory_bytes"]})
@@ -0,0 +1,203 @@
+import asyncio
+import math
+from collections import Counter, deque
+from contextlib import asynccontextmanager, contextmanager
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Deque, Dict, Optional
+
+from backend.config import (
+    ADMISSION_MAX_QUEUE,
+    ADMISSION_MAX_RUNNING,
+    ADMISSION_QUEUE_TIMEOUT_SEC,
+    ADMISSION_RETRY_AFTER_SEC,
+)
+from backend.utils.metrics import metrics
+
+ADMISSION_REJECTED = metrics.counter("admission_rejected_total", "Runs rejected by admission control", ["reason"])
+ADMISSION_WAIT_SECONDS = metrics.histogram("admission_wait_seconds", "Time a run waited for a slot")
+
+
+class AdmissionRejected(Exception):
+    """동시 실행 한도와 대기열이 모두 차서 받을 수 없음 (API 는 status_code + Retry-After 로 응답)"""
+
+    def __init__(self, status_code: int, message: str, retry_after: int):
+        super().__init__(message)
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class AdmissionSlot:
+    """실행 하나가 가진 슬롯 (피드백을 기다리는 동안에는 내려놓는다)"""
+
+    def __init__(self, controller: "AdmissionController"):
+        self.controller = controller
+        self.held = True
+        self.active_seconds = 0.0
+        self._active_since = perf_counter()
+
+    def _pause(self):
+        if self.held:
+            self.active_seconds += perf_counter() - self._active_since
+            self.held = False
+            self.controller.release()
+
+    async def _resume(self):
+        await self.controller.acquire(bounded=False)
+        self.held = True
+        self._active_since = perf_counter()
+
+    def close(self):
+        """실행이 끝났을 때 (여러 번 불러도 한 번만 반납)"""
+        if self.held:
+            self._pause()
+            self.controller.observe(self.active_seconds)
+
+    @contextmanager
+    def bound(self):
+        """이 안에서 시작한 작업(그래프 노드 포함)이 current_slot 으로 이 슬롯을 보게 한다"""
+        token = current_slot.set(self)
+        try:
+            yield self
+        finally:
+            current_slot.reset(token)
+
+
+# 🟢 현재 실행의 슬롯 (API 에서 설정, 그래프 노드 태스크로 전파)
+current_slot: ContextVar[Optional[AdmissionSlot]] = ContextVar("current_slot", default=None)
+
+
+class AdmissionController:
+    """
+    워커 프로세스당 그래프 동시 실행 수 제한 (admission control).
+    - 실행 중인 그래프가 max_running 개 미만이면 바로 시작
+    - 아니면 도착 순서대로 최대 max_queue 개까지 대기, 대기열이 가득 차면 바로 429
+    - queue_timeout 초 안에 자리가 나지 않으면 503
+    - 거절할 때는 최근 실행 시간과 대기열 길이로 추정한 Retry-After(초)를 함께 돌려준다
+    피드백을 기다리는 실행은 슬롯을 내려놓았다가 피드백이 오면 (대기열 한도 없이) 다시 받는다.
+    """
+
+    def __init__(self, max_running: int = ADMISSION_MAX_RUNNING, max_queue: int = ADMISSION_MAX_QUEUE,
+                 queue_timeout: float = ADMISSION_QUEUE_TIMEOUT_SEC, retry_after: int = ADMISSION_RETRY_AFTER_SEC):
+        self.max_running = max(1, max_running)
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout
+        self.min_retry_after = retry_after
+        self.running = 0
+        self.admitted = 0
+        self.rejected: Counter = Counter()
+        self._waiters: Deque[asyncio.Future] = deque()
+        self._avg_run_seconds: Optional[float] = None
+
+    @property
+    def queued(self) -> int:
+        return len(self._waiters)
+
+    def retry_after(self) -> int:
+        """대기열이 빠지는 데 걸릴 시간 추정 (최소 min_retry_after 초, 최대 5분)"""
+        if self._avg_run_seconds is None:
+            return self.min_retry_after
+        estimate = self._avg_run_seconds * (self.queued + 1) / self.max_running
+        return int(min(300, max(self.min_retry_after, math.ceil(estimate))))
+
+    def observe(self, seconds: float):
+        """슬롯을 쥐고 있던 시간 (Retry-After 추정용 지수 이동 평균)"""
+        avg = self._avg_run_seconds
+        self._avg_run_seconds = seconds if avg is None else 0.8 * avg + 0.2 * seconds
+
+    def _reject(self, status_code: int, reason: str, message: str):
+        self.rejected[reason] += 1
+        ADMISSION_REJECTED.inc(reason=reason)
+        raise AdmissionRejected(status_code, message, self.retry_after())
+
+    # 🟢 슬롯 획득 / 반납
+    async def acquire(self, bounded: bool = True):
+        """슬롯 하나를 얻을 때까지 대기 (bounded=False 면 대기열 한도 / 시간 제한 없이)"""
+        if self.running < self.max_running and not self._waiters:
+            self.running += 1
+            return
+        if bounded and self.queued >= self.max_queue:
+            self._reject(429, "queue_full", f"{self.running} runs in progress and {self.queued} queued")
+
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.append(future)
+        start = perf_counter()
+        try:
+            await asyncio.wait_for(future, self.queue_timeout if bounded else None)
+        except asyncio.TimeoutError:
+            self._discard(future)
+            self._reject(503, "timeout", f"no run slot within {self.queue_timeout:.0f}s")
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled():
+                self.release()  # 취소 직전에 넘겨받은 슬롯은 돌려준다
+            else:
+                self._discard(future)
+            raise
+        finally:
+            ADMISSION_WAIT_SECONDS.observe(perf_counter() - start)
+
+    def release(self):
+        """슬롯 반납: 기다리는 실행이 있으면 (running 을 줄이지 않고) 그대로 넘겨준다"""
+        while self._waiters:
+            future = self._waiters.popleft()
+            if not future.done():
+                future.set_result(None)
+                return
+        self.running -= 1
+
+    def _discard(self, future: asyncio.Future):
+        try:
+            self._waiters.remove(future)
+        except ValueError:
+            pass
+
+    async def enter(self) -> AdmissionSlot:
+        """슬롯을 얻어 반환 (거절되면 AdmissionRejected). 끝나면 slot.close()"""
+        await self.acquire()
+        self.admitted += 1
+        return AdmissionSlot(self)
+
+    @asynccontextmanager
+    async def admit(self):
+        """async with admission.admit(): ... — 슬롯을 얻고, 안에서 시작한 노드들에 슬롯을 알려 주고, 끝나면 반납"""
+        slot = await self.enter()
+        try:
+            with slot.bound():
+                yield slot
+        finally:
+            slot.close()
+
+    def stats(self) -> Dict[str, object]:
+        return {
+            "running": self.running,
+            "queued": self.queued,
+            "max_running": self.max_running,
+            "max_queue": self.max_queue,
+            "admitted": self.admitted,
+            "rejected": dict(self.rejected),
+            "avg_run_seconds": round(self._avg_run_seconds, 3) if self._avg_run_seconds is not None else None,
+            "retry_after": self.retry_after(),
+        }
+
+
+@asynccontextmanager
+async def parked():
+    """
+    오래 기다리는 구간 (사용자 피드백 대기)에서 현재 실행의 슬롯을 내려놓는다.
+    슬롯 없이 시작한 실행 (워커 / 일괄 생성 / 벤치마크)에서는 아무 일도 하지 않는다.
+    """
+    slot = current_slot.get()
+    if slot is None or not slot.held:
+        yield
+        return
+    slot._pause()
+    yield
+    # 실패 / 취소로 빠져나가면 슬롯을 다시 받지 않는다 (취소가 슬롯 대기에 막히지 않도록)
+    await slot._resume()
+
+
+# 🟢 프로세스 전역 admission controller
+admission = AdmissionController()
+
+metrics.gauge("admission_running", "Graph runs holding an admission slot", fn=lambda: {(): admission.running})
+metrics.gauge("admission_queued", "Runs waiting for an admission slot", fn=lambda: {(): admission.queued})
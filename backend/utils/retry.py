@@ -0,0 +1,30 @@
+import asyncio
+import random
+from typing import Awaitable, Callable, Optional, Tuple, Type, TypeVar
+
+T = TypeVar("T")
+
+
+async def retry_async(
+    fn: Callable[[], Awaitable[T]],
+    *,
+    retries: int,
+    backoff: float,
+    max_backoff: float = 30.0,
+    retry_on: Tuple[Type[BaseException], ...] = (Exception,),
+    should_retry: Optional[Callable[[BaseException], bool]] = None,
+) -> T:
+    """
+    fn()을 최대 retries번 재시도 (지수 백오프 + 지터).
+    should_retry가 주어지면 True를 반환하는 예외만 재시도.
+    마지막 시도까지 실패하면 예외를 그대로 전달.
+    """
+    for attempt in range(retries + 1):
+        try:
+            return await fn()
+        except retry_on as e:
+            if attempt == retries or (should_retry and not should_retry(e)):
+                raise
+            delay = min(max_backoff, backoff * (2 ** attempt))
+            await asyncio.sleep(delay * (0.5 + random.random() / 2))
+    raise AssertionError("unreachable")
@@ -0,0 +1,55 @@
+import asyncio
+from typing import Awaitable, Callable, Dict, Generic, Hashable, Iterable, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class SingleFlight(Generic[T]):
+    """
+    같은 키로 동시에 들어온 비동기 작업을 한 번만 실행 (single-flight).
+    - 처음 들어온 호출이 fn()을 태스크로 시작하고, 끝나기 전에 같은 키로 들어온 호출은 그 결과(또는 예외)를 함께 받는다
+    - 기다리던 호출이 취소되어도 작업은 끝까지 진행 (다른 호출이 기다리고 있을 수 있음)
+    - 끝난 결과는 보관하지 않는다 (보관은 캐시가 담당)
+    - aliases: 같은 작업을 가리키는 다른 키 (예: thread_id 와 요청 내용 해시) — 어느 키로 들어와도 합쳐진다
+    """
+
+    def __init__(self, name: str):
+        self.name = name
+        self._inflight: Dict[Hashable, asyncio.Task] = {}
+        self.started = 0
+        self.joined = 0
+
+    def __len__(self) -> int:
+        return len(set(self._inflight.values()))
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._inflight
+
+    def get(self, *keys: Hashable) -> Optional[asyncio.Task]:
+        """keys 중 하나로 진행 중인 작업 (없으면 None)"""
+        return next((self._inflight[k] for k in keys if k in self._inflight), None)
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]], aliases: Iterable[Hashable] = ()) -> Tuple[T, bool]:
+        """(결과, 이미 진행 중이던 작업의 결과를 받았는지)"""
+        keys = (key, *aliases)
+        task = self.get(*keys)
+        shared = task is not None
+        if shared:
+            self.joined += 1
+        else:
+            task = asyncio.ensure_future(fn())
+            for k in keys:
+                self._inflight[k] = task
+            self.started += 1
+            task.add_done_callback(lambda t: self._done(keys, t))
+        return await asyncio.shield(task), shared
+
+    def _done(self, keys: Tuple[Hashable, ...], task: asyncio.Task):
+        for key in keys:
+            if self._inflight.get(key) is task:
+                del self._inflight[key]
+        if not task.cancelled():
+            task.exception()  # 기다리던 호출이 모두 취소된 경우에도 예외를 회수
+
+    def stats(self) -> Dict[str, int]:
+        return {"in_flight": len(self), "started": self.started, "joined": self.joined}
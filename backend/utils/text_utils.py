@@ -1,3 +1,5 @@
+import hashlib
+import re
 import json
 
 def clean_text(text: str) -> str:
@@ -7,3 +9,12 @@ def clean_text(text: str) -> str:
 def to_json(data) -> str:
     """데이터를 JSON 형식으로 변환"""
     return json.dumps(data, ensure_ascii=False, indent=2)
+
+def content_hash(text: str) -> str:
+    """텍스트 내용 기반 해시 (캐시/중복 제거 키)"""
+    return hashlib.sha256(text.encode("utf-8")).hexdigest()
+
+def normalize_text(text: str) -> str:
+    """비교용 정규화 (소문자, 문장부호 제거, 공백 정리)"""
+    text = re.sub(r"[^\w\s]", " ", text.lower())
+    return " ".join(text.split())
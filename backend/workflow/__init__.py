@@ -1,3 +1,18 @@
-from .presentation_workflow import generate_presentation, feedback_queue
+from .presentation_workflow import (
+    generate_presentation, stream_presentation, shutdown_workflows, DEFAULT_WORKFLOW, STAGED_WORKFLOW,
+)
+from .graph_registry import graph_registry
+from .feedback import feedback_broker
+from .events import event_bus, format_sse
 
-__all__ = ["generate_presentation", "feedback_queue"]
+__all__ = [
+    "generate_presentation",
+    "stream_presentation",
+    "shutdown_workflows",
+    "feedback_broker",
+    "graph_registry",
+    "event_bus",
+    "format_sse",
+    "DEFAULT_WORKFLOW",
+    "STAGED_WORKFLOW",
+]
@@ -1,37 +1,153 @@
 # agents.py
 
-import json
+import asyncio
+import logging
 from dotenv import load_dotenv
-from typing import List
-from pydantic import ValidationError
-from langchain_openai import ChatOpenAI, OpenAI
-from langchain_community.utilities.dalle_image_generator import DallEAPIWrapper
+from typing import AsyncIterator, List, Optional, Union
 from .graph_state import OutlineModel, SlideContentModel, FinalMarpModel
+from .outline_parser import OutlineStreamParser, parse_outline_item, parse_outline_text
+from .llm_cache import llm_cache
+from .scheduler import scheduler, estimate_tokens
+from .providers import providers
+from .context import current_thread_id
+from .events import TokenStream, event_bus
+from backend.config import LLM_STREAMING
+from .instrumentation import AGENT_SECONDS, record_cache
+from .prompt_packing import pack_slides, pack_slides_async
+from time import perf_counter
 
 # ✅ 환경 변수 로드
 load_dotenv()
 
-# ✅ LLM 기본 설정 (ChatOpenAI / OpenAI)
-# JSON 형식 LLM (코드 블록 / 설명 없이 "json_object"만 반환)
-llm = ChatOpenAI(model="gpt-4o-mini", temperature=0.7)
-llm_json = ChatOpenAI(
-    model="gpt-4o-mini",
-    temperature=0,
-    model_kwargs={"response_format": {"type": "json_object"}}
-)
-openai_llm = OpenAI(model="gpt-4o-mini", temperature=0)
+logger = logging.getLogger(__name__)
 
-# ✅ DALL·E API 설정 (이미지 생성용)
-dalle = DallEAPIWrapper(model="dall-e-3", size="1024x1024", quality="standard", n=1)
+# ✅ LLM / DALL·E 클라이언트는 providers 컨테이너가 처음 사용할 때 생성
+#    (import 시점에 langchain_openai / openai 를 불러오지 않고 OPENAI_API_KEY 도 필요 없음)
+def __getattr__(name):
+    # 예전 모듈 전역(agents.llm 등) 접근 호환
+    if name in ("llm", "llm_json", "openai_llm"):
+        return providers.get(name)
+    if name == "dalle":
+        return providers.get("image")
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
-# 🟢 개요들(OutlineModel 리스트)을 JSON으로 반환
-def generate_outline(topic: str, style: str, last_msg: str) -> List[OutlineModel]:
+# 🟢 LLM / 이미지 제공자 교체 (벤치마크·오프라인 실행용 대역 주입)
+def configure_providers(*, llm=None, llm_json=None, image=None):
+    """
+    agent들이 사용하는 provider를 교체. None인 항목은 그대로 둔다.
+    - llm / llm_json : invoke / ainvoke(prompt) -> .content 를 지원하는 객체
+    - image          : async arun(description) -> 이미지 URL 을 지원하는 객체
+    """
+    providers.configure(llm=llm, llm_json=llm_json, image=image)
+
+
+# 🟢 캐시를 거치는 LLM 호출 (agent 이름별 opt-out / hit·miss 집계 / 소요 시간 계측)
+def _invoke(model, prompt: str, agent: str) -> str:
+    start = perf_counter()
+    try:
+        if not llm_cache.enabled_for(agent, model):
+            return model.invoke(prompt).content
+
+        key = llm_cache.make_key(model, prompt)
+        cached = llm_cache.get(key, agent)
+        record_cache(agent, cached is not None)
+        if cached is not None:
+            return cached
+        content = model.invoke(prompt).content
+        llm_cache.put(key, content)
+        return content
+    finally:
+        AGENT_SECONDS.observe(perf_counter() - start, agent=agent)
+
+
+def _model_name(model) -> str:
+    return getattr(model, "model_name", None) or getattr(model, "model", None) or "unknown"
+
+
+async def _scheduled_ainvoke(model, prompt: str) -> str:
+    """프로세스 전역 스케줄러(모델별 rate limit / 동시 실행 제한 / 재시도)를 거쳐 호출"""
+    resp = await scheduler.run(
+        _model_name(model), lambda: model.ainvoke(prompt), tokens=estimate_tokens(prompt)
+    )
+    return resp.content
+
+
+async def _scheduled_astream(model, prompt: str, tokens: TokenStream) -> str:
+    """스케줄러를 거쳐 astream으로 호출하고, 생성되는 조각을 이벤트로 발행하며 전체 텍스트를 모은다"""
+    async def run() -> str:
+        tokens.start()  # 재시도되면 클라이언트가 받은 조각을 버리도록 다시 시작을 알림
+        parts = []
+        async for chunk in model.astream(prompt):
+            if chunk.content:
+                parts.append(chunk.content)
+                tokens.push(chunk.content)
+        return "".join(parts)
+
+    return await scheduler.run(_model_name(model), run, tokens=estimate_tokens(prompt))
+
+
+def _token_stream(agent: str, stream: Optional[str]) -> Optional[TokenStream]:
+    """stream 이름이 있고 현재 세션을 구독 중인 클라이언트가 있을 때만 스트리밍"""
+    thread_id = current_thread_id.get()
+    if stream is None or not LLM_STREAMING or not event_bus.has_subscribers(thread_id):
+        return None
+    return TokenStream(thread_id, agent, stream)
+
+
+async def _ainvoke(model, prompt: str, agent: str, stream: Optional[str] = None) -> str:
     """
-    개요들(OutlineModel 리스트)을 JSON으로 반환.
-    마지막 메시지(last_msg)를 추가 문맥으로 고려.
+    캐시 → 스케줄러를 거쳐 호출. stream 이름을 주면 응답 조각을 현재 세션에 이벤트로 보낸다
+    (결과 문자열은 스트리밍 여부와 관계없이 같음).
     """
-    prompt = f"""Return a JSON array of outline items for a {style} style presentation on '{topic}'.
+    start = perf_counter()
+    tokens = _token_stream(agent, stream)
+
+    async def call() -> str:
+        if tokens is None:
+            return await _scheduled_ainvoke(model, prompt)
+        content = await _scheduled_astream(model, prompt, tokens)
+        tokens.end(content)
+        return content
+
+    try:
+        # 영구 캐시 대상이 아니면 일괄 생성 중일 때만 그 배치 안에서 공유 (메모리 dict, 영구 캐시에 쓰지 않음)
+        persistent = llm_cache.enabled_for(agent, model)
+        scope = None if persistent else llm_cache.share_scope(agent)
+        if not persistent and scope is None:
+            return await call()
+
+        key = llm_cache.make_key(model, prompt)
+        cached = await llm_cache.aget(key, agent) if persistent else scope.get(key)
+        if cached is not None:
+            record_cache(agent, True)
+            if tokens is not None:
+                tokens.start()
+                tokens.end(cached, cached=True)
+            return cached
+
+        async def fetch() -> str:
+            content = await call()
+            if persistent:
+                await llm_cache.aput(key, content)
+            else:
+                scope[key] = content
+            return content
+
+        # 같은 프롬프트가 이미 호출 중이면 (다른 세션 / 덱 포함) 그 결과를 함께 받음
+        content, shared = await llm_cache.inflight.do(key, fetch)
+        record_cache(agent, False, shared=shared)
+        if shared and tokens is not None:
+            tokens.start()
+            tokens.end(content, cached=True)
+        return content
+    finally:
+        AGENT_SECONDS.observe(perf_counter() - start, agent=agent)
+
+
+# 🟢 개요들(OutlineModel 리스트)을 JSON으로 반환
+def _outline_prompt(topic: str, style: str, last_msg: str) -> str:
+    return f"""Return a JSON array of outline items for a {style} style presentation on '{topic}'.
 The user has an additional message or context: '{last_msg}'
 
 return type: arrayed objects
@@ -45,36 +161,155 @@ return type: arrayed objects
 Do not include extra keys. No code blocks. JSON only.
 """
 
-    resp = llm_json.invoke(prompt).content
+
+def _outline_item_prompt(topic: str, style: str, last_msg: str, index: int, fragment: str) -> str:
+    return f"""Return a JSON object for outline item #{index} of a {style} style presentation on '{topic}'.
+The user has an additional message or context: '{last_msg}'
+A previous attempt produced this malformed item: {fragment[:1000]}
+
+return type: object
+{{
+    title (string):  "Outline Title"
+    content (string):  "Actual text (markdown/HTML)"
+    images (int):  "Number of images per outline"
+    image_positions (list[string]):  "Positions where images will appear"
+    pages (int):  "Number of pages if content is large"
+}}
+Do not include extra keys. No code blocks. JSON only.
+"""
+
+
+class _OutlineCollector:
+    """_scheduled_astream에 넘기는 수신기: 조각을 파서에 넣고 닫힌 항목을 큐로 보냄"""
+
+    def __init__(self, queue: asyncio.Queue):
+        self.parser = OutlineStreamParser()
+        self.queue = queue
+        self.sent = 0
+
+    def start(self):
+        # 재시도로 응답을 처음부터 다시 받으면, 이미 내보낸 항목 수만큼은 건너뛴다
+        self.parser.reset()
+
+    def _emit(self, fragments: List[str]):
+        first = self.parser.items - len(fragments)  # 이번 조각들의 응답 내 순번
+        for i, fragment in enumerate(fragments, first):
+            if i >= self.sent:
+                self.sent += 1
+                self.queue.put_nowait(fragment)
+
+    def push(self, delta: str):
+        self._emit(self.parser.feed(delta))
+
+    def close(self):
+        self._emit(self.parser.close())
+
+
+async def _outline_fragments(model, prompt: str, agent: str) -> AsyncIterator[str]:
+    """개요 응답에서 항목 조각을 닫히는 즉시 내보냄 (캐시에 있으면 저장된 응답을 나눠서)"""
+    key = llm_cache.make_key(model, prompt) if llm_cache.enabled_for(agent, model) else None
+    cached = await llm_cache.aget(key, agent) if key else None
+    if key:
+        record_cache(agent, cached is not None)
+    if cached is not None:
+        for fragment, _ in parse_outline_text(cached):
+            yield fragment
+        return
+
+    queue: asyncio.Queue = asyncio.Queue()
+    collector = _OutlineCollector(queue)
+    done = object()
+    task = asyncio.create_task(_scheduled_astream(model, prompt, collector))
+    task.add_done_callback(lambda _: queue.put_nowait(done))
     try:
-        data = json.loads(resp)
-        if isinstance(data, dict):
-            data = data[[*data.keys()][0]]
-        # print(data)
-        return data
-        outlines = []
-        for item in data:
-            outlines.append(OutlineModel(**item))
-        return outlines
-    except (json.JSONDecodeError, ValidationError):
-        return []
+        while (fragment := await queue.get()) is not done:
+            yield fragment
+        text = task.result()  # 호출이 실패했다면 여기서 예외
+        collector.close()
+        while not queue.empty():
+            yield queue.get_nowait()
+        if key and all(item is not None for _, item in parse_outline_text(text)):
+            await llm_cache.aput(key, text)
+    finally:
+        if not task.done():
+            task.cancel()
+
+
+async def _reparse_outline_item(topic: str, style: str, last_msg: str, index: int, fragment: str):
+    """고치지 못한 개요 항목 하나만 다시 요청 (실패하면 None)"""
+    prompt = _outline_item_prompt(topic, style, last_msg, index, fragment)
+    try:
+        return parse_outline_item(await _ainvoke(providers.llm_json, prompt, "generate_outline_item"))
+    except Exception:
+        logger.exception("Re-requesting outline item #%d failed", index)
+        return None
+
+
+async def generate_outline_stream(topic: str, style: str, last_msg: str) -> AsyncIterator[OutlineModel]:
+    """
+    개요를 스트리밍으로 받아, 항목 객체가 닫히는 즉시 OutlineModel로 검증하여 순서대로 내보냄.
+    - 깨진 항목은 고쳐 보고(뒤따르는 쉼표 / 잘린 괄호 등), 안 되면 그 항목만 다시 요청
+    - 다시 요청해도 안 되는 항목은 건너뛰고, 항목이 하나도 없으면 전체를 한 번 더 요청한 뒤 ValueError
+    """
+    agent = "generate_outline"
+    start = perf_counter()
+    try:
+        for attempt in range(2):
+            emitted = 0
+            prompt = _outline_prompt(topic, style, last_msg)
+            async for fragment in _outline_fragments(providers.llm_json, prompt, agent):
+                index = emitted + 1
+                item = parse_outline_item(fragment)
+                if item is None:
+                    logger.warning("Malformed outline item #%d, re-requesting it: %.200s", index, fragment)
+                    item = await _reparse_outline_item(topic, style, last_msg, index, fragment)
+                if item is None:
+                    continue
+                emitted += 1
+                yield item
+            if emitted:
+                return
+            logger.warning("Outline response had no usable items (attempt %d)", attempt + 1)
+        raise ValueError(f"개요를 생성하지 못했습니다: '{topic}'")
+    finally:
+        AGENT_SECONDS.observe(perf_counter() - start, agent=agent)
 
 
 # 🟢 개요 관련성 검사 Agent
-def check_relevance(outline: str, topic: str) -> bool:
-    """개요가 주제와 관련이 있는지 평가"""
-    prompt = (
+def _relevance_prompt(outline: str, topic: str) -> str:
+    return (
         f"Does the following outline accurately match the topic '{topic}'? "
         f"Respond with 'Yes' if relevant and 'No' if not.\n\nOutline:\n{outline}"
     )
-    response = llm.invoke(prompt).content
+
+
+def check_relevance(outline: str, topic: str) -> bool:
+    """개요가 주제와 관련이 있는지 평가"""
+    response = _invoke(providers.llm, _relevance_prompt(outline, topic), "check_relevance")
+    return "yes" in response.lower()
+
+
+async def check_relevance_async(outline: str, topic: str) -> bool:
+    """check_relevance의 비동기 버전"""
+    response = await _ainvoke(providers.llm, _relevance_prompt(outline, topic), "check_relevance")
     return "yes" in response.lower()
 
 # 🟢 개요 확장 Agent
-def refine_outline(outline: str) -> str:
-    """기존 개요를 더 세부적으로 확장"""
+def _refine_prompt(outline: str, instruction: str = "") -> str:
     prompt = f"Expand and enrich this `content` for a presentation with more details.\nReturn only the content, without any other explanation.\ncontent:{outline}"
-    return llm.invoke(prompt).content
+    if instruction:
+        prompt += f"\n\nRevise the content according to this feedback from the user: {instruction}"
+    return prompt
+
+
+def refine_outline(outline: str, instruction: str = "") -> str:
+    """기존 개요를 더 세부적으로 확장 (instruction이 있으면 사용자 피드백을 반영)"""
+    return _invoke(providers.llm, _refine_prompt(outline, instruction), "refine_outline")
+
+
+async def refine_outline_async(outline: str, instruction: str = "") -> str:
+    """refine_outline의 비동기 버전"""
+    return await _ainvoke(providers.llm, _refine_prompt(outline, instruction), "refine_outline")
 
 # 🟢 슬라이드 분할 Agent (OutlineModel → list[str])
 def split_outline_to_slides(outline_item: OutlineModel) -> List[str]:
@@ -95,48 +330,96 @@ def split_outline_to_slides(outline_item: OutlineModel) -> List[str]:
     return slides
 
 # 🟢 디자인 적용 Agent (비동기)
-async def apply_design_async(slides: List[str], style: str) -> List[str]:
+async def apply_design_async(slides: Union[str, List[str]], style: str, stream: Optional[str] = None) -> str:
     """
-    슬라이드에 디자인 스타일을 적용 (비동기)
+    슬라이드에 디자인 스타일을 적용 (비동기).
+    디자인된 Markdown 문자열을 반환 (여러 슬라이드면 '---' 로 구분된 상태 그대로).
+    stream 이름을 주면 생성 중인 조각을 현재 세션에 token 이벤트로 보낸다.
     """
+    if isinstance(slides, str):
+        slides = [slides]
+    # 디자인은 슬라이드 원문(이미지 링크 / 지시문 포함)을 그대로 다듬어야 하므로 정리하거나 자르지 않는다
+    content = "\n---\n".join(slides)
     prompt = (
         f"Apply a {style} design theme to the following slides. "
         "Format them properly for a professional presentation:\n\n"
-        f"{slides}"
+        f"{content}"
     )
-    resp = await llm.ainvoke(prompt)
-    return resp.content.split("\n")
+    return await _ainvoke(providers.llm, prompt, "apply_design", stream)
 
 # 🟢 이미지 생성 Prompt 생성 및 호출 (비동기)
-async def generate_image_async(topic: str, thread_id: str) -> str:
-    """프레젠테이션 주제에 맞는 이미지를 생성"""
-    # LLM을 사용하여 이미지 생성 프롬프트 생성
+async def describe_image_async(topic: str, concept: str) -> str:
+    """슬라이드 개념(concept)에 맞는 이미지 설명을 LLM으로 생성"""
     prompt_for_image = (
-        f"Create a detailed description for an AI-generated image that represents '{topic}'. "
+        f"Create a detailed description for an AI-generated image that represents '{concept}' "
+        f"in a presentation about '{topic}'. "
         "Make sure the description is visually descriptive, specifying colors, composition, and context."
     )
-    image_description_resp = await llm.ainvoke(prompt_for_image)
-    image_description = image_description_resp.content
+    return await _ainvoke(providers.llm, prompt_for_image, "image_prompt")
+
+
+async def render_image_async(image_description: str) -> str:
+    """DALL·E로 이미지를 생성하고 URL을 반환"""
+    image = providers.image
+    return await scheduler.run(image.model_name, lambda: image.arun(image_description))
+
+
+# 🟢 토큰 예산을 넘는 덱은 묶음별로 압축 (map 단계)
+def _condense_prompt(chunk: str) -> str:
+    return (
+        "Condense the following presentation slides into compact notes. "
+        "Keep every key point, number and name and the slide numbers, and drop formatting:\n\n"
+        f"{chunk}"
+    )
+
+
+async def condense_slides_async(chunk: str) -> str:
+    """번호가 붙은 슬라이드 묶음을 핵심만 남긴 메모로 압축"""
+    return await _ainvoke(providers.llm, _condense_prompt(chunk), "condense_slides")
 
-    # DALL·E에 최적화된 프롬프트로 이미지 생성
-    return dalle.run(image_description)
 
 # 🟢 요약 슬라이드 생성 Agent
-def generate_summary(slides: List[str]) -> str:
-    """프레젠테이션의 요약 슬라이드를 생성"""
-    prompt = (
+def _summary_prompt(content: str) -> str:
+    return (
         "Generate a concise summary slide that captures the key points "
         "from the following slides:\n\n"
-        f"{slides}"
+        f"{content}"
     )
-    return llm.invoke(prompt).content
+
+
+def generate_summary(slides: List[str]) -> str:
+    """프레젠테이션의 요약 슬라이드를 생성"""
+    content = pack_slides(slides, "generate_summary")
+    return _invoke(providers.llm, _summary_prompt(content), "generate_summary")
+
+
+async def generate_summary_async(slides: List[str]) -> str:
+    """
+    generate_summary의 비동기 버전 (예산을 넘으면 슬라이드를 묶음별로 압축한 뒤 요약).
+    생성 중인 요약은 "summary" 스트림의 token 이벤트로 전송된다.
+    """
+    content = await pack_slides_async(slides, "generate_summary", condense_slides_async)
+    return await _ainvoke(providers.llm, _summary_prompt(content), "generate_summary", stream="summary")
 
 # 🟢 발표 스크립트 생성 Agent
-def generate_narration(slides: List[str]) -> str:
-    """발표자가 참고할 발표 스크립트 생성"""
-    prompt = (
+def _narration_prompt(content: str) -> str:
+    return (
         "Write a professional and engaging presentation script based on the following slides. "
         "Ensure a natural flow and appropriate transitions:\n\n"
-        f"{slides}"
+        f"{content}"
     )
-    return llm.invoke(prompt).content
+
+
+def generate_narration(slides: List[str]) -> str:
+    """발표자가 참고할 발표 스크립트 생성"""
+    content = pack_slides(slides, "generate_narration")
+    return _invoke(providers.llm, _narration_prompt(content), "generate_narration")
+
+
+async def generate_narration_async(slides: List[str]) -> str:
+    """
+    generate_narration의 비동기 버전 (예산을 넘으면 슬라이드를 묶음별로 압축한 뒤 작성).
+    생성 중인 스크립트는 "narration" 스트림의 token 이벤트로 전송된다.
+    """
+    content = await pack_slides_async(slides, "generate_narration", condense_slides_async)
+    return await _ainvoke(providers.llm, _narration_prompt(content), "generate_narration", stream="narration")
@@ -0,0 +1,225 @@
+import asyncio
+import os
+from typing import Any, AsyncIterator, Dict, Iterator, Optional, Sequence, Tuple
+
+from langgraph.checkpoint.base import (
+    WRITES_IDX_MAP,
+    BaseCheckpointSaver,
+    ChannelVersions,
+    Checkpoint,
+    CheckpointMetadata,
+    CheckpointTuple,
+    get_checkpoint_id,
+)
+from backend.config import CHECKPOINT_BACKEND, CHECKPOINT_SQLITE_PATH
+
+
+class MongoCheckpointSaver(BaseCheckpointSaver):
+    """
+    FileManager가 사용하는 MongoDB에 LangGraph 체크포인트를 저장하는 체크포인터.
+    - {collection}_checkpoints : 체크포인트 본문 (thread_id, checkpoint_ns, checkpoint_id)
+    - {collection}_checkpoint_writes : 노드별 중간 기록 (pending writes)
+    비동기 메서드는 동기 pymongo 호출을 스레드로 넘겨 이벤트 루프를 막지 않는다.
+    """
+
+    def __init__(self, db, collection_name: str, *, serde=None):
+        super().__init__(serde=serde)
+        self.checkpoints = db[f"{collection_name}_checkpoints"]
+        self.writes = db[f"{collection_name}_checkpoint_writes"]
+        self._indexed = False
+
+    @classmethod
+    def from_file_manager(cls, file_manager, **kwargs) -> "MongoCheckpointSaver":
+        return cls(file_manager.db, file_manager.collection.name, **kwargs)
+
+    def _ensure_indexes(self):
+        if self._indexed:
+            return
+        self.checkpoints.create_index(
+            [("thread_id", 1), ("checkpoint_ns", 1), ("checkpoint_id", -1)], unique=True
+        )
+        self.writes.create_index(
+            [("thread_id", 1), ("checkpoint_ns", 1), ("checkpoint_id", 1), ("task_id", 1), ("idx", 1)],
+            unique=True,
+        )
+        self._indexed = True
+
+    def _to_tuple(self, doc: Dict[str, Any]) -> CheckpointTuple:
+        key = {
+            "thread_id": doc["thread_id"],
+            "checkpoint_ns": doc["checkpoint_ns"],
+            "checkpoint_id": doc["checkpoint_id"],
+        }
+        writes = self.writes.find(key).sort([("task_id", 1), ("idx", 1)])
+        parent_id = doc.get("parent_checkpoint_id")
+        return CheckpointTuple(
+            config={"configurable": key},
+            checkpoint=self.serde.loads_typed((doc["type"], doc["checkpoint"])),
+            metadata=self.serde.loads_typed((doc["metadata_type"], doc["metadata"])),
+            parent_config=(
+                {"configurable": {**key, "checkpoint_id": parent_id}} if parent_id else None
+            ),
+            pending_writes=[
+                (w["task_id"], w["channel"], self.serde.loads_typed((w["type"], w["value"])))
+                for w in writes
+            ],
+        )
+
+    def get_tuple(self, config) -> Optional[CheckpointTuple]:
+        configurable = config["configurable"]
+        query = {
+            "thread_id": configurable["thread_id"],
+            "checkpoint_ns": configurable.get("checkpoint_ns", ""),
+        }
+        if checkpoint_id := get_checkpoint_id(config):
+            query["checkpoint_id"] = checkpoint_id
+
+        doc = self.checkpoints.find_one(query, sort=[("checkpoint_id", -1)])
+        return self._to_tuple(doc) if doc else None
+
+    def list(
+        self,
+        config,
+        *,
+        filter: Optional[Dict[str, Any]] = None,
+        before=None,
+        limit: Optional[int] = None,
+    ) -> Iterator[CheckpointTuple]:
+        query: Dict[str, Any] = {}
+        if config:
+            configurable = config["configurable"]
+            query["thread_id"] = configurable["thread_id"]
+            if "checkpoint_ns" in configurable:
+                query["checkpoint_ns"] = configurable["checkpoint_ns"]
+        for k, v in (filter or {}).items():
+            query[f"metadata_plain.{k}"] = v
+        if before and (before_id := get_checkpoint_id(before)):
+            query["checkpoint_id"] = {"$lt": before_id}
+
+        cursor = self.checkpoints.find(query).sort("checkpoint_id", -1)
+        if limit:
+            cursor = cursor.limit(limit)
+        for doc in cursor:
+            yield self._to_tuple(doc)
+
+    def put(
+        self,
+        config,
+        checkpoint: Checkpoint,
+        metadata: CheckpointMetadata,
+        new_versions: ChannelVersions,
+    ):
+        self._ensure_indexes()
+        configurable = config["configurable"]
+        key = {
+            "thread_id": configurable["thread_id"],
+            "checkpoint_ns": configurable.get("checkpoint_ns", ""),
+            "checkpoint_id": checkpoint["id"],
+        }
+        type_, data = self.serde.dumps_typed(checkpoint)
+        metadata_type, metadata_data = self.serde.dumps_typed(metadata)
+        self.checkpoints.update_one(
+            key,
+            {
+                "$set": {
+                    "parent_checkpoint_id": configurable.get("checkpoint_id"),
+                    "type": type_,
+                    "checkpoint": data,
+                    "metadata_type": metadata_type,
+                    "metadata": metadata_data,
+                    # list(filter=...) 용 단순 값 메타데이터
+                    "metadata_plain": {
+                        k: v for k, v in metadata.items() if isinstance(v, (str, int, float, bool))
+                    },
+                }
+            },
+            upsert=True,
+        )
+        return {"configurable": key}
+
+    def put_writes(
+        self,
+        config,
+        writes: Sequence[Tuple[str, Any]],
+        task_id: str,
+        task_path: str = "",
+    ) -> None:
+        from pymongo import UpdateOne
+
+        self._ensure_indexes()
+        configurable = config["configurable"]
+        key = {
+            "thread_id": configurable["thread_id"],
+            "checkpoint_ns": configurable.get("checkpoint_ns", ""),
+            "checkpoint_id": configurable["checkpoint_id"],
+            "task_id": task_id,
+        }
+        ops = []
+        for idx, (channel, value) in enumerate(writes):
+            type_, data = self.serde.dumps_typed(value)
+            ops.append(
+                UpdateOne(
+                    {**key, "idx": WRITES_IDX_MAP.get(channel, idx)},
+                    {"$set": {"channel": channel, "type": type_, "value": data, "task_path": task_path}},
+                    upsert=True,
+                )
+            )
+        if ops:
+            self.writes.bulk_write(ops)
+
+    async def aget_tuple(self, config) -> Optional[CheckpointTuple]:
+        return await asyncio.to_thread(self.get_tuple, config)
+
+    async def alist(self, config, *, filter=None, before=None, limit=None) -> AsyncIterator[CheckpointTuple]:
+        items = await asyncio.to_thread(
+            lambda: [*self.list(config, filter=filter, before=before, limit=limit)]
+        )
+        for item in items:
+            yield item
+
+    async def aput(self, config, checkpoint, metadata, new_versions):
+        return await asyncio.to_thread(self.put, config, checkpoint, metadata, new_versions)
+
+    async def aput_writes(self, config, writes, task_id, task_path: str = "") -> None:
+        await asyncio.to_thread(self.put_writes, config, writes, task_id, task_path)
+
+
+def create_checkpointer(backend: str = CHECKPOINT_BACKEND) -> BaseCheckpointSaver:
+    """
+    설정된 백엔드의 체크포인터 생성.
+    - sqlite (기본): 로컬 디스크의 CHECKPOINT_SQLITE_PATH
+    - mongo: FileManager의 MongoDB 컬렉션 옆에 저장
+    - memory: 프로세스 메모리 (재시작 시 유실, 벤치마크/개발용)
+
+    AsyncSqliteSaver는 실행 중인 이벤트 루프에 묶이므로, sqlite 백엔드는
+    이벤트 루프 안에서(첫 요청 또는 startup warmup 시) 그래프를 컴파일할 때 생성해야 한다.
+    """
+    if backend == "sqlite":
+        import aiosqlite
+        from langgraph.checkpoint.sqlite.aio import AsyncSqliteSaver
+
+        os.makedirs(os.path.dirname(CHECKPOINT_SQLITE_PATH) or ".", exist_ok=True)
+        # 연결은 첫 사용 시 saver.setup()에서 열린다
+        return AsyncSqliteSaver(aiosqlite.connect(CHECKPOINT_SQLITE_PATH))
+
+    if backend == "mongo":
+        from backend.storage.file_manager import FileManager
+
+        return MongoCheckpointSaver.from_file_manager(FileManager())
+
+    if backend == "memory":
+        from langgraph.checkpoint.memory import MemorySaver
+
+        return MemorySaver()
+
+    raise ValueError(f"지원되지 않는 체크포인터입니다: {backend} (sqlite, mongo, memory)")
+
+
+async def close_checkpointer(checkpointer: BaseCheckpointSaver) -> None:
+    """
+    체크포인터가 잡고 있는 연결을 정리.
+    AsyncSqliteSaver의 aiosqlite 연결은 별도 스레드라 닫지 않으면 프로세스가 종료되지 않는다.
+    """
+    conn = getattr(checkpointer, "conn", None)
+    if conn is not None and hasattr(conn, "close") and asyncio.iscoroutinefunction(conn.close):
+        await conn.close()
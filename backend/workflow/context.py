@@ -0,0 +1,4 @@
+from contextvars import ContextVar
+
+# 🟢 현재 실행 중인 세션의 thread_id (generate_presentation에서 설정, 노드/agent 태스크로 전파)
+current_thread_id: ContextVar[str] = ContextVar("current_thread_id", default="-")
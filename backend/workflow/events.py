@@ -0,0 +1,94 @@
+import asyncio
+import json
+from time import monotonic
+from typing import Any, Dict, List, Set
+
+from backend.config import STREAM_TOKEN_INTERVAL_SEC
+
+
+class EventBus:
+    """
+    thread_id별 진행 이벤트 채널.
+    노드/슬라이드 작업이 publish()한 이벤트를 해당 thread를 구독 중인 클라이언트(SSE)에게 전달.
+    구독자가 없으면 이벤트는 버려지고, 느린 구독자는 오래된 이벤트부터 잃는다 (메모리 상한 유지).
+    """
+
+    def __init__(self, max_queue: int = 1000):
+        self.max_queue = max_queue
+        self._subscribers: Dict[str, Set[asyncio.Queue]] = {}
+
+    def subscribe(self, thread_id: str) -> asyncio.Queue:
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_queue)
+        self._subscribers.setdefault(thread_id, set()).add(queue)
+        return queue
+
+    def unsubscribe(self, thread_id: str, queue: asyncio.Queue):
+        subscribers = self._subscribers.get(thread_id)
+        if subscribers is not None:
+            subscribers.discard(queue)
+            if not subscribers:
+                del self._subscribers[thread_id]
+
+    def has_subscribers(self, thread_id: str) -> bool:
+        return bool(self._subscribers.get(thread_id))
+
+    def publish(self, thread_id: str, event: str, **data: Any):
+        for queue in self._subscribers.get(thread_id, ()):
+            if queue.full():
+                queue.get_nowait()
+            queue.put_nowait({"event": event, "thread_id": thread_id, **data})
+
+
+class TokenStream:
+    """
+    생성 중인 LLM 응답을 조각 단위로 발행 (stream_start → token ... → stream_end).
+    - 조각은 interval 초마다 모아서 보내 느린 구독자의 큐가 넘치지 않게 한다
+    - stream_end 에 전체 텍스트를 실어 보내므로 클라이언트는 최종 결과로 덮어쓸 수 있다
+    - 재시도로 start()가 다시 호출되면 클라이언트는 그때까지 받은 조각을 버린다
+    """
+
+    def __init__(self, thread_id: str, agent: str, stream: str, interval: float = STREAM_TOKEN_INTERVAL_SEC):
+        self.thread_id = thread_id
+        self.agent = agent
+        self.stream = stream
+        self.interval = interval
+        self._buffer: List[str] = []
+        self._flushed = 0.0
+
+    def _publish(self, event: str, **data: Any):
+        event_bus.publish(self.thread_id, event, agent=self.agent, stream=self.stream, **data)
+
+    def start(self):
+        self._buffer = []
+        self._flushed = monotonic()
+        self._publish("stream_start")
+
+    def push(self, delta: str):
+        self._buffer.append(delta)
+        if monotonic() - self._flushed >= self.interval:
+            self.flush()
+
+    def flush(self):
+        if self._buffer:
+            self._publish("token", delta="".join(self._buffer))
+            self._buffer = []
+        self._flushed = monotonic()
+
+    def end(self, text: str, cached: bool = False):
+        self.flush()
+        self._publish("stream_end", text=text, cached=cached)
+
+
+def _default(o: Any):
+    if hasattr(o, "model_dump"):
+        return o.model_dump()
+    return str(o)
+
+
+def format_sse(event: Dict[str, Any]) -> str:
+    """이벤트를 Server-Sent Events 형식으로 직렬화"""
+    return f"event: {event['event']}\ndata: {json.dumps(event, ensure_ascii=False, default=_default)}\n\n"
+
+
+# 🟢 프로세스 전역 이벤트 버스
+event_bus = EventBus()
@@ -0,0 +1,140 @@
+import asyncio
+from time import monotonic
+from typing import Any, Dict, Optional
+
+from backend.utils.metrics import metrics
+from backend.config import (
+    FEEDBACK_CHANNEL_TTL_SEC,
+    FEEDBACK_MAX_PENDING,
+    FEEDBACK_MAX_WAITING,
+    FEEDBACK_TIMEOUT_SEC,
+)
+
+
+class FeedbackBrokerFull(Exception):
+    """동시에 피드백을 기다릴 수 있는 세션 수를 초과"""
+
+
+class FeedbackCancelled(Exception):
+    """세션의 피드백 대기가 취소됨"""
+
+
+_CANCEL = object()
+
+
+class _Channel:
+    __slots__ = ("queue", "last_active", "waiting")
+
+    def __init__(self, max_pending: int):
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending + 1)  # +1: 취소 신호 자리
+        self.last_active = monotonic()
+        self.waiting = False
+
+
+class FeedbackBroker:
+    """
+    thread_id별 피드백 채널.
+    - 세션마다 별도 큐를 사용하므로 동시 세션끼리 피드백을 가로채지 않음
+    - 대기 시간 초과 시 None을 반환하여 그래프가 피드백 없이 진행 (상태/코루틴이 영원히 남지 않음)
+    - 동시에 대기하는 세션 수를 제한하고, 대기자 없는 채널은 TTL이 지나면 제거
+    """
+
+    def __init__(
+        self,
+        max_waiting: int = FEEDBACK_MAX_WAITING,
+        timeout: float = FEEDBACK_TIMEOUT_SEC,
+        ttl: float = FEEDBACK_CHANNEL_TTL_SEC,
+        max_pending: int = FEEDBACK_MAX_PENDING,
+    ):
+        self.max_waiting = max_waiting
+        self.timeout = timeout
+        self.ttl = ttl
+        self.max_pending = max_pending
+        self._channels: Dict[str, _Channel] = {}
+        self._waiting = 0
+
+    def _evict_idle(self):
+        now = monotonic()
+        for thread_id, ch in list(self._channels.items()):
+            if not ch.waiting and now - ch.last_active > self.ttl:
+                del self._channels[thread_id]
+
+    def _channel(self, thread_id: str) -> _Channel:
+        ch = self._channels.get(thread_id)
+        if ch is None:
+            ch = self._channels[thread_id] = _Channel(self.max_pending)
+        return ch
+
+    async def wait(self, thread_id: str, timeout: Optional[float] = None) -> Optional[Any]:
+        """
+        thread_id로 들어오는 다음 피드백을 기다림.
+        시간 초과 시 None, 취소 시 FeedbackCancelled, 대기 세션이 가득 차면 FeedbackBrokerFull.
+        """
+        self._evict_idle()
+        if self._waiting >= self.max_waiting:
+            raise FeedbackBrokerFull(f"피드백 대기 세션이 가득 찼습니다 ({self.max_waiting})")
+
+        ch = self._channel(thread_id)
+        if ch.waiting:
+            raise RuntimeError(f"thread {thread_id}에서 이미 피드백을 기다리는 중입니다")
+
+        ch.waiting = True
+        self._waiting += 1
+        try:
+            item = await asyncio.wait_for(ch.queue.get(), timeout or self.timeout)
+        except asyncio.TimeoutError:
+            return None
+        finally:
+            self._waiting -= 1
+            ch.waiting = False
+            ch.last_active = monotonic()
+            if ch.queue.empty():
+                self._channels.pop(thread_id, None)
+
+        if item is _CANCEL:
+            raise FeedbackCancelled(thread_id)
+        return item
+
+    def publish(self, thread_id: str, feedback: Any) -> bool:
+        """
+        피드백 전달. 아직 대기 중이 아니면 채널에 보관했다가 다음 wait()에 전달.
+        채널이 가득 찼으면 False.
+        """
+        self._evict_idle()
+        ch = self._channel(thread_id)
+        if ch.queue.qsize() >= self.max_pending:
+            return False
+        ch.queue.put_nowait(feedback)
+        ch.last_active = monotonic()
+        return True
+
+    def cancel(self, thread_id: str) -> bool:
+        """대기 중인 세션의 피드백 대기를 취소. 대기 중이 아니면 보관된 피드백만 버림."""
+        ch = self._channels.get(thread_id)
+        if ch is None:
+            return False
+        if not ch.waiting:
+            del self._channels[thread_id]
+            return True
+        ch.queue.put_nowait(_CANCEL)
+        return True
+
+    def is_waiting(self, thread_id: str) -> bool:
+        ch = self._channels.get(thread_id)
+        return bool(ch and ch.waiting)
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "waiting": self._waiting,
+            "channels": len(self._channels),
+            "max_waiting": self.max_waiting,
+        }
+
+
+# 🟢 프로세스 전역 피드백 브로커
+feedback_broker = FeedbackBroker()
+
+metrics.gauge(
+    "feedback_waiting_sessions", "Sessions parked waiting for feedback",
+    fn=lambda: {(): feedback_broker.stats()["waiting"]},
+)
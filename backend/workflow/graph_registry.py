@@ -0,0 +1,80 @@
+import threading
+from typing import Any, Callable, Dict, List, Tuple
+
+
+class GraphRegistry:
+    """
+    프로세스 단위로 컴파일된 LangGraph를 보관하는 레지스트리.
+    - variant(워크플로우 종류)별로 빌더를 등록하고, 최초 사용 시(또는 warmup 시) 한 번만 컴파일
+    - 컴파일된 그래프는 요청 간에 재사용 (CompiledGraph는 실행 상태를 갖지 않음)
+    - swap()으로 실행 중에도 새 버전을 안전하게 교체 (진행 중인 요청은 기존 그래프로 끝까지 실행)
+    """
+
+    def __init__(self):
+        self._builders: Dict[str, Callable[[], Any]] = {}
+        self._graphs: Dict[str, Tuple[int, Any]] = {}
+        self._versions: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def register(self, variant: str, builder: Callable[[], Any], *, replace: bool = False) -> None:
+        """variant에 대한 그래프 빌더 등록 (컴파일은 지연)"""
+        with self._lock:
+            if variant in self._builders and not replace:
+                raise ValueError(f"이미 등록된 워크플로우입니다: {variant}")
+            self._builders[variant] = builder
+            self._versions[variant] = self._versions.get(variant, 0) + 1
+            self._graphs.pop(variant, None)
+
+    def get(self, variant: str) -> Any:
+        """컴파일된 그래프 반환 (없으면 컴파일 후 캐시)"""
+        return self.get_versioned(variant)[1]
+
+    def get_versioned(self, variant: str) -> Tuple[int, Any]:
+        """(버전, 컴파일된 그래프) 반환"""
+        entry = self._graphs.get(variant)
+        if entry is not None:
+            return entry
+
+        with self._lock:
+            entry = self._graphs.get(variant)
+            if entry is None:
+                if variant not in self._builders:
+                    raise KeyError(f"등록되지 않은 워크플로우입니다: {variant}")
+                entry = (self._versions[variant], self._builders[variant]())
+                self._graphs[variant] = entry
+            return entry
+
+    def swap(self, variant: str, builder: Callable[[], Any]) -> int:
+        """
+        새 빌더로 그래프를 미리 컴파일한 뒤 원자적으로 교체하고 새 버전을 반환.
+        컴파일이 실패하면 기존 그래프가 그대로 유지된다.
+        """
+        graph = builder()
+        with self._lock:
+            version = self._versions.get(variant, 0) + 1
+            self._builders[variant] = builder
+            self._versions[variant] = version
+            self._graphs[variant] = (version, graph)
+        return version
+
+    def invalidate(self, variant: str) -> None:
+        """컴파일된 그래프를 버려 다음 사용 시 재컴파일되도록 함"""
+        with self._lock:
+            self._graphs.pop(variant, None)
+
+    def warmup(self, *variants: str) -> None:
+        """지정한 (없으면 등록된 전체) variant를 미리 컴파일"""
+        for variant in variants or list(self._builders):
+            self.get(variant)
+
+    def compiled(self) -> List[Any]:
+        """현재 컴파일되어 있는 그래프 목록"""
+        return [graph for _, graph in self._graphs.values()]
+
+    def variants(self) -> Dict[str, int]:
+        """등록된 variant와 현재 버전"""
+        return dict(self._versions)
+
+
+# 🟢 프로세스 전역 레지스트리
+graph_registry = GraphRegistry()
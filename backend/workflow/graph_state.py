@@ -2,20 +2,40 @@ from typing import Annotated, List, Dict, Union
 from pydantic import BaseModel
 from langgraph.graph.message import add_messages
 from typing_extensions import TypedDict
+from backend.config import STATE_MAX_MESSAGES
+
+
+def add_recent_messages(left, right):
+    """
+    add_messages 와 같지만 최근 STATE_MAX_MESSAGES개만 남긴다.
+    노드들은 마지막 메시지(최초 요청 또는 최근 피드백)만 사용하므로 피드백 라운드마다 상태가 커지지 않게 한다.
+    """
+    merged = add_messages(left, right)
+    return merged[-STATE_MAX_MESSAGES:] if STATE_MAX_MESSAGES > 0 else merged
+
 
 class GraphState(TypedDict):
-    messages: Annotated[List[str], add_messages]
+    # 슬라이드 텍스트는 slide_store 에 한 번만 보관하고 slides / designed_slides / *_cache 에는 ref(내용 해시)만 둔다.
+    # 원문은 요약 / 스크립트 / 최종 Markdown 을 만들 때만 slide_store 에서 꺼낸다.
+    messages: Annotated[List[str], add_recent_messages]
     topic: Annotated[str, "Presentation Topic"]
     style: Annotated[str, "Presentation Style"]
     outlines: Annotated[List[Union[Dict, BaseModel]], "Presentation Outline"]
-    slides: Annotated[List[str], "Split Slides"]         # 분할된 슬라이드 텍스트
-    designed_slides: Annotated[str, "Final MARP Slides"] # 최종으로 합쳐진 Slides
+    slides: Annotated[List[str], "Split Slides"]         # 분할된 슬라이드 텍스트의 ref
+    slide_outline: Annotated[List[int], "Outline index of each slide"]  # 슬라이드 → 개요 인덱스
+    designed_slides: Annotated[List[str], "Final MARP Slides"]  # 디자인/이미지가 적용된 슬라이드의 ref 목록
     # 이미지 관련은 슬라이드마다 생성하므로, slide별로 처리 후 합칠 예정
     check: Annotated[str, "Conditional Edge Check"]
     thread_id: Annotated[str, "Session Thread ID"]
     summary: Annotated[str, "Summary"]
     script: Annotated[str, "Script"]
     slides_marp: Annotated[str, "Slides for Marp"]
+    skip_feedback: Annotated[bool, "Skip human feedback (background jobs)"]
+    feedback_targets: Annotated[List[int], "Outline indices to regenerate for targeted feedback"]
+    feedback_rounds: Annotated[int, "Revision rounds taken so far (capped at FEEDBACK_MAX_ROUNDS)"]
+    # 피드백 루프에서 바뀌지 않은 항목은 재실행하지 않도록 내용 해시 기준으로 결과 보관 (체크포인트에 함께 저장)
+    refined_cache: Annotated[Dict[str, str], "Refined content ref by outline content hash"]
+    designed_cache: Annotated[Dict[str, str], "Designed slide ref by slide content hash"]
     
     
 
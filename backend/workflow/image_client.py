@@ -0,0 +1,26 @@
+from openai import AsyncOpenAI
+
+
+class AsyncImageGenerator:
+    """
+    DALL·E 비동기 클라이언트.
+    DallEAPIWrapper.run()은 동기 호출이라 이벤트 루프를 막으므로 AsyncOpenAI images API를 직접 사용.
+    """
+
+    def __init__(self, model: str = "dall-e-3", size: str = "1024x1024", quality: str = "standard", n: int = 1):
+        self.model_name = model
+        self.size = size
+        self.quality = quality
+        self.n = n
+        self.client = AsyncOpenAI()
+
+    async def arun(self, description: str) -> str:
+        """이미지를 생성하고 첫 번째 이미지의 URL을 반환"""
+        resp = await self.client.images.generate(
+            model=self.model_name,
+            prompt=description,
+            size=self.size,
+            quality=self.quality,
+            n=self.n,
+        )
+        return resp.data[0].url
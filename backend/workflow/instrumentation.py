@@ -0,0 +1,139 @@
+import asyncio
+import functools
+from contextvars import ContextVar
+from time import perf_counter
+from typing import Any, Callable, Dict, Optional
+
+from backend.utils.metrics import COUNT_BUCKETS, metrics
+
+# 🟢 워크플로우 지표
+NODE_SECONDS = metrics.histogram("presentation_node_seconds", "Wall time per graph node", ["node"])
+AGENT_SECONDS = metrics.histogram("presentation_agent_seconds", "Wall time per agent call (incl. cache/queue)", ["agent"])
+LLM_QUEUE_SECONDS = metrics.histogram("llm_queue_wait_seconds", "Time waiting in the scheduler before an API call", ["model"])
+LLM_API_SECONDS = metrics.histogram("llm_api_seconds", "Time spent in the provider API call", ["model"])
+LLM_TOKENS = metrics.counter("llm_tokens_total", "LLM tokens by node", ["node", "kind"])
+LLM_COST = metrics.counter("llm_cost_usd_total", "LLM cost (USD) by node", ["node"])
+LLM_CACHE = metrics.counter("llm_cache_requests_total", "LLM cache lookups", ["agent", "result"])
+RUNS = metrics.counter("presentation_runs_total", "Workflow runs by outcome", ["status"])
+RUN_SECONDS = metrics.histogram("presentation_run_seconds", "End-to-end workflow wall time")
+PROMPT_CONTEXT_TOKENS = metrics.counter(
+    "prompt_context_tokens_total", "Slide context tokens before (raw) and after (packed) prompt packing", ["agent", "stage"]
+)
+SLIDES = metrics.histogram("presentation_slides", "Slides per deck", buckets=COUNT_BUCKETS)
+
+
+class RunRecord:
+    """한 번의 워크플로우 실행에 대한 노드별 시간 / 토큰 / 비용 / 캐시 기록"""
+
+    def __init__(self, thread_id: str):
+        self.thread_id = thread_id
+        self.nodes: Dict[str, Dict[str, float]] = {}
+        self.cache = {"hits": 0, "misses": 0, "shared": 0}
+        self.prompt: Dict[str, Dict[str, int]] = {}
+        self.slides = 0
+        self.started = perf_counter()
+        self.seconds = 0.0
+
+    def add_node(self, node: str, seconds: float, prompt_tokens: int, completion_tokens: int, cost: float):
+        entry = self.nodes.setdefault(
+            node, {"runs": 0, "seconds": 0.0, "prompt_tokens": 0, "completion_tokens": 0, "cost_usd": 0.0}
+        )
+        entry["runs"] += 1
+        entry["seconds"] += seconds
+        entry["prompt_tokens"] += prompt_tokens
+        entry["completion_tokens"] += completion_tokens
+        entry["cost_usd"] += cost
+
+    def finish(self) -> Dict[str, Any]:
+        self.seconds = perf_counter() - self.started
+        lookups = sum(self.cache.values())
+        return {
+            "thread_id": self.thread_id,
+            "seconds": round(self.seconds, 3),
+            "slides": self.slides,
+            "nodes": {k: {m: round(v, 6) for m, v in e.items()} for k, e in self.nodes.items()},
+            "total_tokens": sum(e["prompt_tokens"] + e["completion_tokens"] for e in self.nodes.values()),
+            "total_cost_usd": round(sum(e["cost_usd"] for e in self.nodes.values()), 6),
+            "cache": {**self.cache, "hit_rate": round(self.cache["hits"] / lookups, 3) if lookups else 0.0},
+            "prompt_packing": {
+                agent: {**p, "saved": p["raw"] - p["packed"]} for agent, p in self.prompt.items()
+            },
+        }
+
+
+# 🟢 현재 실행 중인 RunRecord (generate_presentation에서 설정, 노드/agent 태스크로 전파)
+current_run: ContextVar[Optional[RunRecord]] = ContextVar("current_run", default=None)
+
+
+def _record_node(name: str, seconds: float, cb, result: Any):
+    NODE_SECONDS.observe(seconds, node=name)
+    LLM_TOKENS.inc(cb.prompt_tokens, node=name, kind="prompt")
+    LLM_TOKENS.inc(cb.completion_tokens, node=name, kind="completion")
+    LLM_COST.inc(cb.total_cost, node=name)
+    run = current_run.get()
+    if run is not None:
+        run.add_node(name, seconds, cb.prompt_tokens, cb.completion_tokens, cb.total_cost)
+        if isinstance(result, dict) and isinstance(result.get("slides"), list):
+            run.slides = len(result["slides"])
+
+
+def _usage_callback():
+    # langchain_community 는 무거우므로 첫 노드 실행 시에 불러온다
+    from langchain_community.callbacks.manager import get_openai_callback
+
+    return get_openai_callback()
+
+
+def instrument_node(name: str, fn: Callable) -> Callable:
+    """노드 함수를 감싸 벽시계 시간과 토큰 / 비용을 노드 단위로 기록"""
+    if asyncio.iscoroutinefunction(fn):
+        @functools.wraps(fn)
+        async def wrapper(state):
+            start = perf_counter()
+            with _usage_callback() as cb:
+                result = await fn(state)
+            _record_node(name, perf_counter() - start, cb, result)
+            return result
+    else:
+        @functools.wraps(fn)
+        def wrapper(state):
+            start = perf_counter()
+            with _usage_callback() as cb:
+                result = fn(state)
+            _record_node(name, perf_counter() - start, cb, result)
+            return result
+    return wrapper
+
+
+async def instrumented(name: str, awaitable) -> Any:
+    """노드가 끝난 뒤에도 이어지는 작업(예: 미리 시작한 보강)의 시간 / 토큰 / 비용을 name 으로 따로 기록"""
+    start = perf_counter()
+    result = None
+    with _usage_callback() as cb:
+        try:
+            result = await awaitable
+        finally:
+            _record_node(name, perf_counter() - start, cb, result)
+    return result
+
+
+def record_cache(agent: str, hit: bool, shared: bool = False):
+    """캐시 조회 결과 기록 (shared: 캐시에는 없었지만 진행 중이던 같은 호출의 결과를 받음)"""
+    result = "shared" if shared else "hit" if hit else "miss"
+    LLM_CACHE.inc(agent=agent, result=result)
+    run = current_run.get()
+    if run is not None:
+        run.cache["shared" if shared else "hits" if hit else "misses"] += 1
+
+
+def record_prompt_packing(agent: str, raw_tokens: int, packed_tokens: int, condensed: bool = False):
+    """프롬프트 패킹 전후의 슬라이드 문맥 토큰 수 기록 (절감량 = raw - packed)"""
+    PROMPT_CONTEXT_TOKENS.inc(raw_tokens, agent=agent, stage="raw")
+    PROMPT_CONTEXT_TOKENS.inc(packed_tokens, agent=agent, stage="packed")
+    run = current_run.get()
+    if run is not None:
+        entry = run.prompt.setdefault(agent, {"calls": 0, "condensed": 0, "raw": 0, "packed": 0})
+        entry["calls"] += 1
+        entry["condensed"] += int(condensed)
+        entry["raw"] += raw_tokens
+        entry["packed"] += packed_tokens
@@ -0,0 +1,210 @@
+import asyncio
+import json
+import os
+import sqlite3
+import threading
+from collections import Counter, OrderedDict
+from contextvars import ContextVar
+from time import time
+from typing import Any, Dict, Optional, Tuple
+
+from backend.config import (
+    LLM_CACHE_ENABLED,
+    LLM_CACHE_MAX_DISK_MB,
+    LLM_CACHE_MEMORY_ITEMS,
+    LLM_CACHE_OPT_IN,
+    LLM_CACHE_OPT_OUT,
+    LLM_CACHE_PATH,
+    LLM_CACHE_TTL_SEC,
+)
+from backend.utils.singleflight import SingleFlight
+from backend.utils.text_utils import content_hash
+
+# 🟢 일괄 생성 범위의 창작형(temperature > 0) 호출 공유: 키 → 응답
+#    BatchRun 이 만들어 레코드 태스크로 전파하고 끝나면 버린다 (영구 캐시에는 쓰지 않음)
+creative_share: ContextVar[Optional[Dict[str, str]]] = ContextVar("creative_share", default=None)
+
+
+class LLMCache:
+    """
+    내용 기반(content-addressed) LLM 응답 캐시.
+    - 키: 모델명, temperature, response_format, 프롬프트 해시
+    - 1차: 메모리 LRU (max_items)
+    - 2차: 디스크 SQLite (max_disk_bytes 초과 시 오래 안 쓴 항목부터, ttl 지난 항목은 만료)
+    - inflight: 캐시에 없는 같은 키의 호출이 동시에 들어오면 한 번만 호출 (다른 세션 / 덱 사이에도 공유)
+    - temperature > 0 인 모델 호출은 opt_in 에 있지 않으면 캐시하지 않음
+      (일괄 생성 중에는 그 배치 안에서만 공유: share_scope)
+    agent별 hit/miss 카운터를 유지한다.
+    """
+
+    def __init__(
+        self,
+        path: str = LLM_CACHE_PATH,
+        max_items: int = LLM_CACHE_MEMORY_ITEMS,
+        max_disk_bytes: int = int(LLM_CACHE_MAX_DISK_MB * 1024 * 1024),
+        ttl: float = LLM_CACHE_TTL_SEC,
+        enabled: bool = LLM_CACHE_ENABLED,
+        opt_out=frozenset(LLM_CACHE_OPT_OUT),
+        opt_in=frozenset(LLM_CACHE_OPT_IN),
+    ):
+        self.path = path
+        self.max_items = max_items
+        self.max_disk_bytes = max_disk_bytes
+        self.ttl = ttl
+        self.enabled = enabled
+        self.opt_out = set(opt_out)
+        self.opt_in = set(opt_in)
+        self.hits: Counter = Counter()
+        self.misses: Counter = Counter()
+        self._memory: "OrderedDict[str, Tuple[float, str]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._disk_bytes = 0
+        self.inflight: SingleFlight[str] = SingleFlight("llm")
+
+    # 🟢 키 생성
+    @staticmethod
+    def make_key(model: Any, prompt: str) -> str:
+        model_kwargs = getattr(model, "model_kwargs", None) or {}
+        payload = {
+            "model": getattr(model, "model_name", None) or getattr(model, "model", None),
+            "temperature": getattr(model, "temperature", None),
+            "response_format": model_kwargs.get("response_format"),
+            "prompt": content_hash(prompt),
+        }
+        return content_hash(json.dumps(payload, sort_keys=True))
+
+    def enabled_for(self, agent: str, model: Any = None) -> bool:
+        """agent 의 model 호출을 캐시할지 (결정적인 temperature 0 호출만 기본으로 캐시)"""
+        if not self.enabled or agent in self.opt_out:
+            return False
+        if agent in self.opt_in:
+            return True
+        return not (getattr(model, "temperature", None) or 0)
+
+    def share_scope(self, agent: str) -> Optional[Dict[str, str]]:
+        """enabled_for 가 아닌 호출을 공유할 배치 범위의 dict (일괄 생성 중이 아니면 None)"""
+        if not self.enabled or agent in self.opt_out:
+            return None
+        return creative_share.get()
+
+    # 🟢 디스크 계층
+    def _db(self) -> sqlite3.Connection:
+        if self._conn is None:
+            os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS llm_cache ("
+                "key TEXT PRIMARY KEY, value TEXT, size INTEGER, created REAL, accessed REAL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS llm_cache_accessed ON llm_cache(accessed)")
+            self._disk_bytes = conn.execute("SELECT COALESCE(SUM(size), 0) FROM llm_cache").fetchone()[0]
+            self._conn = conn
+        return self._conn
+
+    def _disk_get(self, key: str) -> Optional[str]:
+        with self._lock:
+            db = self._db()
+            row = db.execute("SELECT value, created FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            if row is None:
+                return None
+            if time() - row[1] > self.ttl:
+                self._disk_delete(db, "key = ?", (key,))
+                return None
+            db.execute("UPDATE llm_cache SET accessed = ? WHERE key = ?", (time(), key))
+            db.commit()
+            return row[0]
+
+    def _disk_put(self, key: str, value: str):
+        size = len(value.encode("utf-8"))
+        now = time()
+        with self._lock:
+            db = self._db()
+            old = db.execute("SELECT size FROM llm_cache WHERE key = ?", (key,)).fetchone()
+            db.execute(
+                "INSERT OR REPLACE INTO llm_cache (key, value, size, created, accessed) VALUES (?, ?, ?, ?, ?)",
+                (key, value, size, now, now),
+            )
+            self._disk_bytes += size - (old[0] if old else 0)
+            self._evict(db, now)
+            db.commit()
+
+    def _disk_delete(self, db: sqlite3.Connection, where: str, args: tuple):
+        freed = db.execute(f"SELECT COALESCE(SUM(size), 0) FROM llm_cache WHERE {where}", args).fetchone()[0]
+        db.execute(f"DELETE FROM llm_cache WHERE {where}", args)
+        self._disk_bytes -= freed
+
+    def _evict(self, db: sqlite3.Connection, now: float):
+        self._disk_delete(db, "created < ?", (now - self.ttl,))
+        while self._disk_bytes > self.max_disk_bytes:
+            before = self._disk_bytes
+            self._disk_delete(
+                db, "key IN (SELECT key FROM llm_cache ORDER BY accessed LIMIT 64)", ()
+            )
+            if self._disk_bytes == before:
+                break
+
+    # 🟢 메모리 계층
+    def _memory_get(self, key: str) -> Optional[str]:
+        entry = self._memory.get(key)
+        if entry is None:
+            return None
+        if time() - entry[0] > self.ttl:
+            self._memory.pop(key, None)
+            return None
+        self._memory.move_to_end(key)
+        return entry[1]
+
+    def _memory_put(self, key: str, value: str, created: Optional[float] = None):
+        self._memory[key] = (created or time(), value)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.max_items:
+            self._memory.popitem(last=False)
+
+    # 🟢 조회/저장
+    def get(self, key: str, agent: str) -> Optional[str]:
+        value = self._memory_get(key)
+        if value is None:
+            value = self._disk_get(key)
+            if value is not None:
+                self._memory_put(key, value)
+        (self.hits if value is not None else self.misses)[agent] += 1
+        return value
+
+    def put(self, key: str, value: str):
+        self._memory_put(key, value)
+        self._disk_put(key, value)
+
+    async def aget(self, key: str, agent: str) -> Optional[str]:
+        """메모리는 바로 조회하고, 디스크 조회는 스레드에서 수행 (이벤트 루프 차단 방지)"""
+        value = self._memory_get(key)
+        if value is None:
+            value = await asyncio.to_thread(self._disk_get, key)
+            if value is not None:
+                self._memory_put(key, value)
+        (self.hits if value is not None else self.misses)[agent] += 1
+        return value
+
+    async def aput(self, key: str, value: str):
+        self._memory_put(key, value)
+        await asyncio.to_thread(self._disk_put, key, value)
+
+    # 🟢 통계
+    def counters(self) -> Dict[str, int]:
+        return {"hits": sum(self.hits.values()), "misses": sum(self.misses.values())}
+
+    def stats(self) -> Dict[str, Any]:
+        return {
+            **self.counters(),
+            "by_agent": {
+                agent: {"hits": self.hits[agent], "misses": self.misses[agent]}
+                for agent in sorted(set(self.hits) | set(self.misses))
+            },
+            "shared": self.inflight.joined,
+            "memory_items": len(self._memory),
+            "disk_bytes": self._disk_bytes,
+        }
+
+
+# 🟢 프로세스 전역 LLM 캐시
+llm_cache = LLMCache()
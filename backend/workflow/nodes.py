@@ -1,60 +1,155 @@
 import asyncio
-from backend.storage.file_manager import FileManager
-from typing import List, Dict, Any
+import logging
+from contextvars import ContextVar
+from backend.storage.slide_store import SlideMissing, slide_store
+from backend.config import FEEDBACK_MAX_ROUNDS, REFINE_CONCURRENCY, REFINE_MAX_RETRIES, REFINE_PREFETCH, REFINE_RETRY_BACKOFF_SEC
+from backend.utils.admission import parked
+from backend.utils.retry import retry_async
+from backend.utils.text_utils import content_hash, normalize_text
+from typing import List, Dict, Any, Optional, Tuple, Union
 from .agents import *
 from .graph_state import *
+from .feedback import feedback_broker, FeedbackBrokerFull, FeedbackCancelled
+from .events import event_bus
+from .providers import providers
+from .instrumentation import instrumented
+
+
+def _as_outline(o: Union[Dict, OutlineModel]) -> OutlineModel:
+    return o if isinstance(o, OutlineModel) else OutlineModel(**o)
+
+
+class RefinePrefetch:
+    """
+    개요 스트리밍 중에 미리 시작한 보강 작업 (한 번의 실행 범위: generate_presentation 이 만들고 끝날 때 정리).
+    outline_pipeline / refine_outline 이 같은 content 를 보강할 때 가져다 쓴다.
+    작업의 시간 / 토큰 / 비용은 노드 밖에서 끝나므로 refine_prefetch 라는 이름으로 따로 기록한다.
+    """
+
+    def __init__(self):
+        self.semaphore = asyncio.Semaphore(REFINE_CONCURRENCY)
+        self.tasks: Dict[str, asyncio.Task] = {}
+
+    def start(self, key: str, outline: OutlineModel):
+        if key not in self.tasks:
+            self.tasks[key] = asyncio.create_task(
+                instrumented("refine_prefetch", refine_content(outline, {}, self.semaphore))
+            )
+
+    def take(self) -> Tuple[asyncio.Semaphore, Dict[str, asyncio.Task]]:
+        tasks, self.tasks = self.tasks, {}
+        return self.semaphore, tasks
+
+    def discard(self):
+        """쓰이지 않고 남은 작업 정리 (개요를 다시 만들거나 실행이 끝났을 때)"""
+        _cancel_tasks(self.tasks)
+        self.tasks = {}
+
+
+# 🟢 현재 실행의 미리 보강 작업 (generate_presentation 에서 설정, 없으면 미리 보강하지 않음)
+refine_prefetch: ContextVar[Optional[RefinePrefetch]] = ContextVar("refine_prefetch", default=None)
+
+
+def _take_refine_prefetch() -> Tuple[asyncio.Semaphore, Dict[str, asyncio.Task]]:
+    """현재 실행에서 미리 시작한 보강 작업을 가져온다 (없으면 미리 한 작업 없이 새로)"""
+    prefetch = refine_prefetch.get()
+    return prefetch.take() if prefetch is not None else (asyncio.Semaphore(REFINE_CONCURRENCY), {})
+
+
+def _cancel_tasks(tasks: Dict[str, asyncio.Task]):
+    for task in tasks.values():
+        if task.done():
+            if not task.cancelled():
+                task.exception()  # 쓰이지 않은 작업의 예외는 버림
+        else:
+            task.cancel()
 
 
 async def generate_outline_node(state: Dict[str, Any]) -> Dict[str, Any]:
     """
     주제(topic)와 스타일(style)에 맞는 개요 목록(OutlineModel[])을 생성하여
     state["outlines"]에 저장.
+    개요는 스트리밍으로 받아, 항목이 완성되는 즉시 outline_item 이벤트를 보내고 그 항목의 보강을 미리 시작한다.
     """
     topic = state["topic"]
     style = state["style"]
-    last_user_msg = state["messages"][-1] if state["messages"] else ""
-
-    outlines = generate_outline(topic, style, last_user_msg)  # List[OutlineModel]
+    thread_id = state.get("thread_id", "-")
+    last_user_msg = state["messages"][-1].content if state.get("messages") else ""
+    prev_refined: Dict[str, str] = state.get("refined_cache") or {}
+
+    prefetch = refine_prefetch.get() if REFINE_PREFETCH else None
+    if prefetch is not None:
+        prefetch.discard()
+
+    outlines: List[OutlineModel] = []
+    async for item in generate_outline_stream(topic, style, last_user_msg):
+        outlines.append(item)
+        event_bus.publish(thread_id, "outline_item", index=len(outlines), outline=item)
+        key = content_hash(item.content)
+        if prefetch is not None and key not in prev_refined:
+            prefetch.start(key, item)
     return {"outlines": outlines}
 
 
-def check_relevance_node(state: Dict[str, Any]) -> Dict[str, Any]:
+async def check_relevance_node(state: Dict[str, Any]) -> Dict[str, Any]:
     """
     개요 목록을 하나의 텍스트로 합쳐서 주제와 관련성 검사.
     관련 있으면 check='yes', 없으면 check='no'
     """
     topic = state["topic"]
-    outlines: List[Dict] = state["outlines"]
+    outlines = [_as_outline(o) for o in state["outlines"]]
 
     # 간단히 outlines 내용 합침
     combined_outline = "\n\n".join(
-        f"{o['title']}\n{o['content']}" for o in outlines
+        f"{o.title}\n{o.content}" for o in outlines
     )
 
-    is_relevant = check_relevance(combined_outline, topic)
+    is_relevant = await check_relevance_async(combined_outline, topic)
     return {"check": "yes" if is_relevant else "no"}
 
 
-def refine_outline_node(state: Dict[str, Any]) -> Dict[str, Any]:
+async def refine_content(outline: OutlineModel, prev_cache: Dict[str, str], semaphore: asyncio.Semaphore,
+                         prefetched: Optional[Dict[str, asyncio.Task]] = None) -> str:
+    """
+    개요 하나의 content를 보강 (개별 재시도).
+    이전 라운드에서 같은 content를 이미 보강했거나 개요 스트리밍 중에 미리 시작했다면 그 결과를 사용.
+    """
+    key = content_hash(outline.content)
+    if key in prev_cache:
+        try:
+            return await slide_store.aget(prev_cache[key])
+        except SlideMissing:
+            logger.warning("Refined outline missing from slide store; refining again")
+    if prefetched and (task := prefetched.pop(key, None)) is not None:
+        return await task
+    async with semaphore:
+        return await retry_async(
+            lambda: refine_outline_async(outline.content),
+            retries=REFINE_MAX_RETRIES,
+            backoff=REFINE_RETRY_BACKOFF_SEC,
+        )
+
+
+async def refine_outline_node(state: Dict[str, Any]) -> Dict[str, Any]:
     """
     각 개요(OutlineModel)의 content를 refine_outline으로 보강하여 업데이트.
+    - 최대 REFINE_CONCURRENCY개씩 동시에 보강하고, 결과는 원래 순서를 유지
+    - 개요마다 개별 재시도 (하나가 실패해도 나머지를 다시 호출하지 않음)
+    - 이전 라운드에서 같은 content를 이미 보강했다면 그 결과를 재사용
     """
-    outlines: List[OutlineModel] = state["outlines"]
-    refined_list = []
+    outlines = [_as_outline(o) for o in state["outlines"]]
+    prev_cache: Dict[str, str] = state.get("refined_cache") or {}
+    semaphore, prefetched = _take_refine_prefetch()
 
-    for o in outlines:
-        new_content = refine_outline(o["content"])
-        refined_list.append(
-            OutlineModel(
-                title=o["title"],
-                content=new_content,
-                images=o["images"],
-                image_positions=o["image_positions"],
-                pages=o["pages"]
-            )
-        )
+    try:
+        contents = await asyncio.gather(*(refine_content(o, prev_cache, semaphore, prefetched) for o in outlines))
+    finally:
+        _cancel_tasks(prefetched)
 
-    return {"outlines": refined_list}
+    refined_cache = dict(zip((content_hash(o.content) for o in outlines), slide_store.put_many(contents)))
+    refined_list = [o.model_copy(update={"content": c}) for o, c in zip(outlines, contents)]
+    await slide_store.aflush()
+    return {"outlines": refined_list, "refined_cache": refined_cache}
 
 
 def split_outlines_node(state: Dict[str, Any]) -> Dict[str, Any]:
@@ -63,96 +158,273 @@ def split_outlines_node(state: Dict[str, Any]) -> Dict[str, Any]:
     """
     outlines: List[OutlineModel] = state["outlines"]
     all_slides: List[str] = []
+    slide_outline: List[int] = []  # 슬라이드 → 개요 인덱스 (부분 재생성 시 사용)
 
-    for o in outlines:
+    for i, o in enumerate(outlines):
         slides_for_this_outline = split_outline_to_slides(o)
         all_slides.extend(slides_for_this_outline)
+        slide_outline.extend([i] * len(slides_for_this_outline))
 
-    return {"slides": all_slides}
+    slide_refs = slide_store.put_many(all_slides)
+    slide_store.flush()
+    return {"slides": slide_refs, "slide_outline": slide_outline}
 
-file_manager = FileManager()
+logger = logging.getLogger(__name__)
 
 
-async def parallel_slides_node(state):
+def configure_storage(*, image_store=None, slide_store=None):
+    """노드들이 사용하는 저장소를 교체 (벤치마크·오프라인 실행용). None인 항목은 그대로 둔다."""
+    providers.configure(image_store=image_store)
+    if slide_store is not None:
+        globals()["slide_store"] = slide_store
+
+
+def slide_concept(slide_text: str) -> str:
+    """슬라이드의 대표 개념 (첫 번째 제목 줄, 없으면 첫 줄)"""
+    lines = [line.strip() for line in slide_text.splitlines() if line.strip()]
+    for line in lines:
+        if line.startswith("#"):
+            return line.lstrip("#").strip()
+    return lines[0] if lines else ""
+
+
+async def concept_image(topic: str, concept: str) -> str:
     """
-    분할된 slides 각각을 비동기로 처리하여
-    디자인 + 이미지 생성 후 최종 문자열로 합침
+    개념 하나당 이미지 하나만 생성하여 공개 URL을 반환.
+    - (주제, 개념)이 같으면 이전에 만든 이미지를 재사용 (같은 개요에서 나뉜 슬라이드 / 다른 덱)
+    - LLM이 만든 설명이 정규화 후 같으면 DALL·E를 다시 호출하지 않음
     """
-    slides = state["slides"]
-    style = state["style"]
-    topic = state["topic"]
-    thread_id = state["thread_id"]
+    concept_key = "concept:" + content_hash(normalize_text(f"{topic} {concept}"))
+    image_store = providers.image_store
 
-    # slides가 없으면 바로 return
-    if not slides:
-        return {"designed_slides": ""}
-
-    # 🟢 각 슬라이드를 처리하는 비동기 함수
-    async def process_slide(slide_text: str, idx: int):
-        # 1) 디자인 적용
-        designed_part = await apply_design_async(slide_text, style)
+    async def create() -> str:
+        description = await describe_image_async(topic, concept or topic)
+        description_key = "description:" + content_hash(normalize_text(description))
+        if (digest := await image_store.lookup(description_key)) is not None:
+            return digest
+        image_url = await render_image_async(description)
+        return await image_store.put_from_url(image_url, [description_key])
 
-        # 2) 이미지 생성
-        image_url = await generate_image_async(topic, thread_id)
-        local_image_path = file_manager.save_image(image_url, thread_id+f"_{idx}")
+    digest = await image_store.get_or_create(concept_key, create)
+    return image_store.public_url(digest)
 
-        # 3) 슬라이드 + 이미지 Markdown 생성
-        final_slide = f"{designed_part}\n\n![image]({image_url})"
-        return final_slide
 
-    # 🟢 모든 슬라이드를 비동기로 처리
-    tasks = [process_slide(s, i) for i, s in enumerate(slides, 1)]
-    results = await asyncio.gather(*tasks)
+def slide_key(slide_text: str, style: str, topic: str) -> str:
+    """디자인 결과 캐시 키 (슬라이드 내용 + 스타일 + 주제)"""
+    return content_hash(f"{style}\n{topic}\n{slide_text}")
 
-    # 🟢 마크다운 슬라이드 구분자 `---` 로 합치기
-    combined_slides = "\n---\n".join(results)
-    return {"designed_slides": combined_slides}
 
-async def apply_design_node(state: Dict[str, Any]) -> Dict[str, Any]:
+async def design_slide(slide_text: str, idx: int, *, style: str, topic: str, thread_id: str,
+                       prev_cache: Dict[str, str]) -> str:
     """
-    슬라이드 배열(slides)에 지정된 스타일(style)을 비동기로 적용.
-    결과물은 줄바꿈된 문자열 리스트가 아닌, 각 슬라이드별 텍스트(List[str])로 반환.
+    슬라이드 하나에 디자인 + 이미지를 적용한 최종 Markdown 의 slide_store ref (진행 이벤트 발행).
+    새 슬라이드는 메모리에만 넣으므로 호출한 노드가 상태를 반환하기 전에 slide_store.aflush()로 기록한다.
     """
-    slides: List[str] = state["slides"]
-    style: str = state["style"]
+    # 0) 피드백으로 바뀌지 않은 슬라이드는 재사용 (저장소에서 사라졌으면 다시 만든다)
+    if (cached := prev_cache.get(slide_key(slide_text, style, topic))) is not None:
+        try:
+            markdown = await slide_store.aget(cached)
+        except SlideMissing:
+            logger.warning("Designed slide %d missing from slide store; designing again", idx)
+        else:
+            event_bus.publish(thread_id, "slide", index=idx, markdown=markdown, reused=True)
+            return cached
+
+    # 1) 디자인 적용 + 2) 이미지 생성 (이미지는 슬라이드 원문의 개념만 쓰므로 디자인과 동시에 진행,
+    #    같은 개념의 슬라이드끼리는 하나의 이미지를 공유)
+    async def design() -> str:
+        designed = await apply_design_async(slide_text, style, stream=f"slide-{idx}")
+        event_bus.publish(thread_id, "slide_designed", index=idx, markdown=designed)
+        return designed
+
+    async def image() -> str:
+        url = await concept_image(topic, slide_concept(slide_text))
+        event_bus.publish(thread_id, "slide_image", index=idx, url=url)
+        return url
+
+    designed_part, image_url = await asyncio.gather(design(), image())
+
+    # 3) 슬라이드 + 이미지 Markdown 생성
+    final_slide = f"{designed_part}\n\n![image]({image_url})"
+    event_bus.publish(thread_id, "slide", index=idx, markdown=final_slide, reused=False)
+    return slide_store.put(final_slide)
 
-    designed_list = await apply_design_async(slides, style)
-    return {"designed_slides": designed_list}
 
-
-async def generate_image_node(state: Dict[str, Any]) -> Dict[str, Any]:
+async def parallel_slides_node(state):
     """
-    프레젠테이션 전체(또는 한 슬라이드)에 사용될 대표 이미지를 생성.
-    필요하다면 각 슬라이드마다 이미지를 생성하도록 확장 가능.
+    분할된 slides 각각을 비동기로 처리하여 디자인 + 이미지를 적용한 슬라이드 목록을 만든다.
+    이전 라운드와 내용이 같은 슬라이드는 디자인/이미지를 다시 만들지 않음.
     """
-    thread_id: str = state["thread_id"]
-    topic: str = state["topic"]
+    style = state["style"]
+    topic = state["topic"]
+    thread_id = state["thread_id"]
+    prev_cache: Dict[str, str] = state.get("designed_cache") or {}
+
+    # slides가 없으면 바로 return
+    if not state["slides"]:
+        return {"designed_slides": []}
+    slides = await slide_store.aget_many(state["slides"])
 
-    image_url = await generate_image_async(topic, thread_id)
-    # 간단히 하나의 이미지만 추가한다고 가정
-    return {"image_url": image_url}
+    # 🟢 모든 슬라이드를 비동기로 처리 (결과는 원래 순서 유지)
+    results = await asyncio.gather(*(
+        design_slide(s, i, style=style, topic=topic, thread_id=thread_id, prev_cache=prev_cache)
+        for i, s in enumerate(slides, 1)
+    ))
+    designed_cache = {slide_key(s, style, topic): r for s, r in zip(slides, results)}
+    await slide_store.aflush()
+    return {"designed_slides": list(results), "designed_cache": designed_cache}
 
 
-def generate_summary_node(state: Dict[str, Any]) -> Dict[str, Any]:
+async def outline_pipeline_node(state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    개요별 파이프라인: refine_outline → split_outlines → parallel_slides 를 덱 전체 단위로 기다리지 않고
+    개요 하나가 보강되는 즉시 분할하여 그 슬라이드들의 디자인 / 이미지 작업을 시작한다.
+    - 보강은 최대 REFINE_CONCURRENCY개씩, 디자인 / 이미지는 스케줄러가 허용하는 만큼 동시에 진행
+    - 슬라이드 번호(이벤트 index)는 앞선 개요들의 pages 합으로 미리 정해지고, 결과는 원래 순서를 유지
+    - 이전 라운드와 같은 content / 슬라이드는 refined_cache / designed_cache 로 재사용
+    체크포인트는 노드가 끝날 때만 저장되므로, 이 노드 도중에 중단된 실행을 재개하면 보강 / 디자인은 처음부터 다시 한다
+    (이미지는 이미지 저장소에 저장된 것을 재사용).
+    """
+    style, topic, thread_id = state["style"], state["topic"], state["thread_id"]
+    outlines = [_as_outline(o) for o in state["outlines"]]
+    prev_refined: Dict[str, str] = state.get("refined_cache") or {}
+    prev_designed: Dict[str, str] = state.get("designed_cache") or {}
+    semaphore, prefetched = _take_refine_prefetch()
+
+    # 개요 i 의 첫 슬라이드 번호 (split_outline_to_slides 는 개요마다 pages 장을 만든다)
+    offsets, position = [], 1
+    for o in outlines:
+        offsets.append(position)
+        position += o.pages
+
+    async def run_outline(i: int, o: OutlineModel):
+        content = await refine_content(o, prev_refined, semaphore, prefetched)
+        refined = o.model_copy(update={"content": content})
+        slides = split_outline_to_slides(refined)
+        designed = await asyncio.gather(*(
+            design_slide(s, offsets[i] + j, style=style, topic=topic, thread_id=thread_id, prev_cache=prev_designed)
+            for j, s in enumerate(slides)
+        ))
+        return refined, slides, designed
+
+    try:
+        results = await asyncio.gather(*(run_outline(i, o) for i, o in enumerate(outlines)))
+    finally:
+        _cancel_tasks(prefetched)
+
+    refined_cache, slides, slide_outline, designed_slides, designed_cache = {}, [], [], [], {}
+    for i, (o, (refined, outline_slides, designed)) in enumerate(zip(outlines, results)):
+        refined_cache[content_hash(o.content)] = slide_store.put(refined.content)
+        slides.extend(slide_store.put_many(outline_slides))
+        slide_outline.extend([i] * len(outline_slides))
+        designed_slides.extend(designed)
+        designed_cache.update({slide_key(s, style, topic): d for s, d in zip(outline_slides, designed)})
+    await slide_store.aflush()
+
+    return {
+        "outlines": [refined for refined, _, _ in results],
+        "refined_cache": refined_cache,
+        "slides": slides,
+        "slide_outline": slide_outline,
+        "designed_slides": designed_slides,
+        "designed_cache": designed_cache,
+    }
+
+
+def resolve_feedback_targets(state: Dict[str, Any], slides: List[int] = (), outlines: List[int] = ()) -> List[int]:
     """
-    designed_slides(list[str])를 하나로 합쳐 요약 슬라이드를 생성.
+    피드백이 가리키는 슬라이드 / 개요 번호(1부터)를 다시 만들 개요 인덱스(0부터) 목록으로 변환.
+    범위를 벗어난 번호는 무시한다.
     """
-    designed_slides: List[str] = state["designed_slides"]
-    # 하나의 문자열로 합침
-    combined_slides = "\n".join(designed_slides)
+    n_outlines = len(state.get("outlines") or [])
+    slide_outline = state.get("slide_outline") or []
+    targets = {o - 1 for o in outlines or () if 1 <= o <= n_outlines}
+    targets |= {slide_outline[s - 1] for s in slides or () if 1 <= s <= len(slide_outline)}
+    return sorted(targets)
 
-    summary_slide = generate_summary([combined_slides])
+
+async def regenerate_slides_node(state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    피드백이 가리키는 개요만 다시 보강(refine) → 분할 → 디자인/이미지 적용하고,
+    나머지 슬라이드는 이전 결과(designed_slides)를 그대로 사용한다.
+    """
+    style, topic, thread_id = state["style"], state["topic"], state["thread_id"]
+    instruction = state["messages"][-1].content if state.get("messages") else ""
+    targets = set(state.get("feedback_targets") or [])
+    outlines = [_as_outline(o) for o in state["outlines"]]
+    prev_cache: Dict[str, str] = state.get("designed_cache") or {}
+
+    async def refine_one(i: int) -> OutlineModel:
+        o = outlines[i]
+        content = await retry_async(
+            lambda: refine_outline_async(o.content, instruction),
+            retries=REFINE_MAX_RETRIES,
+            backoff=REFINE_RETRY_BACKOFF_SEC,
+        )
+        return o.model_copy(update={"content": content})
+
+    order = sorted(targets)
+    for i, new_outline in zip(order, await asyncio.gather(*(refine_one(i) for i in order))):
+        outlines[i] = new_outline
+
+    # 개요별 [슬라이드 ref, 디자인 결과 ref] 묶음을 다시 구성: 대상 개요만 새로 분할
+    # (새로 분할한 슬라이드는 디자인이 끝날 때까지 원문을 들고 있다가 ref로 바꿈)
+    groups: List[List[List[Any]]] = [[] for _ in outlines]
+    for slide, designed, i in zip(state["slides"], state["designed_slides"], state["slide_outline"]):
+        if i not in targets:
+            groups[i].append([slide, designed])
+    for i in order:
+        groups[i] = [[slide, None] for slide in split_outline_to_slides(outlines[i])]
+
+    pairs = [pair for group in groups for pair in group]
+    pending = [(idx, pair) for idx, pair in enumerate(pairs, 1) if pair[1] is None]  # 이벤트용 1부터 시작하는 위치
+
+    designed = await asyncio.gather(*(
+        design_slide(pair[0], idx, style=style, topic=topic, thread_id=thread_id, prev_cache=prev_cache)
+        for idx, pair in pending
+    ))
+    designed_cache = dict(prev_cache)
+    for (_, pair), result in zip(pending, designed):
+        designed_cache[slide_key(pair[0], style, topic)] = result
+        pair[:] = [slide_store.put(pair[0]), result]
+
+    event_bus.publish(
+        thread_id, "slides_regenerated",
+        indices=[idx for idx, _ in pending], count=len(pairs), outlines=[i + 1 for i in order],
+    )
+    slide_outline = [i for i, group in enumerate(groups) for _ in group]
+    await slide_store.aflush()
+    return {
+        "outlines": outlines,
+        "slides": [pair[0] for pair in pairs],
+        "slide_outline": slide_outline,
+        "designed_slides": [pair[1] for pair in pairs],
+        "designed_cache": designed_cache,
+        "feedback_targets": [],
+    }
+
+def _slide_list(designed_slides) -> List[str]:
+    """designed_slides(ref 목록, 또는 이전 체크포인트의 str / list[str])를 slide_store 에서 꺼낼 목록으로"""
+    if isinstance(designed_slides, str):
+        return designed_slides.split("\n---\n")
+    return designed_slides
+
+
+async def generate_summary_node(state: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    designed_slides를 agent의 토큰 예산에 맞춰 묶어 요약 슬라이드를 생성.
+    """
+    slides = await slide_store.aget_many(_slide_list(state["designed_slides"]))
+    summary_slide = await generate_summary_async(slides)
     return {"summary": summary_slide}
 
 
-def generate_narration_node(state: Dict[str, Any]) -> Dict[str, Any]:
+async def generate_narration_node(state: Dict[str, Any]) -> Dict[str, Any]:
     """
-    designed_slides(list[str])를 기반으로 발표 스크립트 생성.
+    designed_slides를 기반으로 발표 스크립트 생성.
     """
-    designed_slides: List[str] = state["designed_slides"]
-    combined_slides = "\n".join(designed_slides)
-
-    narration = generate_narration([combined_slides])
+    slides = await slide_store.aget_many(_slide_list(state["designed_slides"]))
+    narration = await generate_narration_async(slides)
     return {"script": narration}
 
 
@@ -161,8 +433,9 @@ def finalize_presentation_node(state: Dict[str, Any]) -> Dict[str, Any]:
     최종 Marp 포맷으로 슬라이드를 이어붙여 문자열로 만든다.
     - slides_marp 필드에 저장 (마크다운 형태)
     - 예) --- 구분자 사용
+    덱 전체를 하나의 문자열로 합치는 곳은 여기뿐이다 (그 전까지는 slide_store ref만 주고받음).
     """
-    designed_slides: List[str] = state["designed_slides"]
+    designed_slides: List[str] = slide_store.get_many(_slide_list(state["designed_slides"]))
     marp_header = """---
 marp: true
 paginate: true
@@ -174,28 +447,70 @@ paginate: true
 
     return {"slides_marp": final_markdown}
 
-# 🟢 피드백을 위한 비동기 큐 (사용자 입력 대기)
-feedback_queue = asyncio.Queue()
-
 # 🟢 피드백 확인 함수 (피드백 여부에 따라 흐름 결정)
-def check_feedback(state) -> str:
-    return state.get("check", "no")  # 기본값 "no" (피드백 없으면 최종 완료로 진행)
+def check_feedback(state) -> Union[str, List[str]]:
+    """
+    특정 슬라이드/개요를 가리킨 수정 요청이면 해당 부분만 다시 만들고,
+    전체 수정 요청이면 generate_outline으로 되돌아가고,
+    아니면 요약/스크립트를 동시에 생성 (둘 다 designed_slides에만 의존)
+    """
+    check = state.get("check", "no")  # 기본값 "no" (피드백 없으면 최종 완료로 진행)
+    if check == "targeted":
+        return "regenerate_slides"
+    if check == "yes":
+        return "generate_outline"
+    return ["generate_summary", "generate_narration"]
 
 # 🟢 사용자 피드백을 비동기적으로 기다리는 함수
 async def handle_feedback_node(state: Dict[str, Any]) -> Dict[str, Any]:
     """
     사용자의 피드백을 대기하고, messages에 피드백을 추가하여 반환.
-    'modify'/'change'/'edit' 등의 단어 포함 시 check='yes', 아니면 'no'.
+    - 피드백이 슬라이드/개요 번호를 지정하면 check='targeted' (해당 개요만 재생성)
+    - 'modify'/'change'/'edit' 등의 단어 포함 시 check='yes', 아니면 'no'.
+    - 대기 시간이 지나거나 대기가 취소되면 (DELETE /feedback/{thread_id}) 'no'.
+    피드백은 문자열 또는 {"feedback": str, "slides": [번호], "outlines": [번호]} (번호는 1부터).
+    수정 라운드(yes / targeted)는 feedback_rounds 로 세고, FEEDBACK_MAX_ROUNDS 에 이르면 더 기다리지 않고 'no'.
     """
     thread_id = state["thread_id"]
-    print(f"[handle_feedback_node] Waiting for user feedback on thread {thread_id}...")
+    rounds = state.get("feedback_rounds") or 0
+    if state.get("skip_feedback"):
+        return {"check": "no"}
+    if rounds >= FEEDBACK_MAX_ROUNDS:
+        logger.info("Feedback round limit (%d) reached for thread %s; finishing", FEEDBACK_MAX_ROUNDS, thread_id)
+        return {"check": "no"}
+    logger.info("Waiting for user feedback on thread %s", thread_id)
+    event_bus.publish(thread_id, "feedback_wait", timeout=feedback_broker.timeout)
+
+    # 사용자 피드백 대기 (FastAPI의 /feedback/{thread_id} 엔드포인트에서 feedback_broker.publish(...)로 전달)
+    # 기다리는 동안에는 API 동시 실행 슬롯을 내려놓는다
+    try:
+        async with parked():
+            user_feedback = await feedback_broker.wait(thread_id)
+    except FeedbackBrokerFull as e:
+        logger.warning("%s - skipping feedback for thread %s", e, thread_id)
+        return {"check": "no"}
+    except FeedbackCancelled:
+        # DELETE /feedback/{thread_id}: 피드백 없이 그대로 마무리
+        logger.info("Feedback wait cancelled for thread %s", thread_id)
+        return {"check": "no"}
 
-    # 사용자 피드백 대기 (FastAPI의 /feedback/{thread_id} 엔드포인트에서 feedback_queue.put(...)로 전달)
-    user_feedback = await feedback_queue.get()
-    print(f"[handle_feedback_node] Received feedback: {user_feedback}")
+    if user_feedback is None:
+        logger.info("No feedback for thread %s (timeout)", thread_id)
+        return {"check": "no"}
+    logger.info("Received feedback on thread %s: %s", thread_id, user_feedback)
+
+    targets: Dict[str, Any] = {}
+    if isinstance(user_feedback, dict):
+        targets, user_feedback = user_feedback, user_feedback.get("feedback", "")
+    if targets.get("slides") or targets.get("outlines"):
+        outline_targets = resolve_feedback_targets(state, targets.get("slides"), targets.get("outlines"))
+        if outline_targets:
+            return {"check": "targeted", "feedback_targets": outline_targets, "messages": [user_feedback],
+                    "feedback_rounds": rounds + 1}
+        logger.warning("Feedback targets %s out of range for thread %s", targets, thread_id)
 
     # 피드백 내용 판단
     if any(word in user_feedback.lower() for word in ["modify", "change", "edit"]):
-        return {"check": "yes", "messages": [user_feedback]}
+        return {"check": "yes", "messages": [user_feedback], "feedback_rounds": rounds + 1}
     else:
         return {"check": "no"}
@@ -0,0 +1,164 @@
+import json
+import re
+from typing import Any, List, Optional, Tuple
+
+from pydantic import ValidationError
+
+from .graph_state import OutlineModel
+
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+_DANGLING_KEY = re.compile(r'([,{])\s*"(?:[^"\\]|\\.)*"\s*$')
+
+
+class OutlineStreamParser:
+    """
+    스트리밍되는 개요 JSON에서 항목 객체를 닫히는 즉시 잘라내는 파서.
+    {"outlines": [{...}, {...}]} 와 [{...}, {...}] 모두 처리하며, 처음 열린 배열의 원소 객체를 항목으로 본다.
+    문자열 안의 괄호와 이스케이프는 무시하고, feed()는 새로 닫힌 항목의 원문 조각 목록을 반환한다.
+    """
+
+    def __init__(self):
+        self.reset()
+
+    def reset(self):
+        self._text = ""
+        self._pos = 0
+        self._stack: List[str] = []
+        self._in_string = False
+        self._escape = False
+        self._items_depth: Optional[int] = None
+        self._item_start: Optional[int] = None
+        self.items = 0
+
+    @property
+    def text(self) -> str:
+        return self._text
+
+    def feed(self, delta: str) -> List[str]:
+        self._text += delta
+        text, closed = self._text, []
+        for i in range(self._pos, len(text)):
+            c = text[i]
+            if self._in_string:
+                if self._escape:
+                    self._escape = False
+                elif c == "\\":
+                    self._escape = True
+                elif c == '"':
+                    self._in_string = False
+            elif c == '"':
+                self._in_string = True
+            elif c in "{[":
+                self._stack.append(c)
+                if c == "[" and self._items_depth is None:
+                    self._items_depth = len(self._stack)
+                elif c == "{" and self._items_depth is not None and len(self._stack) == self._items_depth + 1:
+                    self._item_start = i
+            elif c in "}]":
+                if c == "}" and self._item_start is not None and len(self._stack) == self._items_depth + 1:
+                    closed.append(text[self._item_start: i + 1])
+                    self._item_start = None
+                if self._stack:
+                    self._stack.pop()
+        self._pos = len(text)
+        self.items += len(closed)
+        return closed
+
+    def close(self) -> List[str]:
+        """
+        응답이 끝났을 때 남은 조각.
+        - 닫히지 않은 항목(토큰 한도로 잘린 응답 등)은 그대로 반환해 고치거나 다시 요청하게 한다
+        - 배열 없이 항목 객체 하나만 온 경우 그 객체를 항목으로 본다
+        """
+        if self._item_start is not None:
+            self.items += 1
+            return [self._text[self._item_start:]]
+        if self.items == 0 and self._items_depth is None and self._text.strip():
+            data = repair_json_object(self._text)
+            if isinstance(data, dict) and "title" in data:
+                self.items += 1
+                return [self._text]
+        return []
+
+
+def repair_json_object(fragment: str) -> Optional[Any]:
+    """
+    JSON 조각을 고쳐서 파싱 (실패하면 None).
+    뒤따르는 쉼표를 지우고, 잘린 조각이면 열린 문자열과 괄호를 닫아 본다.
+    """
+    fragment = fragment.strip()
+    candidates = [fragment, _TRAILING_COMMA.sub(r"\1", fragment)]
+
+    # 잘린 조각: 열린 문자열 / 괄호를 순서대로 닫음
+    stack, in_string, escape = [], False, False
+    for c in fragment:
+        if in_string:
+            if escape:
+                escape = False
+            elif c == "\\":
+                escape = True
+            elif c == '"':
+                in_string = False
+        elif c == '"':
+            in_string = True
+        elif c in "{[":
+            stack.append("}" if c == "{" else "]")
+        elif c in "}]" and stack:
+            stack.pop()
+    if in_string or stack:
+        closed = fragment + ('"' if in_string else "")
+        # 객체 안에서 값이 없는 마지막 키("key": / , "ke)와 뒤따르는 쉼표를 지움
+        if stack and stack[-1] == "}":
+            closed = _DANGLING_KEY.sub(r"\1", re.sub(r":\s*$", "", closed))
+        closed = re.sub(r",\s*$", "", closed)
+        candidates.append(_TRAILING_COMMA.sub(r"\1", closed + "".join(reversed(stack))))
+
+    for candidate in candidates:
+        try:
+            return json.loads(candidate)
+        except json.JSONDecodeError:
+            continue
+    return None
+
+
+def to_outline_model(data: Any) -> OutlineModel:
+    """
+    파싱한 항목을 OutlineModel로 검증. 흔한 형식 차이는 맞춰 준다.
+    (content가 목록, image_positions가 문자열, 숫자가 문자열 등) 필수 값이 없으면 ValidationError.
+    """
+    if not isinstance(data, dict):
+        raise ValueError(f"outline item must be an object, got {type(data).__name__}")
+    data = dict(data)
+    if isinstance(data.get("content"), list):
+        data["content"] = "\n".join(str(line) for line in data["content"])
+    if isinstance(data.get("image_positions"), str):
+        data["image_positions"] = [data["image_positions"]]
+    for key in ("images", "pages"):
+        if key in data:
+            try:
+                data[key] = int(data[key])
+            except (TypeError, ValueError):
+                del data[key]
+    if "pages" in data:
+        data["pages"] = max(1, data["pages"])
+    return OutlineModel(**data)
+
+
+def parse_outline_item(fragment: str) -> Optional[OutlineModel]:
+    """항목 조각 하나를 고쳐서 검증 (실패하면 None)"""
+    data = repair_json_object(fragment)
+    if isinstance(data, dict) and len(data) == 1 and isinstance(next(iter(data.values())), dict):
+        data = next(iter(data.values()))  # {"outline": {...}} 처럼 한 번 감싼 응답
+    try:
+        return to_outline_model(data)
+    except (ValidationError, ValueError, TypeError):
+        return None
+
+
+def parse_outline_text(text: str) -> List[Tuple[str, Optional[OutlineModel]]]:
+    """
+    완성된 응답 전체를 항목별로 파싱 (캐시된 응답 / 동기 호출용).
+    [(원문 조각, OutlineModel 또는 고치지 못했으면 None)] 을 응답 순서대로 반환.
+    """
+    parser = OutlineStreamParser()
+    return [(fragment, parse_outline_item(fragment)) for fragment in parser.feed(text) + parser.close()]
@@ -1,81 +1,207 @@
+import asyncio
 from langgraph.graph import StateGraph
-from langchain.schema import HumanMessage
-from langchain_community.callbacks.manager import get_openai_callback
+from langchain_core.messages import HumanMessage
+import logging
 from time import time
+from typing import Any, AsyncIterator, Dict
+from backend.config import FEEDBACK_MAX_ROUNDS
 from .nodes import *
 from .graph_state import GraphState
+from .graph_registry import graph_registry
+from .checkpointer import create_checkpointer, close_checkpointer
+from .context import current_thread_id
+from .instrumentation import RunRecord, current_run, instrument_node, RUNS, RUN_SECONDS, SLIDES
+from .events import event_bus
 
+logger = logging.getLogger(__name__)
 
-def build_presentation_workflow():
+DEFAULT_WORKFLOW = "default"
+STAGED_WORKFLOW = "staged"  # 단계별로 덱 전체를 기다리는 예전 흐름 (비교 / 이전 체크포인트 재개용)
+
+
+def build_presentation_workflow(checkpointer=None, pipelined: bool = True):
+    """
+    프레젠테이션 워크플로우 그래프를 컴파일.
+    checkpointer를 지정하지 않으면 설정(CHECKPOINT_BACKEND)에 맞는 체크포인터를 사용.
+    - pipelined=True : 개요마다 보강 → 분할 → 디자인/이미지를 이어서 진행 (outline_pipeline),
+                       관련성 검사는 그와 동시에 실행
+    - pipelined=False: refine_outline → split_outlines → parallel_slides 를 덱 전체 단위로 차례로 실행
+    """
     workflow = StateGraph(GraphState)
 
-    # ✅ LangGraph 노드 추가
-    workflow.add_node("generate_outline", generate_outline_node)
-    workflow.add_node("check_relevance", check_relevance_node)
-    workflow.add_node("refine_outline", refine_outline_node)
-    workflow.add_node("split_outlines", split_outlines_node)
-    workflow.add_node("parallel_slides", parallel_slides_node)
-    workflow.add_node("handle_feedback", handle_feedback_node)
-    workflow.add_node("generate_summary", generate_summary_node)
-    workflow.add_node("generate_narration", generate_narration_node)
-    workflow.add_node("finalize_presentation", finalize_presentation_node)
+    # ✅ LangGraph 노드 추가 (노드별 시간 / 토큰 / 비용 계측)
+    def add_node(name, fn):
+        workflow.add_node(name, instrument_node(name, fn))
+
+    add_node("generate_outline", generate_outline_node)
+    add_node("check_relevance", check_relevance_node)
+    if pipelined:
+        add_node("outline_pipeline", outline_pipeline_node)
+    else:
+        add_node("refine_outline", refine_outline_node)
+        add_node("split_outlines", split_outlines_node)
+        add_node("parallel_slides", parallel_slides_node)
+    add_node("handle_feedback", handle_feedback_node)
+    add_node("regenerate_slides", regenerate_slides_node)
+    add_node("generate_summary", generate_summary_node)
+    add_node("generate_narration", generate_narration_node)
+    add_node("finalize_presentation", finalize_presentation_node)
 
     # ✅ 워크플로우 연결
     workflow.set_entry_point("generate_outline")
-    workflow.add_edge("generate_outline", "check_relevance")
-    workflow.add_edge("check_relevance", "refine_outline")
-    workflow.add_edge("refine_outline", "split_outlines")
-    workflow.add_edge("split_outlines", "parallel_slides")
-    workflow.add_edge("parallel_slides", "handle_feedback")
+    if pipelined:
+        # 관련성 검사 결과는 흐름을 바꾸지 않으므로 슬라이드 생성과 동시에 실행하고 둘 다 끝나면 피드백 단계로
+        workflow.add_edge("generate_outline", "check_relevance")
+        workflow.add_edge("generate_outline", "outline_pipeline")
+        workflow.add_edge(["check_relevance", "outline_pipeline"], "handle_feedback")
+    else:
+        workflow.add_edge("generate_outline", "check_relevance")
+        workflow.add_edge("check_relevance", "refine_outline")
+        workflow.add_edge("refine_outline", "split_outlines")
+        workflow.add_edge("split_outlines", "parallel_slides")
+        workflow.add_edge("parallel_slides", "handle_feedback")
 
-    # ✅ 피드백 처리 후 개요로 돌아가거나 요약 생성
+    # ✅ 피드백 처리 후 개요로 돌아가거나, 지정된 슬라이드만 다시 만들거나, 요약 + 스크립트를 병렬 생성
     workflow.add_conditional_edges(
         "handle_feedback",
         check_feedback,
-        {
-            "yes": "generate_outline",
-            "no": "generate_summary"
-        }
+        ["generate_outline", "regenerate_slides", "generate_summary", "generate_narration"]
     )
+    workflow.add_edge("regenerate_slides", "handle_feedback")
 
-    workflow.add_edge("generate_summary", "generate_narration")
-    workflow.add_edge("generate_narration", "finalize_presentation")
+    # ✅ 요약/스크립트가 모두 끝나면 최종 정리
+    workflow.add_edge(["generate_summary", "generate_narration"], "finalize_presentation")
 
     workflow.set_finish_point("finalize_presentation")
-    return workflow.compile()
+    return workflow.compile(checkpointer=checkpointer or create_checkpointer())
+
 
+# ✅ 기본 워크플로우 등록 (컴파일은 최초 사용 또는 warmup 시 한 번만)
+graph_registry.register(DEFAULT_WORKFLOW, build_presentation_workflow)
+graph_registry.register(STAGED_WORKFLOW, lambda: build_presentation_workflow(pipelined=False))
 
-async def generate_presentation(user_input: dict, thread_id: str):
+
+async def shutdown_workflows():
+    """컴파일된 그래프들의 체크포인터 연결 정리 (프로세스 종료 시)"""
+    for graph in graph_registry.compiled():
+        if graph.checkpointer:
+            await close_checkpointer(graph.checkpointer)
+
+
+async def generate_presentation(user_input: dict, thread_id: str, variant: str = DEFAULT_WORKFLOW):
     """LangGraph 워크플로우를 실행하여 프레젠테이션 생성"""
-    graph = build_presentation_workflow()
+    graph = graph_registry.get(variant)
+    current_thread_id.set(thread_id)  # 스케줄러가 세션별로 공정하게 호출을 분배하도록
 
     # 초기 상태 설정
     input_state = GraphState(
-        message=[HumanMessage(content=user_input["message"])],
+        messages=[HumanMessage(content=user_input["message"])],
         topic=user_input["topic"],
         style=user_input["style"],
         check="no",
-        thread_id=thread_id
+        thread_id=thread_id,
+        skip_feedback=user_input.get("skip_feedback", False),
+        feedback_rounds=0,
     )
 
     config = {
         "configurable": {"thread_id": thread_id},
-        "recursion_limit": len(graph.nodes) + 3
+        # 수정 라운드 수는 handle_feedback 이 feedback_rounds 로 제한하고, 이 값은 만일을 위한 상한
+        "recursion_limit": (len(graph.nodes) + 3) * (FEEDBACK_MAX_ROUNDS + 1)
     }
 
+    # 같은 thread_id의 이전 실행이 중간에 끊겼다면 마지막으로 완료된 노드 다음부터 재개
+    snapshot = await graph.aget_state(config)
+    if variant == DEFAULT_WORKFLOW and not set(snapshot.next) <= set(graph.nodes):
+        # 개요별 파이프라인 도입 전에 저장된 체크포인트(refine_outline 등에서 멈춤)는 예전 흐름으로 재개
+        graph = graph_registry.get(STAGED_WORKFLOW)
+        snapshot = await graph.aget_state(config)
+    if snapshot.next:
+        logger.info("Resuming thread %s at %s", thread_id, snapshot.next)
+        input_state = None
+
     # LangGraph 실행
-    t = []
+    run = RunRecord(thread_id)
+    current_run.set(run)
+    prefetch = RefinePrefetch()
+    refine_prefetch.set(prefetch)
+    item = {}
+    texts: Dict[str, Any] = {}  # 결과와 함께 돌려줄 요약 / 스크립트
+    status = "succeeded"
     s = time()
     try:
-        with get_openai_callback() as cb:
-            async for item in graph.astream(input=input_state, config=config):
-                for node, value in item.items():
-                    print(f"\n[\033[1;36m{node}\033[0m]\n" + "-" * 40)
-                    print(value)
-                    t.append(f"{node}: {(e:=time()) - s:.3f}초")
-                    s = e
-            print("\n".join(t), end='\n\n')
-    except Exception as e: 
-        print(e)
-    print(cb)
-    return item["finalize_presentation"] if "finalize_presentation" in item else item
+        async for item in graph.astream(input=input_state, config=config):
+            for node, value in item.items():
+                logger.debug("[%s] %s", node, value)
+                if node in ("generate_summary", "generate_narration"):
+                    texts.update(value or {})
+                e = time()
+                # 스트리밍 구독자에게 노드 완료 + 소요 시간 전달 (내부 캐시 필드는 제외)
+                event_bus.publish(
+                    thread_id, "node", node=node, elapsed=round(e - s, 3),
+                    output={k: v for k, v in (value or {}).items() if not k.endswith("_cache")},
+                )
+                s = e
+    except Exception:
+        status = "failed"
+        logger.exception("Workflow failed for thread %s", thread_id)
+    finally:
+        prefetch.discard()
+
+    record = run.finish()
+    RUNS.inc(status=status)
+    RUN_SECONDS.observe(record["seconds"])
+    if record["slides"]:
+        SLIDES.observe(record["slides"])
+    logger.info(
+        "thread=%s status=%s seconds=%.3f slides=%d tokens=%d cost=$%.6f cache_hits=%d cache_misses=%d",
+        thread_id, status, record["seconds"], record["slides"], record["total_tokens"],
+        record["total_cost_usd"], record["cache"]["hits"], record["cache"]["misses"],
+    )
+
+    if "finalize_presentation" in item:
+        result = {**texts, **item["finalize_presentation"]}
+    else:
+        result = item
+    # status: 실패하면 "failed" (예외는 여기서 기록하고 지금까지의 부분 결과를 돌려줌)
+    return {**result, "status": status, "metrics": record} if isinstance(result, dict) else result
+
+
+async def stream_presentation(user_input: dict, thread_id: str, variant: str = DEFAULT_WORKFLOW,
+                              heartbeat: float = 15.0) -> AsyncIterator[Dict[str, Any]]:
+    """
+    generate_presentation을 백그라운드로 실행하면서 진행 이벤트를 순서대로 내보냄.
+    - node: 노드 완료 (소요 시간, 출력)
+    - slide_designed / slide_image / slide: 슬라이드별 중간 결과
+    - stream_start / token / stream_end: 디자인(slide-N) / 요약(summary) / 스크립트(narration) 생성 중인 텍스트
+    - feedback_wait: 사용자 피드백 대기 시작
+    - ping: 아무 이벤트가 없을 때 heartbeat초마다 (연결 유지)
+    - result / error → done
+    클라이언트가 연결을 끊으면 실행도 취소된다 (체크포인트가 있으므로 같은 thread_id로 재개 가능).
+    """
+    queue = event_bus.subscribe(thread_id)
+
+    async def run():
+        try:
+            result = await generate_presentation(user_input, thread_id, variant)
+            event_bus.publish(thread_id, "result", result=result)
+        except Exception as e:
+            event_bus.publish(thread_id, "error", message=str(e))
+        finally:
+            event_bus.publish(thread_id, "done")
+
+    task = asyncio.create_task(run())
+    try:
+        while True:
+            try:
+                event = await asyncio.wait_for(queue.get(), heartbeat)
+            except asyncio.TimeoutError:
+                yield {"event": "ping", "thread_id": thread_id}
+                continue
+            yield event
+            if event["event"] == "done":
+                break
+    finally:
+        event_bus.unsubscribe(thread_id, queue)
+        if not task.done():
+            task.cancel()
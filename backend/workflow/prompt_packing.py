@@ -0,0 +1,157 @@
+import asyncio
+import logging
+import re
+import threading
+from typing import Awaitable, Callable, List, Optional, Sequence
+
+from backend.config import PROMPT_TOKEN_BUDGETS, PROMPT_TOKENIZER, PROMPT_TOKENIZER_MODEL
+from .instrumentation import record_prompt_packing
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_BUDGET = 4000
+CONDENSE_ROUNDS = 2  # 압축 후에도 예산을 넘으면 한 번 더 압축, 그래도 넘으면 자름
+
+_IMAGE = re.compile(r"!\[[^\]]*\]\([^)]*\)")
+_COMMENT = re.compile(r"<!--.*?-->", re.S)
+_TAG = re.compile(r"</?[A-Za-z][^>]*>")
+_HEADING = re.compile(r"^\s{0,3}#{1,6}\s+")
+
+_encoder = None
+_encoder_loaded = False
+_encoder_lock = threading.Lock()
+
+
+# 🟢 토큰 수 계산
+def _get_encoder():
+    """tiktoken 인코더 (처음 사용할 때 한 번만 불러옴, 없으면 None)"""
+    global _encoder, _encoder_loaded
+    if not _encoder_loaded:
+        with _encoder_lock:
+            if not _encoder_loaded:
+                if PROMPT_TOKENIZER == "tiktoken":
+                    try:
+                        import tiktoken
+
+                        try:
+                            _encoder = tiktoken.encoding_for_model(PROMPT_TOKENIZER_MODEL)
+                        except KeyError:
+                            _encoder = tiktoken.get_encoding("cl100k_base")
+                    except Exception as e:  # 미설치이거나 오프라인이라 인코딩 파일을 받지 못함
+                        logger.info("tiktoken unavailable (%s); estimating tokens from text length", e)
+                _encoder_loaded = True
+    return _encoder
+
+
+def load_encoder() -> bool:
+    """
+    인코더를 미리 불러옴 (인코딩 파일을 받거나 읽느라 느릴 수 있으므로 서버 시작 시 / 스레드에서 호출).
+    tiktoken 을 쓸 수 있으면 True.
+    """
+    return _get_encoder() is not None
+
+
+def count_tokens(text: str) -> int:
+    """text의 토큰 수 (tiktoken이 없으면 UTF-8 4바이트당 1토큰으로 추정 — 한글은 글자당 약 0.75)"""
+    encoder = _get_encoder()
+    if encoder is None:
+        return (len(text.encode("utf-8")) + 3) // 4
+    return len(encoder.encode(text, disallowed_special=()))
+
+
+def truncate_to_budget(text: str, budget: int) -> str:
+    """budget 토큰을 넘는 부분을 잘라냄"""
+    if count_tokens(text) <= budget:
+        return text
+    encoder = _get_encoder()
+    if encoder is None:
+        return text.encode("utf-8")[: budget * 4].decode("utf-8", "ignore")
+    return encoder.decode(encoder.encode(text, disallowed_special=())[:budget])
+
+
+def budget_for(agent: str) -> int:
+    return PROMPT_TOKEN_BUDGETS.get(agent, DEFAULT_BUDGET)
+
+
+# 🟢 슬라이드 문맥 정리
+def clean_slides(slides: Sequence[str]) -> List[str]:
+    """
+    프롬프트에 넣을 슬라이드에서 의미 없는 내용을 제거.
+    - 이미지 링크, HTML 태그, Marp 지시문 주석
+    - 앞 슬라이드와 같은 제목 (한 개요가 여러 슬라이드로 나뉘면 제목이 반복됨)
+    - 빈 줄과 줄 끝 공백
+    """
+    cleaned, prev_heading = [], None
+    for slide in slides:
+        text = _TAG.sub("", _IMAGE.sub("", _COMMENT.sub("", slide)))
+        lines = []
+        for line in text.splitlines():
+            line = line.rstrip()
+            if not line.strip():
+                continue
+            if _HEADING.match(line):
+                heading = _HEADING.sub("", line).strip().lower()
+                if heading == prev_heading:
+                    continue
+                prev_heading = heading
+            lines.append(line)
+        cleaned.append("\n".join(lines))
+    return cleaned
+
+
+def slide_blocks(slides: Sequence[str]) -> List[str]:
+    """정리한 슬라이드마다 번호를 붙인 블록 (빈 슬라이드 제외)"""
+    return [f"Slide {i}:\n{s}" for i, s in enumerate(clean_slides(slides), 1) if s]
+
+
+def chunk_blocks(blocks: Sequence[str], budget: int) -> List[str]:
+    """블록을 순서대로 budget 토큰 이하의 묶음으로 나눔 (혼자 넘는 블록은 잘라냄)"""
+    chunks, current, used = [], [], 0
+    for block in blocks:
+        tokens = count_tokens(block)
+        if tokens > budget:
+            block, tokens = truncate_to_budget(block, budget), budget
+        if current and used + tokens > budget:
+            chunks.append("\n\n".join(current))
+            current, used = [], 0
+        current.append(block)
+        used += tokens
+    if current:
+        chunks.append("\n\n".join(current))
+    return chunks
+
+
+# 🟢 agent별 예산에 맞춘 슬라이드 문맥
+def pack_slides(slides: Sequence[str], agent: str) -> str:
+    """정리만 하고 예산을 넘는 부분은 잘라낸 문맥 (LLM 호출 없음, 동기 agent용)"""
+    packed = truncate_to_budget("\n\n".join(slide_blocks(slides)), budget_for(agent))
+    record_prompt_packing(agent, count_tokens("\n".join(slides)), count_tokens(packed))
+    return packed
+
+
+async def pack_slides_async(slides: Sequence[str], agent: str,
+                            condense: Optional[Callable[[str], Awaitable[str]]] = None) -> str:
+    """
+    정리한 슬라이드 문맥이 agent의 예산을 넘으면 map-reduce로 줄인다.
+    - map   : 'condense_slides' 예산 크기의 묶음으로 나눠 condense(묶음)를 병렬 실행
+    - reduce: 압축 결과를 순서대로 이어 붙이고, 아직 넘으면 한 번 더 압축
+    압축 후에도 넘으면 (또는 condense가 없으면) 예산에 맞게 잘라낸다.
+    """
+    if not _encoder_loaded:  # 서버 시작 시 불러오지 못했다면 이벤트 루프를 막지 않도록 스레드에서
+        await asyncio.to_thread(load_encoder)
+    budget = budget_for(agent)
+    blocks = slide_blocks(slides)
+    packed = "\n\n".join(blocks)
+    rounds = 0
+    while condense is not None and rounds < CONDENSE_ROUNDS and count_tokens(packed) > budget:
+        chunks = chunk_blocks(blocks, budget_for("condense_slides"))
+        blocks = list(await asyncio.gather(*(condense(chunk) for chunk in chunks)))
+        packed = "\n\n".join(blocks)
+        rounds += 1
+    packed = truncate_to_budget(packed, budget)
+
+    raw, used = count_tokens("\n".join(slides)), count_tokens(packed)
+    record_prompt_packing(agent, raw, used, condensed=rounds > 0)
+    if rounds:
+        logger.info("Condensed %s context in %d round(s): %d -> %d tokens", agent, rounds, raw, used)
+    return packed
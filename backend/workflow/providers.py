@@ -0,0 +1,106 @@
+import threading
+from typing import Any, Callable, Dict
+
+
+def _chat_llm():
+    from langchain_openai import ChatOpenAI
+
+    # stream_usage: astream으로 호출해도 토큰 사용량(비용 집계)이 보고되도록
+    return ChatOpenAI(model="gpt-4o-mini", temperature=0.7, stream_usage=True)
+
+
+def _json_llm():
+    # JSON 형식 LLM (코드 블록 / 설명 없이 "json_object"만 반환)
+    from langchain_openai import ChatOpenAI
+
+    return ChatOpenAI(
+        model="gpt-4o-mini",
+        temperature=0,
+        model_kwargs={"response_format": {"type": "json_object"}}
+    )
+
+
+def _completion_llm():
+    from langchain_openai import OpenAI
+
+    return OpenAI(model="gpt-4o-mini", temperature=0)
+
+
+def _image_generator():
+    from .image_client import AsyncImageGenerator
+
+    return AsyncImageGenerator(model="dall-e-3", size="1024x1024", quality="standard", n=1)
+
+
+def _image_store():
+    from backend.storage.image_store import ImageStore
+
+    return ImageStore()
+
+
+def _job_queue():
+    from backend.jobs.queue import JobQueue
+
+    return JobQueue()
+
+
+class Providers:
+    """
+    LLM / 이미지 클라이언트와 디스크 저장소(이미지 저장소, 작업 큐) 컨테이너.
+    각 항목은 처음 사용할 때 만들어지므로 import 시점에는 langchain_openai / openai 를
+    불러오지 않고 자격 증명도 필요 없으며, storage/ 아래에 디렉터리나 SQLite 파일도 만들지 않는다.
+    configure()로 대역(가짜 모델 / 임시 디렉터리 저장소 등)을 주입할 수 있다.
+    """
+
+    def __init__(self, factories: Dict[str, Callable[[], Any]]):
+        self._factories = dict(factories)
+        self._instances: Dict[str, Any] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> Any:
+        instance = self._instances.get(name)
+        if instance is None:
+            if name not in self._factories:
+                raise KeyError(f"등록되지 않은 provider입니다: {name}")
+            with self._lock:
+                instance = self._instances.get(name)
+                if instance is None:
+                    instance = self._instances[name] = self._factories[name]()
+        return instance
+
+    def __getattr__(self, name: str) -> Any:
+        if name.startswith("_"):
+            raise AttributeError(name)
+        try:
+            return self.get(name)
+        except KeyError as e:
+            raise AttributeError(name) from e
+
+    def configure(self, **overrides: Any):
+        """이미 만든 인스턴스로 교체. None인 항목은 그대로 둔다."""
+        with self._lock:
+            for name, instance in overrides.items():
+                if name not in self._factories:
+                    raise KeyError(f"등록되지 않은 provider입니다: {name}")
+                if instance is not None:
+                    self._instances[name] = instance
+
+    def reset(self, *names: str):
+        """인스턴스를 버려 다음 사용 시 다시 만들게 함 (이름이 없으면 전부)"""
+        with self._lock:
+            for name in names or list(self._instances):
+                self._instances.pop(name, None)
+
+    def loaded(self) -> Dict[str, bool]:
+        return {name: name in self._instances for name in self._factories}
+
+
+# 🟢 프로세스 전역 provider 컨테이너
+providers = Providers({
+    "llm": _chat_llm,
+    "llm_json": _json_llm,
+    "openai_llm": _completion_llm,
+    "image": _image_generator,
+    "image_store": _image_store,
+    "job_queue": _job_queue,
+})
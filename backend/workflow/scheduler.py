@@ -0,0 +1,252 @@
+import asyncio
+from collections import OrderedDict, deque
+from time import monotonic
+from typing import Any, Awaitable, Callable, Deque, Dict, Optional, Tuple, TypeVar
+
+from backend.config import (
+    SCHEDULER_MAX_IN_FLIGHT,
+    SCHEDULER_MAX_RETRIES,
+    SCHEDULER_RATE_LIMITS,
+    SCHEDULER_RETRY_BACKOFF_SEC,
+)
+from backend.utils.retry import retry_async
+from backend.utils.metrics import metrics
+from .context import current_thread_id
+from .instrumentation import LLM_API_SECONDS, LLM_QUEUE_SECONDS
+
+T = TypeVar("T")
+
+RETRYABLE_STATUS = {408, 409, 429, 500, 502, 503, 504}
+RETRYABLE_ERRORS = {"RateLimitError", "APITimeoutError", "APIConnectionError", "InternalServerError"}
+
+
+def is_retryable(e: BaseException) -> bool:
+    """429 / 5xx / 타임아웃 / 연결 오류만 재시도"""
+    status = getattr(e, "status_code", None) or getattr(getattr(e, "response", None), "status_code", None)
+    return status in RETRYABLE_STATUS or type(e).__name__ in RETRYABLE_ERRORS
+
+
+def is_rate_limited(e: BaseException) -> bool:
+    return getattr(e, "status_code", None) == 429 or type(e).__name__ == "RateLimitError"
+
+
+def estimate_tokens(prompt: str, completion: int = 512) -> int:
+    """TPM 버킷용 토큰 추정치 (영문 기준 약 4자/토큰 + 예상 응답 길이)"""
+    return len(prompt) // 4 + completion
+
+
+class TokenBucket:
+    """분당 rate_per_min 만큼 채워지는 토큰 버킷"""
+
+    def __init__(self, rate_per_min: int):
+        self.capacity = float(rate_per_min)
+        self.tokens = float(rate_per_min)
+        self.rate = rate_per_min / 60.0
+        self.updated = monotonic()
+
+    def _refill(self):
+        now = monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def try_take(self, amount: float) -> float:
+        """amount만큼 가져가면 0, 부족하면 기다려야 할 시간(초)을 반환"""
+        self._refill()
+        amount = min(amount, self.capacity)
+        if self.tokens >= amount:
+            self.tokens -= amount
+            return 0.0
+        return (amount - self.tokens) / self.rate
+
+    async def acquire(self, amount: float = 1):
+        while (delay := self.try_take(amount)) > 0:
+            await asyncio.sleep(delay)
+
+
+class ModelLane:
+    """
+    모델 하나에 대한 호출 차선.
+    - RPM / TPM 토큰 버킷
+    - 동시 실행 수 제한 (max_in_flight)
+    - thread_id별 대기열을 라운드 로빈으로 꺼내 세션 간 공정하게 분배
+    """
+
+    def __init__(self, name: str, rpm: int = 0, tpm: int = 0, max_in_flight: int = SCHEDULER_MAX_IN_FLIGHT):
+        self.name = name
+        self.requests = TokenBucket(rpm) if rpm else None
+        self.tokens = TokenBucket(tpm) if tpm else None
+        self.max_in_flight = max_in_flight
+        self.in_flight = 0
+        self._queues: "OrderedDict[str, Deque[asyncio.Future]]" = OrderedDict()
+        # 지표
+        self.wait_times: Deque[float] = deque(maxlen=1000)
+        self.api_times: Deque[float] = deque(maxlen=1000)
+        self.completed = 0
+        self.failed = 0
+        self.retries = 0
+        self.rate_limited = 0
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(len(q) for q in self._queues.values())
+
+    def _dispatch(self):
+        while self.in_flight < self.max_in_flight and self._queues:
+            thread_id, queue = next(iter(self._queues.items()))
+            fut = queue.popleft()
+            if queue:
+                self._queues.move_to_end(thread_id)  # 다음 차례는 다른 세션
+            else:
+                del self._queues[thread_id]
+            if fut.done():
+                continue
+            self.in_flight += 1
+            fut.set_result(None)
+
+    def _forget(self, thread_id: str, fut: asyncio.Future):
+        queue = self._queues.get(thread_id)
+        if queue is not None and fut in queue:
+            queue.remove(fut)
+            if not queue:
+                del self._queues[thread_id]
+
+    async def acquire(self, thread_id: str, tokens: int = 0) -> float:
+        """실행 슬롯과 rate limit 토큰을 얻을 때까지 대기하고, 대기 시간(초)을 반환"""
+        start = monotonic()
+        fut = asyncio.get_running_loop().create_future()
+        self._queues.setdefault(thread_id, deque()).append(fut)
+        self._dispatch()
+        try:
+            await fut
+        except asyncio.CancelledError:
+            if fut.done() and not fut.cancelled():
+                self.release()  # 슬롯을 받은 직후 취소됨
+            else:
+                self._forget(thread_id, fut)
+            raise
+
+        try:
+            if self.requests:
+                await self.requests.acquire(1)
+            if self.tokens and tokens:
+                await self.tokens.acquire(tokens)
+        except asyncio.CancelledError:
+            self.release()
+            raise
+
+        waited = monotonic() - start
+        self.wait_times.append(waited)
+        return waited
+
+    def release(self):
+        self.in_flight -= 1
+        self._dispatch()
+
+    def stats(self) -> Dict[str, Any]:
+        waits = sorted(self.wait_times)
+        apis = sorted(self.api_times)
+
+        def pct(samples, p):
+            return round(samples[min(len(samples) - 1, int(len(samples) * p))], 4) if samples else 0.0
+
+        return {
+            "queue_depth": self.queue_depth,
+            "waiting_threads": len(self._queues),
+            "in_flight": self.in_flight,
+            "max_in_flight": self.max_in_flight,
+            "completed": self.completed,
+            "failed": self.failed,
+            "retries": self.retries,
+            "rate_limited": self.rate_limited,
+            "wait_p50_sec": pct(waits, 0.5),
+            "wait_p99_sec": pct(waits, 0.99),
+            "api_p50_sec": pct(apis, 0.5),
+            "api_p99_sec": pct(apis, 0.99),
+        }
+
+
+class Scheduler:
+    """
+    프로세스 전역 LLM / DALL·E 호출 스케줄러.
+    모든 호출은 run(model, fn)을 거쳐 모델별 차선(ModelLane)에서 실행되며,
+    429 / 5xx 등 일시적 오류는 지수 백오프로 재시도한다.
+    """
+
+    def __init__(
+        self,
+        limits: Dict[str, Tuple[int, int]] = SCHEDULER_RATE_LIMITS,
+        max_in_flight: int = SCHEDULER_MAX_IN_FLIGHT,
+        retries: int = SCHEDULER_MAX_RETRIES,
+        backoff: float = SCHEDULER_RETRY_BACKOFF_SEC,
+    ):
+        self.limits = dict(limits)
+        self.max_in_flight = max_in_flight
+        self.retries = retries
+        self.backoff = backoff
+        self._lanes: Dict[str, ModelLane] = {}
+
+    def lane(self, model: str) -> ModelLane:
+        lane = self._lanes.get(model)
+        if lane is None:
+            rpm, tpm = self.limits.get(model, (0, 0))
+            lane = self._lanes[model] = ModelLane(model, rpm, tpm, self.max_in_flight)
+        return lane
+
+    async def run(
+        self,
+        model: str,
+        fn: Callable[[], Awaitable[T]],
+        *,
+        tokens: int = 0,
+        thread_id: Optional[str] = None,
+    ) -> T:
+        lane = self.lane(model)
+        thread_id = thread_id or current_thread_id.get()
+        attempts = 0
+
+        async def attempt() -> T:
+            nonlocal attempts
+            attempts += 1
+            if attempts > 1:
+                lane.retries += 1
+            waited = await lane.acquire(thread_id, tokens)
+            LLM_QUEUE_SECONDS.observe(waited, model=model)
+            start = monotonic()
+            try:
+                result = await fn()
+            except Exception as e:
+                if is_rate_limited(e):
+                    lane.rate_limited += 1
+                raise
+            finally:
+                elapsed = monotonic() - start
+                lane.api_times.append(elapsed)
+                LLM_API_SECONDS.observe(elapsed, model=model)
+                lane.release()
+            return result
+
+        try:
+            result = await retry_async(
+                attempt, retries=self.retries, backoff=self.backoff, should_retry=is_retryable
+            )
+        except Exception:
+            lane.failed += 1
+            raise
+        lane.completed += 1
+        return result
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        return {name: lane.stats() for name, lane in self._lanes.items()}
+
+
+# 🟢 프로세스 전역 스케줄러
+scheduler = Scheduler()
+
+metrics.gauge(
+    "llm_scheduler_queue_depth", "Calls waiting for a scheduler slot", ["model"],
+    fn=lambda: {(name,): lane.queue_depth for name, lane in scheduler._lanes.items()},
+)
+metrics.gauge(
+    "llm_scheduler_in_flight", "Calls currently running", ["model"],
+    fn=lambda: {(name,): lane.in_flight for name, lane in scheduler._lanes.items()},
+)
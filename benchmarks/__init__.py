@@ -0,0 +1,10 @@
+# benchmarks/__init__.py
+"""
+벤치마크 / 회귀 검사 (저장소 루트에서 python -m benchmarks.<이름> 으로 실행, 네트워크 / API 키 불필요).
+
+회귀 검사로 쓰는 것 (위반하면 FAIL 을 출력하고 종료 코드 1 — CI 에서 그대로 실행):
+    python -m benchmarks.bench_import_time       # 진입점별 import 시간 예산 / 지연 로드
+    python -m benchmarks.bench_feedback_resume   # 피드백 라운드와 중단된 실행의 체크포인트 재개
+    python -m benchmarks.bench_jobs              # 작업 큐의 claim / 취소 / 임대 만료 후 되찾기
+나머지 벤치마크도 기대한 동작이 깨지면 assert 로 실패한다.
+"""
@@ -0,0 +1,147 @@
+"""
+API 단계의 중복 요청 합치기(single-flight)와 동시 실행 제한(admission control).
+
+    python -m benchmarks.bench_admission [호출 지연(초)]
+
+ASGI 앱에 직접 요청을 보낸다 (네트워크 없음, 가짜 LLM / 이미지).
+1) 중복 요청: 같은 thread_id 재시도 4번 + 같은 내용의 다른 thread_id 3개를 동시에 보냄
+   → skip_feedback 요청은 그래프 실행 1번, 피드백을 받는 요청은 thread 마다 따로 (thread 당 1번)
+   같은 thread_id 로 내용이 다른 요청이 오면 합치지 않고 409
+2) 포화: 동시 실행 2 / 대기열 2 로 줄이고 서로 다른 요청 8개를 동시에 보냄
+   → 4개는 실행(2개는 대기 후), 나머지는 바로 429 + Retry-After
+3) 피드백 대기: 피드백을 기다리는 실행 2개가 있어도 새 요청은 대기 없이 시작 (대기 중에는 슬롯을 내려놓음)
+"""
+import asyncio
+import os
+import sys
+from time import perf_counter
+
+os.environ.setdefault("CHECKPOINT_BACKEND", "memory")
+
+import httpx
+
+from benchmarks.fakes import install_fakes
+from backend.main import app
+from backend.utils.admission import admission
+from backend.workflow import event_bus, feedback_broker
+from backend.workflow.llm_cache import llm_cache
+
+
+def answer_feedback(thread_id: str, delay: float = 0.0, waiting: asyncio.Event = None) -> asyncio.Task:
+    """thread_id 가 피드백을 기다리기 시작하면 (waiting 을 켜고) delay 초 뒤에 승인"""
+    queue = event_bus.subscribe(thread_id)
+
+    async def run():
+        try:
+            while (await queue.get())["event"] != "feedback_wait":
+                pass
+            if waiting is not None:
+                waiting.set()
+            await asyncio.sleep(delay)
+            feedback_broker.publish(thread_id, "looks good")
+        finally:
+            event_bus.unsubscribe(thread_id, queue)
+
+    return asyncio.create_task(run())
+
+
+def body(i, skip_feedback: bool = False) -> dict:
+    return {"message": "deck", "topic": f"topic {i}", "style": "modern", "skip_feedback": skip_feedback}
+
+
+async def duplicates(client: httpx.AsyncClient, llm_json, skip_feedback: bool):
+    prefix = "dup-skip" if skip_feedback else "dup"
+    threads = [f"{prefix}-a"] * 4 + [f"{prefix}-b", f"{prefix}-c", f"{prefix}-d"]
+    helpers = [] if skip_feedback else [answer_feedback(t) for t in set(threads)]
+    before = llm_json.calls["outline"]
+    responses = await asyncio.gather(*(client.post(f"/generate_presentation/{t}", json=body(prefix, skip_feedback))
+                                       for t in threads))
+    for h in helpers:
+        h.cancel()
+    assert all(r.status_code == 200 for r in responses), [r.text for r in responses]
+    runs = llm_json.calls["outline"] - before
+    coalesced = sum(r.json()["coalesced"] for r in responses)
+    print(f"duplicates: {len(threads)} requests (skip_feedback={skip_feedback}) -> {runs} graph run(s), "
+          f"{coalesced} coalesced")
+    if skip_feedback:
+        assert runs == 1 and coalesced == len(threads) - 1
+    else:  # 피드백을 받는 실행은 thread 마다 따로, 결과도 각자의 thread 로
+        assert runs == len(set(threads)) and coalesced == 3
+        assert all(r.json()["thread_id"] == t for r, t in zip(responses, threads))
+
+
+async def conflict(client: httpx.AsyncClient):
+    waiting = asyncio.Event()
+    helper = answer_feedback("conflict", delay=0.2, waiting=waiting)
+    first = asyncio.create_task(client.post("/generate_presentation/conflict", json=body("a")))
+    await waiting.wait()
+    other = await client.post("/generate_presentation/conflict", json=body("b"))
+    retry = asyncio.create_task(client.post("/generate_presentation/conflict", json=body("a")))
+    first, retry = await first, await retry
+    await helper
+    print(f"conflict  : same thread, different request -> {other.status_code}, "
+          f"same request -> {retry.status_code} coalesced={retry.json().get('coalesced')}")
+    assert other.status_code == 409, other.text
+    assert first.status_code == retry.status_code == 200 and retry.json()["coalesced"]
+
+
+async def saturation(client: httpx.AsyncClient):
+    admission.max_running, admission.max_queue = 2, 2
+    threads = [f"sat-{i}" for i in range(8)]
+    helpers = [answer_feedback(t) for t in threads]
+    s = perf_counter()
+
+    async def post(i, t):
+        await asyncio.sleep(i * 0.005)  # 도착 순서를 고정
+        r = await client.post(f"/generate_presentation/{t}", json=body(t))
+        return r, perf_counter() - s
+
+    results = await asyncio.gather(*(post(i, t) for i, t in enumerate(threads)))
+    for h in helpers:
+        h.cancel()
+    ok = [t for r, t in results if r.status_code == 200]
+    rejected = [(r, t) for r, t in results if r.status_code == 429]
+    print(f"saturation: 8 requests, max_running=2 max_queue=2 -> {len(ok)} served "
+          f"(slowest {max(ok):.2f}s), {len(rejected)} rejected with 429 "
+          f"in {max(t for _, t in rejected) * 1000:.0f}ms, Retry-After={rejected[0][0].headers.get('retry-after')}")
+    assert len(ok) == 4 and len(rejected) == 4
+    assert all(r.headers.get("retry-after") for r, _ in rejected)
+
+
+async def parked(client: httpx.AsyncClient):
+    admission.max_running, admission.max_queue = 2, 0
+    threads = ("park-1", "park-2")
+    events = [asyncio.Event() for _ in threads]
+    helpers = [answer_feedback(t, delay=1.0, waiting=e) for t, e in zip(threads, events)]
+    waiting = [asyncio.create_task(client.post(f"/generate_presentation/{t}", json=body(t))) for t in threads]
+    await asyncio.gather(*(e.wait() for e in events))  # 두 실행 모두 피드백 대기에 들어갈 때까지
+    held = admission.running
+    new = answer_feedback("park-new")
+    r = await client.post("/generate_presentation/park-new", json=body("park-new"))
+    parked_done = all(not t.done() for t in waiting)
+    responses = await asyncio.gather(*waiting)
+    new.cancel()
+    for h in helpers:
+        h.cancel()
+    print(f"parked    : 2 runs waiting for feedback holding {held} slot(s), new request -> {r.status_code} "
+          f"(max_running=2, max_queue=0)")
+    assert held == 0 and parked_done and r.status_code == 200 and all(x.status_code == 200 for x in responses)
+
+
+async def main(latency: float = 0.02):
+    fakes = install_fakes(latency=latency, image_latency=latency)
+    llm_cache.enabled = False
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=60) as client:
+        await duplicates(client, fakes["llm_json"], skip_feedback=True)
+        await duplicates(client, fakes["llm_json"], skip_feedback=False)
+        await conflict(client)
+        await saturation(client)
+        await parked(client)
+    print(f"admission: {admission.stats()}")
+    print("OK: duplicates shared one run, conflicting requests got 409, saturation rejected fast, parked runs freed their slots")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    asyncio.run(main(float(args[0]) if args else 0.02))
@@ -0,0 +1,84 @@
+"""
+JSONL 일괄 생성: 덱 사이 하위 요청 공유 유무 비교.
+
+    python -m benchmarks.bench_batch [레코드 수] [동시 실행 수] [호출 지연(초)]
+
+주제 3개를 고객군별 메시지로 나눈 레코드를 일괄 생성한다 (스타일은 모두 같음).
+- isolated: LLM 캐시를 끈 상태 (덱마다 모든 호출을 따로 실행)
+- shared  : 빈 LLM 캐시 + 진행 중 호출 공유 (같은 개요 보강 / 같은 슬라이드 디자인 / 같은 이미지 설명은 한 번만)
+            창작형 호출은 배치 안에서만 공유되고 영구 캐시에는 temperature 0 응답만 남아야 한다
+LLM / 이미지 호출 수, 처리량, 덱별 소요 시간을 비교하고 출력 디렉터리에 덱마다 파일이 쓰였는지 확인한다.
+"""
+import asyncio
+import json
+import os
+import re
+import sys
+import tempfile
+from urllib.parse import unquote, urlparse
+
+os.environ.setdefault("CHECKPOINT_BACKEND", "memory")
+
+from benchmarks.fakes import install_fakes
+from backend.jobs.batch import BatchRun, parse_records
+from backend.workflow.llm_cache import llm_cache
+
+TOPICS = ["cloud migration", "data governance", "AI adoption"]
+SEGMENTS = ["retail", "banking", "healthcare", "public sector", "manufacturing", "telecom"]
+
+
+def make_jsonl(n: int) -> str:
+    return "\n".join(
+        json.dumps({"id": f"{TOPICS[i % len(TOPICS)]}-{SEGMENTS[i // len(TOPICS) % len(SEGMENTS)]}",
+                    "topic": TOPICS[i % len(TOPICS)], "style": "modern",
+                    "message": f"tailor it for {SEGMENTS[i // len(TOPICS) % len(SEGMENTS)]} customers"})
+        for i in range(n)
+    )
+
+
+async def _run(name: str, records, parallel: int, latency: float, share: bool):
+    fakes = install_fakes(latency=latency, image_latency=latency, outline_items=5, pages=2)
+    llm_cache.enabled = share
+    if share:  # 빈 캐시에서 시작 (공유 효과만 보도록)
+        llm_cache.path = os.path.join(tempfile.mkdtemp(prefix="bench-batch-cache-"), "llm_cache.sqlite")
+        llm_cache._conn = None
+        llm_cache._memory.clear()
+
+    out_dir = tempfile.mkdtemp(prefix=f"bench-batch-{name}-")
+    summary = await BatchRun(records, out_dir, parallel).run()
+    llm_calls = fakes["llm"].total_calls + fakes["llm_json"].total_calls
+
+    with open(os.path.join(out_dir, "results.jsonl"), encoding="utf-8") as f:
+        lines = [json.loads(line) for line in f]
+    assert len(lines) == len(records) and summary["succeeded"] == len(records), summary
+    assert all(os.path.exists(r["files"][key]) for r in lines for key in ("slides_marp", "summary", "script"))
+    # slides.md 의 이미지가 출력 디렉터리 밖(웹 서버 없이)에서도 열리는지
+    for r in lines:
+        with open(r["files"]["slides_marp"], encoding="utf-8") as f:
+            refs = re.findall(r"!\[[^\]]*\]\(([^)]+)\)", f.read())
+        assert refs and all(urlparse(u).scheme == "file" and os.path.exists(unquote(urlparse(u).path)) for u in refs), refs
+
+    if share:
+        # 창작형(fake llm, temperature 0.7) 응답은 영구 캐시에 쓰지 않음 → 남은 항목은 JSON(temperature 0) 호출뿐
+        assert len(llm_cache._memory) == fakes["llm_json"].total_calls, (len(llm_cache._memory), fakes["llm_json"].calls)
+
+    t = summary["throughput"]
+    print(f"{name:9s} wall={summary['seconds']:5.2f}s  {t['decks_per_min']:6.1f} decks/min  "
+          f"{t['slides_per_sec']:5.1f} slides/s  record p50={summary['record_seconds']['p50']:.2f}s  "
+          f"llm calls={llm_calls:4d}  image calls={fakes['dalle'].calls:3d}  shared={summary['llm_calls_shared']}")
+    return summary, llm_calls
+
+
+async def main(n: int = 12, parallel: int = 4, latency: float = 0.05):
+    records = parse_records(make_jsonl(n).splitlines())
+    print(f"{n} records ({len(TOPICS)} topics), parallel={parallel}, {latency * 1000:.0f}ms per call")
+    _, isolated = await _run("isolated", records, parallel, latency, share=False)
+    summary, shared = await _run("shared", records, parallel, latency, share=True)
+    assert shared < isolated and summary["llm_calls_shared"] > 0
+    print(f"OK: {n} decks written, {isolated - shared} LLM calls saved by sharing across decks")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    asyncio.run(main(int(args[0]) if args else 12, int(args[1]) if len(args) > 1 else 4,
+                     float(args[2]) if len(args) > 2 else 0.05))
@@ -0,0 +1,89 @@
+"""
+동시 세션 부하 테스트: 동기 agent 호출(이벤트 루프 차단) vs 비동기 노드.
+
+    python -m benchmarks.bench_event_loop [세션 수] [LLM 지연(초)]
+
+각 세션은 개요 → 관련성 검사 → 개요 보강 → 요약/스크립트 를 가짜 LLM으로 실행한다.
+- blocking: 예전처럼 async 함수 안에서 llm.invoke (time.sleep) 를 호출
+- async   : 노드들이 ainvoke (asyncio.sleep) 를 사용하고, 요약/스크립트는 동시에 실행
+이벤트 루프 지연(lag)은 /feedback POST 같은 다른 요청이 얼마나 밀리는지를 나타낸다.
+"""
+import asyncio
+import sys
+from time import perf_counter
+
+from benchmarks.fakes import install_fakes
+from backend.storage.slide_store import slide_store
+from backend.workflow import agents, nodes
+from backend.workflow.llm_cache import llm_cache
+from backend.workflow.outline_parser import parse_outline_text
+
+
+def _pct(samples, p):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * p))]
+
+
+def _blocking_outline(topic: str):
+    text = agents.providers.llm_json.invoke(agents._outline_prompt(topic, "modern", "")).content
+    return [item for _, item in parse_outline_text(text) if item is not None]
+
+
+async def blocking_session(i: int):
+    outlines = _blocking_outline(f"topic {i}")
+    combined = "\n\n".join(f"{o.title}\n{o.content}" for o in outlines)
+    agents.check_relevance(combined, f"topic {i}")
+    refined = [agents.refine_outline(o.content) for o in outlines]
+    agents.generate_summary(refined)
+    agents.generate_narration(refined)
+
+
+async def async_session(i: int):
+    state = {"topic": f"topic {i}", "style": "modern", "messages": [], "thread_id": f"t{i}"}
+    state.update(await nodes.generate_outline_node(state))
+    state.update(await nodes.check_relevance_node(state))
+    state.update(await nodes.refine_outline_node(state))
+    state["designed_slides"] = slide_store.put_many(o.content for o in state["outlines"])
+    await asyncio.gather(nodes.generate_summary_node(state), nodes.generate_narration_node(state))
+
+
+async def _run(session, n: int):
+    lags = []
+    stop = asyncio.Event()
+
+    async def probe(interval=0.01):
+        while not stop.is_set():
+            s = perf_counter()
+            await asyncio.sleep(interval)
+            lags.append(perf_counter() - s - interval)
+
+    # 모든 세션이 동시에 도착했다고 보고, 도착 시점부터 완료까지를 지연으로 측정
+    async def timed(i):
+        await session(i)
+        return perf_counter() - s
+
+    probe_task = asyncio.create_task(probe())
+    s = perf_counter()
+    latencies = await asyncio.gather(*(timed(i) for i in range(n)))
+    wall = perf_counter() - s
+    stop.set()
+    await probe_task
+    return wall, latencies, lags
+
+
+async def main(n: int = 20, latency: float = 0.05):
+    install_fakes(latency=latency, outline_items=3)
+    llm_cache.enabled = False  # 세션 간 캐시 적중이 결과를 왜곡하지 않도록
+
+    print(f"{n} concurrent sessions, fake LLM latency {latency * 1000:.0f}ms")
+    for label, session in [("blocking", blocking_session), ("async", async_session)]:
+        wall, latencies, lags = await _run(session, n)
+        print(
+            f"{label:<9} wall={wall:7.2f}s  p50={_pct(latencies, 0.5):7.2f}s  "
+            f"p99={_pct(latencies, 0.99):7.2f}s  max loop lag={max(lags or [0]) * 1000:8.1f}ms"
+        )
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    asyncio.run(main(int(args[0]) if args else 20, float(args[1]) if len(args) > 1 else 0.05))
@@ -0,0 +1,136 @@
+"""
+피드백 라운드 / 중단된 실행의 재개 검사 (하나라도 어기면 FAIL 을 출력하고 종료 코드 1).
+
+    python -m benchmarks.bench_feedback_resume
+
+1) 피드백 라운드: 'modify' 피드백으로 generate_outline 으로 되돌아간 뒤, 개요 내용이 같다면
+   refine/디자인/이미지 생성은 체크포인트된 결과를 재사용하고 다시 호출하지 않아야 한다.
+   이미지는 개념(개요 제목)마다 하나씩만 생성된다.
+2) 수정 라운드 제한: 'modify' 피드백이 계속 와도 FEEDBACK_MAX_ROUNDS 라운드 뒤에는 더 기다리지 않고 마무리한다.
+   피드백 대기를 취소(DELETE /feedback/{thread_id})하면 실패 없이 그대로 마무리한다.
+3) 슬라이드 디자인 중 중단: 같은 thread_id 로 다시 실행하면 개요를 다시 만들지 않는다.
+   한계: 체크포인트는 노드 단위라 outline_pipeline 안에서 끝난 보강 / 디자인은 저장되지 않아 다시 실행된다
+   (저장을 마친 이미지는 이미지 저장소에서 재사용, 중단 때 진행 중이던 이미지는 다시 생성).
+   다시 실행되는 양이 덱 한 벌을 넘지 않는지만 확인하고 LIMIT 으로 출력한다.
+4) 피드백 대기 중 중단 (서버 재시작 등): 다시 실행하면 피드백 단계부터 이어가며
+   보강 / 디자인 / 이미지를 다시 호출하지 않는다.
+LLM 캐시는 끈다 (호출 수가 체크포인트 재사용만 반영하도록).
+"""
+import asyncio
+import sys
+import uuid
+
+from benchmarks.fakes import install_fakes
+from backend.config import FEEDBACK_MAX_ROUNDS
+from backend.workflow import event_bus, generate_presentation, feedback_broker
+from backend.workflow.llm_cache import llm_cache
+
+USER_INPUT = {"message": "hi", "topic": "LLM caching", "style": "modern"}
+OUTLINES, PAGES = 4, 2
+SLIDES = OUTLINES * PAGES
+
+
+async def feedback_round():
+    fakes = install_fakes(outline_items=OUTLINES, pages=PAGES)
+    llm, llm_json, dalle = fakes["llm"], fakes["llm_json"], fakes["dalle"]
+    thread_id = f"bench-feedback-{uuid.uuid4().hex[:8]}"
+
+    feedback_broker.publish(thread_id, "please modify the tone")  # 1라운드 → 다시 개요 생성
+    feedback_broker.publish(thread_id, "looks good")              # 2라운드 → 요약/스크립트로 진행
+    result = await generate_presentation(USER_INPUT, thread_id)
+    assert "slides_marp" in result, result
+
+    print("feedback  : chat calls:", dict(llm.calls), "json calls:", dict(llm_json.calls), "dalle calls:", dalle.calls)
+    # 두 번째 라운드에서는 개요/관련성 검사만 다시 실행된다
+    assert llm_json.calls["outline"] == 2, llm_json.calls
+    assert llm.calls["refine"] == OUTLINES, llm.calls
+    assert llm.calls["design"] == SLIDES, llm.calls
+    assert dalle.calls == OUTLINES, dalle.calls  # 개요(개념)당 이미지 하나
+
+
+async def round_limit():
+    fakes = install_fakes(outline_items=OUTLINES, pages=PAGES, vary_outlines=True)
+    thread_id = f"bench-rounds-{uuid.uuid4().hex[:8]}"
+    for i in range(FEEDBACK_MAX_ROUNDS + 2):  # 제한보다 많은 수정 요청
+        feedback_broker.publish(thread_id, f"please modify it again ({i})")
+    result = await generate_presentation(USER_INPUT, thread_id)
+    outline_calls = fakes["llm_json"].calls["outline"]
+    print(f"rounds    : {FEEDBACK_MAX_ROUNDS + 2} modify requests, outline calls={outline_calls} "
+          f"(limit {FEEDBACK_MAX_ROUNDS} rounds)")
+    assert result.get("status") == "succeeded" and result.get("slides_marp"), result
+    assert outline_calls == FEEDBACK_MAX_ROUNDS + 1, "feedback rounds were not capped at FEEDBACK_MAX_ROUNDS"
+    feedback_broker.cancel(thread_id)  # 남은 피드백 정리
+
+
+async def cancelled_wait():
+    install_fakes(outline_items=OUTLINES, pages=PAGES)
+    thread_id = f"bench-cancel-{uuid.uuid4().hex[:8]}"
+    queue = event_bus.subscribe(thread_id)
+    run = asyncio.create_task(generate_presentation(USER_INPUT, thread_id))
+    try:
+        while (await asyncio.wait_for(queue.get(), 30))["event"] != "feedback_wait":
+            pass
+    finally:
+        event_bus.unsubscribe(thread_id, queue)
+    while not feedback_broker.is_waiting(thread_id):  # 노드가 wait() 에 들어갈 때까지
+        await asyncio.sleep(0.01)
+    assert feedback_broker.cancel(thread_id), "no feedback wait to cancel"
+    result = await asyncio.wait_for(run, 30)
+    print(f"cancelled : feedback wait cancelled, status={result.get('status')}")
+    assert result.get("status") == "succeeded" and result.get("slides_marp"), result
+
+
+async def interrupted(name: str, stop_at: str):
+    """stop_at 이벤트가 오면 실행을 취소하고, 같은 thread_id 로 다시 실행해 끝까지 진행"""
+    fakes = install_fakes(outline_items=OUTLINES, pages=PAGES)
+    llm, llm_json, dalle = fakes["llm"], fakes["llm_json"], fakes["dalle"]
+    thread_id = f"bench-resume-{name}-{uuid.uuid4().hex[:8]}"
+
+    queue = event_bus.subscribe(thread_id)
+    run = asyncio.create_task(generate_presentation(USER_INPUT, thread_id))
+    try:
+        while (await asyncio.wait_for(queue.get(), 30))["event"] != stop_at:
+            pass
+    finally:
+        event_bus.unsubscribe(thread_id, queue)
+    run.cancel()
+    try:
+        await run
+    except asyncio.CancelledError:
+        pass
+    before = {"outline": llm_json.calls["outline"], "refine": llm.calls["refine"],
+              "design": llm.calls["design"], "dalle": dalle.calls}
+
+    feedback_broker.publish(thread_id, "looks good")
+    result = await generate_presentation(USER_INPUT, thread_id)
+    after = {"outline": llm_json.calls["outline"], "refine": llm.calls["refine"],
+             "design": llm.calls["design"], "dalle": dalle.calls}
+    print(f"{name:<10}: interrupted at {stop_at}, calls before={before} after resume={after}")
+
+    assert result.get("status") == "succeeded" and result.get("slides_marp"), result
+    assert result["slides_marp"].count("![image]") == SLIDES, "resumed deck is incomplete"
+    assert after["outline"] == 1, "resume regenerated the outline"
+    return before, after
+
+
+async def main() -> int:
+    llm_cache.enabled = False
+    try:
+        await feedback_round()
+        await round_limit()
+        await cancelled_wait()
+        before, after = await interrupted("designing", stop_at="slide_designed")
+        rerun = {k: after[k] - before[k] for k in ("refine", "design", "dalle")}
+        assert rerun["refine"] <= OUTLINES and rerun["design"] <= SLIDES and rerun["dalle"] <= OUTLINES, rerun
+        print(f"LIMIT: resume mid-pipeline re-ran {rerun} (no per-slide checkpoints inside outline_pipeline)")
+        before, after = await interrupted("feedback", stop_at="feedback_wait")
+        assert after == before, "resume after the feedback wait re-ran refine / design / images"
+    except AssertionError as e:
+        print(f"FAIL: {e}")
+        return 1
+    print("OK: feedback round re-ran only outline + relevance; rounds capped; cancelled wait finished; resume after the feedback wait re-ran nothing")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main()))
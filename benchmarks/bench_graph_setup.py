@@ -0,0 +1,52 @@
+"""
+요청당 그래프 준비 시간 마이크로 벤치마크.
+
+    python -m benchmarks.bench_graph_setup [반복 횟수]
+
+- before: 요청마다 build_presentation_workflow() 로 StateGraph를 새로 만들고 컴파일
+- after : graph_registry.get() 으로 프로세스 단위 컴파일 그래프 재사용
+"""
+import os
+import sys
+from statistics import mean, median
+from time import perf_counter
+
+# API 클라이언트는 처음 호출할 때 만들어지므로 자격 증명 없이 실행된다 (체크포인터만 메모리로)
+os.environ.setdefault("CHECKPOINT_BACKEND", "memory")
+
+from backend.workflow.presentation_workflow import (  # noqa: E402
+    DEFAULT_WORKFLOW,
+    build_presentation_workflow,
+    graph_registry,
+)
+
+
+def _measure(fn, n: int):
+    samples = []
+    for _ in range(n):
+        s = perf_counter()
+        fn()
+        samples.append((perf_counter() - s) * 1000)
+    return samples
+
+
+def _report(label: str, samples):
+    samples = sorted(samples)
+    p99 = samples[min(len(samples) - 1, int(len(samples) * 0.99))]
+    print(f"{label:<8} mean={mean(samples):8.3f}ms  median={median(samples):8.3f}ms  p99={p99:8.3f}ms")
+
+
+def main(n: int = 200):
+    graph_registry.warmup(DEFAULT_WORKFLOW)
+
+    before = _measure(build_presentation_workflow, n)
+    after = _measure(lambda: graph_registry.get(DEFAULT_WORKFLOW), n)
+
+    print(f"per-request graph setup ({n} runs)")
+    _report("before", before)
+    _report("after", after)
+    print(f"speedup  x{mean(before) / max(mean(after), 1e-9):,.0f}")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 200)
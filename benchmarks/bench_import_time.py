@@ -0,0 +1,90 @@
+"""
+진입점별 cold import 시간과 무거운 의존성 로드 여부 검사 (예산 초과 시 종료 코드 1).
+
+    python -m benchmarks.bench_import_time [--repeat 5] [--scale 1.0]
+
+각 진입점을 새 인터프리터에서 OPENAI_API_KEY / MONGO_URI 없이 import 하여
+- 자격 증명 없이 import 가 성공하는지
+- import 시간(반복 중 중앙값)이 예산 안인지
+- 첫 사용 시에만 필요한 라이브러리(langchain_openai, pymongo 등)를 불러오지 않는지
+- 작업 디렉터리에 storage/ 디렉터리나 SQLite 파일을 만들지 않는지 (빈 임시 디렉터리에서 실행)
+를 확인한다. 느린 CI 머신에서는 --scale 로 예산을 늘린다.
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+# 첫 사용 시에만 불러와야 하는 라이브러리
+LAZY = ["langchain_openai", "langchain_community", "openai", "pymongo", "markdown"]
+# 워커 / CLI 진입점은 웹 스택과 그래프 라이브러리도 불러오지 않아야 함
+WEB_AND_GRAPH = ["fastapi", "starlette", "langgraph", "langchain_core"]
+
+# (모듈, 예산(ms), import 되면 안 되는 모듈)
+TARGETS = [
+    ("backend.main", 2000, LAZY),
+    ("backend.workflow", 1800, LAZY + ["fastapi"]),
+    ("backend.jobs.worker", 300, LAZY + WEB_AND_GRAPH),
+]
+
+_PROBE = """
+import json, sys, time
+s = time.perf_counter()
+import {module}
+ms = (time.perf_counter() - s) * 1000
+print(json.dumps({{"ms": ms, "loaded": [m for m in {forbidden!r} if m in sys.modules]}}))
+"""
+
+
+def probe(module: str, forbidden, env) -> dict:
+    with tempfile.TemporaryDirectory(prefix="bench-import-") as cwd:
+        proc = subprocess.run(
+            [sys.executable, "-W", "ignore", "-c", _PROBE.format(module=module, forbidden=forbidden)],
+            capture_output=True, text=True, env=env, cwd=cwd,
+        )
+        created = sorted(os.listdir(cwd))
+    if proc.returncode != 0:
+        return {"error": (proc.stderr.strip().splitlines() or ["import failed"])[-1]}
+    return {**json.loads(proc.stdout.strip().splitlines()[-1]), "created": created}
+
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Import-time budget check")
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--scale", type=float, default=1.0, help="예산 배율")
+    args = parser.parse_args(argv)
+
+    env = {k: v for k, v in os.environ.items()
+           if k not in ("OPENAI_API_KEY", "MONGO_URI", "DB_NAME", "COLLECTION_NAME")}
+    env["PYTHONPATH"] = os.pathsep.join(filter(None, [os.getcwd(), env.get("PYTHONPATH")]))
+
+    failed = False
+    for module, budget, forbidden in TARGETS:
+        budget *= args.scale
+        runs = [probe(module, forbidden, env) for _ in range(args.repeat)]
+        errors = [r["error"] for r in runs if "error" in r]
+        if errors:
+            print(f"FAIL {module:<22} import error: {errors[0]}")
+            failed = True
+            continue
+
+        ms = statistics.median(r["ms"] for r in runs)
+        loaded = sorted({m for r in runs for m in r["loaded"]})
+        created = sorted({f for r in runs for f in r["created"]})
+        ok = ms <= budget and not loaded and not created
+        failed |= not ok
+        print(
+            f"{'ok  ' if ok else 'FAIL'} {module:<22} {ms:7.0f}ms (budget {budget:.0f}ms)"
+            + (f"  eagerly loaded: {', '.join(loaded)}" if loaded else "")
+            + (f"  created on import: {', '.join(created)}" if created else "")
+        )
+    print("FAIL: import-time budget exceeded, heavy modules loaded eagerly or files created on import" if failed
+          else "OK: all entry points import within budget without heavy dependencies or touching disk")
+    return 1 if failed else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv[1:]))
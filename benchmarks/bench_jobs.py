@@ -0,0 +1,144 @@
+"""
+작업 큐: 넣기 / 가져가기 / 취소 / 임대 만료 후 되찾기 검사 (하나라도 어기면 FAIL 을 출력하고 종료 코드 1).
+
+    python -m benchmarks.bench_jobs [작업 수]
+
+1) 두 "프로세스"(각자 연결을 가진 JobQueue)가 동시에 claim 해도 작업마다 정확히 한 번만 가져간다.
+2) 대기 중인 작업은 바로 취소되고, 실행 중인 작업은 취소 요청만 표시된다 → 워커가 멈추고 cancelled 로 마무리.
+3) 하트비트가 끊긴 작업은 임대가 만료되면 다른 워커가 다시 가져가고, 원래 워커의 하트비트는 실패한다.
+   max_attempts 번 만료되면 failed. 하트비트를 보내는 동안에는 다른 워커가 가져가지 못한다.
+4) API 처럼 저장소 스레드 풀에서 동시에 넣고 조회해도 이벤트 루프가 막히지 않는다.
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import threading
+from time import perf_counter, sleep
+
+os.environ.setdefault("CHECKPOINT_BACKEND", "memory")
+
+from benchmarks.fakes import install_fakes
+from backend.jobs import JobQueue, JobStatus, worker
+from backend.jobs.worker import _execute
+from backend.storage.persistence import run_in_storage
+
+USER_INPUT = {"message": "hi", "topic": "job queue", "style": "modern"}
+
+
+def _path() -> str:
+    return os.path.join(tempfile.mkdtemp(prefix="bench-jobs-"), "jobs.sqlite")
+
+
+def concurrent_claims(n: int):
+    path = _path()
+    ids = [JobQueue(path).enqueue({"input": USER_INPUT}, priority=i % 3) for i in range(n)]
+    claimed = {"a": [], "b": []}
+
+    def drain(name: str):
+        queue = JobQueue(path)
+        while (job := queue.claim(name)) is not None:
+            claimed[name].append(job["id"])
+
+    s = perf_counter()
+    threads = [threading.Thread(target=drain, args=(name,)) for name in claimed]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    elapsed = perf_counter() - s
+    got = claimed["a"] + claimed["b"]
+    print(f"claims    : {n} jobs, worker a={len(claimed['a'])} b={len(claimed['b'])}, "
+          f"{n / elapsed:,.0f} claims/s")
+    assert sorted(got) == sorted(ids), "a job was claimed twice or not at all"
+
+
+async def cancellation():
+    queue = JobQueue(_path())
+    queued = queue.enqueue({"input": USER_INPUT})
+    assert queue.cancel(queued) and queue.get(queued)["status"] == JobStatus.CANCELLED
+    assert not queue.cancel(queued), "cancelling a finished job must fail"
+
+    install_fakes(latency=0.2, outline_items=4, pages=2)
+    worker.JOB_POLL_INTERVAL_SEC = 0.05  # 취소 요청을 빨리 확인하도록
+    running = queue.enqueue({"input": USER_INPUT})
+    job = queue.claim("w1")
+    task = asyncio.create_task(_execute(queue, job, "w1"))
+    await asyncio.sleep(0.1)
+    assert queue.cancel(running) and queue.get(running)["cancel_requested"]
+    await asyncio.wait_for(task, 10)
+    status = queue.get(running)["status"]
+    print(f"cancel    : queued -> cancelled, running -> {status}")
+    assert status == JobStatus.CANCELLED, status
+
+    done = queue.enqueue({"input": USER_INPUT})
+    await _execute(queue, queue.claim("w1"), "w1")
+    assert queue.get(done)["status"] == JobStatus.SUCCEEDED, queue.get(done)
+
+
+def leases():
+    path = _path()
+    a, b = JobQueue(path, lease=0.2, max_attempts=2), JobQueue(path, lease=0.2, max_attempts=2)
+    job_id = a.enqueue({"input": USER_INPUT})
+    assert a.claim("a")["id"] == job_id
+
+    # 하트비트를 보내는 동안에는 만료되지 않음
+    for _ in range(3):
+        sleep(0.1)
+        assert a.heartbeat(job_id, "a"), "heartbeat failed while holding the lease"
+        assert b.claim("b") is None, "job claimed while its lease was being renewed"
+
+    # 워커 a 가 멈춤 → 만료 후 b 가 다시 가져감, a 의 하트비트는 실패
+    sleep(0.3)
+    job = b.claim("b")
+    assert job and job["id"] == job_id and job["attempts"] == 2, job
+    assert not a.heartbeat(job_id, "a"), "stale worker kept the lease"
+
+    # 두 번째 임대도 만료 → max_attempts(2) 에 이르러 실패로 마무리
+    sleep(0.3)
+    assert a.claim("a") is None
+    job = a.get(job_id)
+    print(f"lease     : reclaimed after expiry (attempts={job['attempts']}), then {job['status']}: {job['error']}")
+    assert job["status"] == JobStatus.FAILED, job
+
+
+async def api_calls(n: int):
+    queue = JobQueue(_path())
+    lag, stop = 0.0, asyncio.Event()
+
+    async def probe():
+        nonlocal lag
+        while not stop.is_set():
+            s = perf_counter()
+            await asyncio.sleep(0.005)
+            lag = max(lag, perf_counter() - s - 0.005)
+
+    prober = asyncio.create_task(probe())
+    s = perf_counter()
+    ids = await asyncio.gather(*(run_in_storage(queue.enqueue, {"input": USER_INPUT}, 0) for _ in range(n)))
+    jobs = await asyncio.gather(*(run_in_storage(queue.get, job_id) for job_id in ids))
+    cancelled = await asyncio.gather(*(run_in_storage(queue.cancel, job_id) for job_id in ids[::2]))
+    elapsed = perf_counter() - s
+    stop.set()
+    await prober
+    print(f"api       : {n} enqueue + get, {len(cancelled)} cancel in storage threads, {elapsed:.2f}s, "
+          f"max loop lag={lag * 1000:.1f}ms")
+    assert all(j and j["status"] == JobStatus.QUEUED for j in jobs) and all(cancelled)
+    assert queue.queue_depth() == {JobStatus.CANCELLED: len(ids[::2]), JobStatus.QUEUED: n - len(ids[::2])}
+
+
+async def main(n: int = 200) -> int:
+    try:
+        concurrent_claims(n)
+        await cancellation()
+        leases()
+        await api_calls(n)
+    except AssertionError as e:
+        print(f"FAIL: {e}")
+        return 1
+    print("OK: each job claimed once, cancel / lease reclaim / heartbeat behave, API calls stay off the loop")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(asyncio.run(main(*(int(a) for a in sys.argv[1:2]))))
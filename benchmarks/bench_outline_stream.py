@@ -0,0 +1,79 @@
+"""
+개요 스트리밍 파싱: 항목별 검증 / 보강 미리 시작 / 깨진 항목만 다시 요청.
+
+    python -m benchmarks.bench_outline_stream [개요 수] [호출 지연(초)]
+
+1) 개요 응답(호출 지연 동안 조금씩 도착)에서 첫 항목이 나오는 시각과 응답 완료 시각,
+   REFINE_PREFETCH 켬/끔에 따른 덱 완료 시간을 비교한다. 미리 시작한 보강도 그 실행의 지표(refine_prefetch)에 잡혀야 한다.
+2) 항목 하나를 고칠 수 없게 깨뜨려도, 예전처럼 빈 덱이 되지 않고 그 항목만 다시 요청되는지 확인한다.
+3) 뒤따르는 쉼표 / 잘린 마지막 항목 같은 흔한 오류는 다시 요청 없이 고쳐지는지 확인한다.
+"""
+import asyncio
+import sys
+from time import perf_counter
+
+from benchmarks.fakes import install_fakes
+from backend.workflow import event_bus, generate_presentation, nodes
+from backend.workflow.llm_cache import llm_cache
+from backend.workflow.outline_parser import parse_outline_text
+
+
+async def _run(thread_id: str, outlines: int, latency: float, **fake_kwargs):
+    fakes = install_fakes(latency=latency, outline_items=outlines, **fake_kwargs)
+    events = event_bus.subscribe(thread_id)
+    marks = {}
+
+    async def watch():
+        while True:
+            event = await events.get()
+            name = event["event"] if event["event"] != "node" else f"node:{event['node']}"
+            marks.setdefault(name, perf_counter() - start)
+
+    watcher = asyncio.create_task(watch())
+    start = perf_counter()
+    result = await generate_presentation(
+        {"message": "deck", "topic": "outline streaming", "style": "modern", "skip_feedback": True}, thread_id
+    )
+    marks["deck"] = perf_counter() - start
+    watcher.cancel()
+    event_bus.unsubscribe(thread_id, events)
+    return result, marks, fakes["llm_json"]
+
+
+async def main(outlines: int = 8, latency: float = 1.0):
+    llm_cache.enabled = False
+    print(f"{outlines} outline items, {latency * 1000:.0f}ms per call")
+
+    decks = {}
+    for prefetch in (False, True):
+        nodes.REFINE_PREFETCH = prefetch
+        result, marks, _ = await _run(f"bench-outline-{prefetch}", outlines, latency)
+        decks[prefetch] = marks["deck"]
+        prefetched = result["metrics"]["nodes"].get("refine_prefetch", {}).get("runs", 0)
+        print(
+            f"prefetch={'on ' if prefetch else 'off'}  first item={marks['outline_item']:5.2f}s  "
+            f"outline done={marks['node:generate_outline']:5.2f}s  first slide={marks['slide']:5.2f}s  "
+            f"deck={marks['deck']:5.2f}s  prefetched refines={prefetched:.0f}"
+        )
+        assert marks["outline_item"] < marks["node:generate_outline"] / 2
+        assert prefetched == (outlines if prefetch else 0), result["metrics"]["nodes"]
+    assert decks[True] < decks[False]
+
+    # 깨진 항목: 그 항목만 다시 요청
+    result, _, llm_json = await _run("bench-outline-broken", outlines, 0.0, broken_items=[3])
+    slides = result["slides_marp"].count("\n---\n")
+    print(f"broken item #3: outline calls={llm_json.calls['outline']} item re-requests={llm_json.calls['outline_item']} "
+          f"slides={slides}")
+    assert llm_json.calls == {"outline": 1, "outline_item": 1} and slides == outlines
+
+    # 고칠 수 있는 오류: 뒤따르는 쉼표, 문자열 숫자, 토큰 한도로 잘린 마지막 항목
+    sloppy = ('{"outlines": [{"title": "A", "content": "a", "pages": "2",}, '
+              '{"title": "B", "content": ["b1", "b2"]}, {"title": "C", "content": "c", "images": 1, "image_pos')
+    parsed = parse_outline_text(sloppy)
+    assert [item.title for _, item in parsed] == ["A", "B", "C"] and parsed[0][1].pages == 2
+    print("OK: malformed items repaired or re-requested individually")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    asyncio.run(main(*(int(a) for a in args[:1]), *(float(a) for a in args[1:2])))
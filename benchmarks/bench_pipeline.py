@@ -0,0 +1,62 @@
+"""
+개요별 파이프라인(default) vs 단계별 barrier(staged) 워크플로우.
+
+    python -m benchmarks.bench_pipeline [개요 수] [개요당 페이지] [호출 지연(초)] [지연 편차]
+
+staged 는 모든 개요의 보강이 끝나야 분할 / 디자인을 시작하므로 덱 완료 시간이 단계별 최대 지연의 합에 가깝고,
+default 는 개요마다 보강 → 분할 → 디자인/이미지를 이어서 진행하므로 가장 느린 개요 하나의 체인에 가까워진다.
+호출 지연은 latency × (1 ~ 1 + 편차) 로 흩어져 있어 단계마다 가장 느린 호출을 기다리는 비용이 드러난다.
+두 흐름의 슬라이드 내용(이미지 URL 제외)이 같은 순서로 같은지도 확인한다.
+"""
+import asyncio
+import re
+import sys
+from time import perf_counter
+
+from benchmarks.fakes import install_fakes
+from backend.workflow import DEFAULT_WORKFLOW, STAGED_WORKFLOW, event_bus, generate_presentation
+from backend.workflow.llm_cache import llm_cache
+
+_IMAGE = re.compile(r"!\[image\]\([^)]*\)")
+
+
+async def _run(variant: str, outlines: int, pages: int, latency: float, jitter: float):
+    install_fakes(latency=latency, image_latency=latency, outline_items=outlines, pages=pages, jitter=jitter)
+    thread_id = f"bench-pipeline-{variant}"
+    events = event_bus.subscribe(thread_id)
+    slide_times = []
+
+    async def watch():
+        while True:
+            if (await events.get())["event"] == "slide":
+                slide_times.append(perf_counter() - start)
+
+    watcher = asyncio.create_task(watch())
+    start = perf_counter()
+    result = await generate_presentation(
+        {"message": "deck", "topic": "pipelining", "style": "modern", "skip_feedback": True}, thread_id, variant
+    )
+    elapsed = perf_counter() - start
+    watcher.cancel()
+    event_bus.unsubscribe(thread_id, events)
+    return elapsed, slide_times[0], slide_times[-1], _IMAGE.sub("", result["slides_marp"])
+
+
+async def main(outlines: int = 12, pages: int = 2, latency: float = 0.2, jitter: float = 2.0):
+    llm_cache.enabled = False
+    print(f"{outlines} outlines x {pages} pages, {latency * 1000:.0f}ms per call (+0..{jitter * 100:.0f}%)")
+
+    staged = await _run(STAGED_WORKFLOW, outlines, pages, latency, jitter)
+    pipelined = await _run(DEFAULT_WORKFLOW, outlines, pages, latency, jitter)
+    for name, (elapsed, first, last, _) in (("staged", staged), ("pipelined", pipelined)):
+        print(f"{name:<10} deck={elapsed:6.2f}s  first slide={first:6.2f}s  all slides={last:6.2f}s")
+    print(f"x{staged[0] / pipelined[0]:.2f} faster to a complete deck")
+
+    assert staged[3] == pipelined[3], "pipelined deck differs from the staged one"
+    assert pipelined[0] < staged[0]
+    print("OK: same slides in the same order")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    asyncio.run(main(*(int(a) for a in args[:2]), *(float(a) for a in args[2:4])))
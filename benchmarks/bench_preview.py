@@ -0,0 +1,64 @@
+"""
+HTML 미리보기: 덱 전체 재변환 vs 슬라이드별 캐시 + diff.
+
+    python -m benchmarks.bench_preview [슬라이드 수]
+
+피드백으로 슬라이드 하나가 바뀐 덱을 다시 미리보기할 때
+- full       : 예전 방식 (매번 markdown.markdown 으로 덱 전체 변환 + Template 컴파일)
+- incremental: HTMLRenderer.render (바뀐 슬라이드만 변환)
+- diff       : HTMLRenderer.diff (바뀐 슬라이드 HTML 만 반환)
+"""
+import sys
+from time import perf_counter
+
+import markdown
+from jinja2 import Template
+
+from backend.presentation_engine.html_renderer import HTMLRenderer
+
+
+def _deck(n: int, edited: int = -1) -> str:
+    slides = []
+    for i in range(n):
+        body = "\n".join(f"- point {i}.{j} with **bold** and `code`" for j in range(8))
+        note = " (revised)" if i == edited else ""
+        slides.append(f"# Slide {i}{note}\n\n{body}\n\n| a | b |\n|---|---|\n| {i} | {i * 2} |")
+    return "---\nmarp: true\npaginate: true\n---\n\n" + "\n---\n".join(slides)
+
+
+def full_render(md_content: str) -> str:
+    html = markdown.markdown(md_content, extensions=["extra", "toc", "sane_lists"])
+    return Template(HTMLRenderer.HTML_TEMPLATE).render(slides=[{"hash": "", "html": html}])
+
+
+def _time(fn, *args, repeat: int = 5) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        s = perf_counter()
+        fn(*args)
+        best = min(best, perf_counter() - s)
+    return best
+
+
+def main(n: int = 100):
+    original, edited = _deck(n), _deck(n, edited=n // 2)
+    HTMLRenderer.render(original)  # 첫 미리보기로 캐시 채움
+    known = HTMLRenderer.diff(original, [])["hashes"]
+
+    t_full = _time(full_render, edited)
+    diff = HTMLRenderer.diff(edited, known)
+    key = (diff["changed"][0]["index"], diff["changed"][0]["hash"])
+    t_inc = _time(lambda: (HTMLRenderer._cache.pop(key, None), HTMLRenderer.render(edited)))
+    t_diff = _time(lambda: (HTMLRenderer._cache.pop(key, None), HTMLRenderer.diff(edited, known)))
+
+    assert [c["index"] for c in diff["changed"]] == [n // 2], diff["changed"]
+    payload_full = len(HTMLRenderer.render(edited))
+    payload_diff = sum(len(c["html"]) for c in diff["changed"])
+    print(f"{n} slides, 1 slide edited")
+    print(f"full        : {t_full * 1000:7.2f}ms")
+    print(f"incremental : {t_inc * 1000:7.2f}ms  (x{t_full / t_inc:.1f})")
+    print(f"diff        : {t_diff * 1000:7.2f}ms  payload {payload_diff}B vs {payload_full}B full page")
+
+
+if __name__ == "__main__":
+    main(int(sys.argv[1]) if len(sys.argv) > 1 else 100)
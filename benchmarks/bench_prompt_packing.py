@@ -0,0 +1,69 @@
+"""
+요약 / 스크립트 프롬프트의 토큰 수: 예전 방식(슬라이드를 그대로 이어 붙인 list repr) vs 프롬프트 패킹.
+
+    python -m benchmarks.bench_prompt_packing [슬라이드 수] [호출 지연(초)]
+
+덱은 실제 결과처럼 슬라이드마다 이미지 링크가 붙고, 한 개요가 두 슬라이드로 나뉘어 제목이 반복된다.
+- before : f"{[combined]}" 로 보내던 문맥의 토큰 수 (예산 초과 여부)
+- after  : 정리(이미지 링크 / 반복 제목 제거) + 예산 초과 시 묶음별 병렬 압축(map-reduce) 후 토큰 수
+agent별 예산은 PROMPT_TOKEN_BUDGETS (기본 summary 4000 / narration 8000).
+디자인은 슬라이드 원문을 그대로 다듬어야 하므로 패킹하지 않는다 (보낸 문맥이 원문과 같은지 확인).
+"""
+import asyncio
+import sys
+from time import perf_counter
+
+from benchmarks.fakes import install_fakes
+from backend.workflow import agents
+from backend.workflow.instrumentation import RunRecord, current_run
+from backend.workflow.llm_cache import llm_cache
+from backend.workflow.prompt_packing import budget_for, count_tokens, slide_blocks
+
+
+def make_deck(n: int) -> list:
+    body = "\n".join(
+        f"- Point {j}: quarterly revenue grew {j * 3}% driven by enterprise adoption in region {j}" for j in range(8)
+    )
+    return [
+        f"# Section {i // 2 + 1}\n\n<!-- _class: lead -->\n{body}\n\n![image](/images/{i:064x}.png)"
+        for i in range(n)
+    ]
+
+
+async def main(n: int = 120, latency: float = 0.2):
+    llm_cache.enabled = False
+    fakes = install_fakes(latency=latency, text_size=600)
+    llm = fakes["llm"]
+    deck = make_deck(n)
+    before = count_tokens(str(["\n".join(deck)]))
+    cleaned = count_tokens("\n\n".join(slide_blocks(deck)))
+    print(f"{n} slides, {latency * 1000:.0f}ms per call, context tokens: before={before} cleaned={cleaned}")
+
+    run = RunRecord("bench-packing")
+    token = current_run.set(run)
+    try:
+        s = perf_counter()
+        await asyncio.gather(agents.generate_summary_async(deck), agents.generate_narration_async(deck))
+        elapsed = perf_counter() - s
+        designed = await agents.apply_design_async(deck[0], "modern")
+    finally:
+        current_run.reset(token)
+
+    report = run.finish()["prompt_packing"]
+    for agent, p in report.items():
+        budget = budget_for(agent)
+        print(
+            f"{agent:<19} budget={budget:>5}  raw={p['raw']:>6}  packed={p['packed']:>5}  "
+            f"saved={p['saved'] / max(p['raw'], 1):6.1%}  condensed={p['condensed']}"
+        )
+        assert p["packed"] <= budget * p["calls"], (agent, p)
+    print(f"summary + narration wall={elapsed:.2f}s  condense calls={llm.calls['condense']}")
+    # 정리만으로 예산 안이면 압축 호출 없이 한 번에 보냄
+    assert bool(report["generate_summary"]["condensed"]) == (cleaned > budget_for("generate_summary"))
+    assert llm.calls["summary"] == llm.calls["narration"] == 1
+    assert "apply_design" not in report and deck[0] in llm.prompts["design"], designed
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    asyncio.run(main(*(int(a) for a in args[:1]), *(float(a) for a in args[1:2])))
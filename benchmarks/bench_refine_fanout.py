@@ -0,0 +1,46 @@
+"""
+refine_outline_node 벽시계 시간 vs 개요 수.
+
+    python -m benchmarks.bench_refine_fanout [LLM 지연(초)]
+
+지연을 주입한 가짜 LLM으로, 순차 실행(동시성 1)과 REFINE_CONCURRENCY 병렬 실행을 비교한다.
+"""
+import asyncio
+import sys
+from time import perf_counter
+
+from benchmarks.fakes import install_fakes
+from backend.workflow import nodes
+from backend.workflow.llm_cache import llm_cache
+
+
+async def _time_refine(n_outlines: int, concurrency: int) -> float:
+    nodes.REFINE_CONCURRENCY = concurrency
+    state = {
+        "outlines": [
+            {"title": f"S{i}", "content": f"content {i}", "images": 0, "image_positions": [], "pages": 1}
+            for i in range(n_outlines)
+        ],
+    }
+    s = perf_counter()
+    result = await nodes.refine_outline_node(state)
+    elapsed = perf_counter() - s
+    assert [o.title for o in result["outlines"]] == [f"S{i}" for i in range(n_outlines)]  # 순서 유지
+    return elapsed
+
+
+async def main(latency: float = 0.1):
+    install_fakes(latency=latency)
+    llm_cache.enabled = False
+    parallel = nodes.REFINE_CONCURRENCY
+
+    print(f"fake LLM latency {latency * 1000:.0f}ms, concurrency {parallel}")
+    print(f"{'outlines':>8} {'sequential':>12} {'parallel':>12}")
+    for n in (1, 2, 5, 10, 20):
+        seq = await _time_refine(n, 1)
+        par = await _time_refine(n, parallel)
+        print(f"{n:>8} {seq:>11.2f}s {par:>11.2f}s")
+
+
+if __name__ == "__main__":
+    asyncio.run(main(float(sys.argv[1]) if len(sys.argv) > 1 else 0.1))
@@ -0,0 +1,126 @@
+"""
+PDF 내보내기: 요청마다 marp 실행 vs 묶음 실행 + 결과 캐시 + 대기열 제한.
+
+    python -m benchmarks.bench_render [요청 수] [고유 덱 수] [marp 기동 시간(초)]
+
+실제 marp 대신 기동에 startup 초, 덱당 0.05초가 걸리는 가짜 CLI 를 사용한다.
+- naive  : 예전 MarpRenderer 처럼 요청마다 프로세스 하나 (동시 실행 수 제한 없음)
+- service: RenderService (워커 2개, 최대 8개 묶음, 같은 내용은 캐시/single-flight)
+burst    : 대기열 한도를 넘는 요청이 RenderQueueFull 로 거절되는지 확인
+images   : 이미지가 있는 슬라이드를 내보낼 때 이미지 참조가 marp 작업 디렉터리에서 풀리는지 확인
+           (가짜 CLI 도 marp 처럼 Markdown 파일 위치 기준으로 이미지를 찾고, 없으면 실패)
+"""
+import asyncio
+import hashlib
+import os
+import stat
+import sys
+import tempfile
+from pathlib import Path
+from time import perf_counter
+
+from backend.presentation_engine.render_service import RenderError, RenderQueueFull, RenderService
+from backend.storage.image_store import ImageStore
+
+FAKE_MARP = """#!{python}
+import os, re, sys, time
+from pathlib import Path
+from urllib.parse import unquote, urljoin, urlparse
+args = sys.argv[1:]
+src, out = args[args.index("--input-dir") + 1], args[args.index("--output") + 1]
+fmt = "pdf" if "--pdf" in args else "pptx"
+time.sleep({startup})  # Node.js + 헤드리스 브라우저 기동
+for name in sorted(os.listdir(src)):
+    time.sleep(0.05)
+    with open(os.path.join(src, name), "rb") as f:
+        data = f.read()
+    # marp --allow-local-files 처럼 이미지를 Markdown 파일 URL 기준으로 풀어서 읽음
+    for ref in re.findall(rb"!\\[[^\\]]*\\]\\(([^)]+)\\)", data):
+        url = urlparse(urljoin(Path(src, name).resolve().as_uri(), ref.decode()))
+        if url.scheme == "file" and not os.path.exists(unquote(url.path)):
+            sys.exit(f"{{name}}: image not found: {{ref.decode()}}")
+    with open(os.path.join(out, name[:-3] + "." + fmt), "wb") as g:
+        g.write(data)
+with open(os.environ["FAKE_MARP_LOG"], "a") as log:
+    log.write("x")
+"""
+
+
+def _fake_marp(startup: float) -> str:
+    path = os.path.join(tempfile.mkdtemp(prefix="bench-marp-"), "marp")
+    with open(path, "w") as f:
+        f.write(FAKE_MARP.format(python=sys.executable, startup=startup))
+    os.chmod(path, os.stat(path).st_mode | stat.S_IEXEC)
+    return path
+
+
+def _launches(log_path: str) -> int:
+    with open(log_path) as f:
+        return len(f.read())
+
+
+async def _run(name: str, service: RenderService, decks, log_path: str):
+    open(log_path, "w").close()
+    s = perf_counter()
+    paths = await asyncio.gather(*(service.render(d, "pdf") for d in decks))
+    wall = perf_counter() - s
+    assert all(os.path.exists(p) for p in paths)
+    print(f"{name:>8}: wall={wall:.2f}s  marp launches={_launches(log_path)}  {service.stats()}")
+    await service.close()
+
+
+async def main(n: int = 40, unique: int = 20, startup: float = 0.5):
+    marp = _fake_marp(startup)
+    log_path = os.path.join(os.path.dirname(marp), "launches")
+    os.environ["FAKE_MARP_LOG"] = log_path
+    decks = [f"---\nmarp: true\n---\n# deck {i % unique}\n" for i in range(n)]
+    print(f"{n} export requests, {unique} unique decks, {startup:.1f}s marp startup")
+
+    naive = RenderService(cache_dir=tempfile.mkdtemp(), workers=n, batch_size=1, max_queue=n, marp_bin=marp)
+    naive.cache_key = lambda markdown, fmt, theme=None, _i=iter(range(n)): f"naive{next(_i)}"  # 캐시 없음
+    await _run("naive", naive, decks, log_path)
+
+    service = RenderService(cache_dir=tempfile.mkdtemp(), workers=2, batch_size=8, max_queue=n, marp_bin=marp)
+    await _run("service", service, decks, log_path)
+
+    open(log_path, "w").close()
+    s = perf_counter()
+    await asyncio.gather(*(service.render(d, "pdf") for d in decks))
+    print(f"{'cached':>8}: wall={perf_counter() - s:.3f}s  marp launches={_launches(log_path)}")
+    await service.close()
+
+    burst = RenderService(cache_dir=tempfile.mkdtemp(), workers=1, batch_size=4, max_queue=8, marp_bin=marp)
+    results = await asyncio.gather(
+        *(burst.render(f"# burst {i}", "pdf") for i in range(50)), return_exceptions=True
+    )
+    rejected = sum(isinstance(r, RenderQueueFull) for r in results)
+    print(f"{'burst':>8}: 50 distinct requests, queue limit 8 -> {50 - rejected} rendered, {rejected} rejected")
+    assert rejected > 0
+    await burst.close()
+
+    # 이미지가 있는 슬라이드: 슬라이드 Markdown 은 웹 경로(/images/<digest>.png)로 이미지를 참조한다
+    images = ImageStore(base_dir=tempfile.mkdtemp(prefix="bench-render-images-"))
+    data = b"fake png"
+    digest = hashlib.sha256(data).hexdigest()
+    with open(images.path(digest), "wb") as f:
+        f.write(data)
+    images._register(digest, len(data))
+    deck = f"---\nmarp: true\n---\n# slide with image\n\n![image]({images.public_url(digest)})\n"
+    exporter = RenderService(cache_dir=tempfile.mkdtemp(), workers=1, marp_bin=marp)
+    try:
+        await exporter.render(deck, "pdf")
+        raw = "rendered"
+    except RenderError as e:
+        raw = f"failed ({str(e).split(': ', 1)[-1]})"
+    path = await exporter.render(images.localize(deck), "pdf")
+    with open(path, "rb") as f:
+        rendered = f.read().decode()
+    print(f"{'images':>8}: web path -> {raw}; localized -> rendered with {images.path(digest)!r}")
+    assert raw != "rendered" and Path(images.path(digest)).resolve().as_uri() in rendered
+    await exporter.close()
+    print("OK: batched, cached, bounded, and image-bearing slides render")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    asyncio.run(main(*(int(a) for a in args[:2]), *(float(a) for a in args[2:3])))
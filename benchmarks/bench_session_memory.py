@@ -0,0 +1,122 @@
+"""
+피드백을 기다리며 멈춰 있는(handle_feedback) 세션 하나가 차지하는 메모리.
+
+    python -m benchmarks.bench_session_memory [세션 수] [개요 수] [개요당 페이지] [피드백 라운드]
+
+세션마다 초안을 만들고 슬라이드 지정 피드백을 라운드 수만큼 처리한 뒤 다음 피드백을 기다리게 하고,
+그 상태에서 tracemalloc 으로 늘어난 메모리를 세션 수로 나눈다 (체크포인터는 memory).
+- per session   : 멈춘 세션 하나당 늘어난 파이썬 메모리 (상태 + 체크포인트 + 슬라이드 원문)
+- checkpoint    : 세션 하나의 체크포인트 직렬화 크기 (MemorySaver 의 저장 버전 / 쓰기 합)
+- slide store   : 그중 slide_store 가 보관한 슬라이드 원문 (세션 간에 공유, 메모리가 차면 디스크로 밀려남)
+마지막에 모든 세션을 끝까지 진행해 최종 Markdown 이 온전한지 확인한다.
+store limits : 디스크 계층이 용량 안에서 유지되고, 밀려난 / 없는 ref 는 텍스트 대신 SlideMissing 으로 드러나는지
+"""
+import asyncio
+import os
+import sys
+import tempfile
+import tracemalloc
+
+os.environ.setdefault("CHECKPOINT_BACKEND", "memory")
+
+from benchmarks.fakes import install_fakes
+from backend.storage.slide_store import SlideMissing, SlideStore, slide_store
+from backend.workflow import DEFAULT_WORKFLOW, event_bus, feedback_broker, generate_presentation, graph_registry
+from backend.workflow.llm_cache import llm_cache
+
+
+def _bytes(obj) -> int:
+    """체크포인터 항목 안의 직렬화된 바이트 합"""
+    if isinstance(obj, (bytes, bytearray)):
+        return len(obj)
+    if isinstance(obj, dict):
+        return sum(_bytes(v) for v in obj.values())
+    if isinstance(obj, (tuple, list)):
+        return sum(_bytes(v) for v in obj)
+    return 0
+
+
+def checkpoint_bytes(saver, thread_id: str) -> int:
+    blobs = sum(_bytes(v) for k, v in saver.blobs.items() if k[0] == thread_id)
+    writes = sum(_bytes(v) for k, v in saver.writes.items() if k[0] == thread_id)
+    return _bytes(saver.storage.get(thread_id, {})) + blobs + writes
+
+
+async def _park(thread_id: str, rounds: int):
+    """초안 + 지정 피드백 rounds 번을 처리하고 다음 피드백을 기다리는 상태로 둔다"""
+    events = event_bus.subscribe(thread_id)
+
+    async def wait_for_feedback_prompt():
+        while (await events.get())["event"] != "feedback_wait":
+            pass
+
+    user_input = {"message": "deck", "topic": f"topic {thread_id}", "style": "modern"}
+    task = asyncio.create_task(generate_presentation(user_input, thread_id))
+    await wait_for_feedback_prompt()
+    for r in range(rounds):
+        feedback_broker.publish(thread_id, {"feedback": f"tighten round {r}", "slides": [r + 1]})
+        await wait_for_feedback_prompt()
+    event_bus.unsubscribe(thread_id, events)
+    return task
+
+
+def store_limits(slides: int = 200, size: int = 1024, max_disk_bytes: int = 64 * 1024):
+    base = tempfile.mkdtemp(prefix="bench-slides-")
+    store = SlideStore(os.path.join(base, "slides.sqlite"), max_bytes=4 * size, max_disk_bytes=max_disk_bytes)
+    refs = []
+    for start in range(0, slides, 10):  # 노드마다 flush 하듯 10개씩 기록
+        refs += store.put_many(f"{i:06d} " + "x" * size for i in range(start, min(slides, start + 10)))
+        store.flush()
+    stats = store.stats()
+    print(f"store limits: {slides} x {size}B written, disk={stats['disk_bytes'] / 1024:.0f} KiB "
+          f"(limit {max_disk_bytes / 1024:.0f} KiB), evicted={stats['disk_evictions']}")
+    assert stats["disk_bytes"] <= max_disk_bytes and stats["disk_evictions"] > 0, stats
+    assert store.get(refs[-1]).startswith(f"{slides - 1:06d}")
+
+    for label, probe, ref in (("evicted", store, refs[0]),
+                              ("other root", SlideStore(os.path.join(base, "other.sqlite")), refs[-1])):
+        try:
+            probe.get(ref)
+        except SlideMissing:
+            continue
+        raise AssertionError(f"{label} ref resolved instead of raising SlideMissing")
+
+
+async def main(sessions: int = 50, outlines: int = 10, pages: int = 2, rounds: int = 2):
+    install_fakes(outline_items=outlines, pages=pages, text_size=1500, vary_outlines=True)
+    llm_cache.enabled = False
+    graph = graph_registry.get(DEFAULT_WORKFLOW)
+
+    # 한 세션을 먼저 끝까지 실행해 지연 import / 그래프 컴파일 / 캐시 초기화를 측정에서 뺀다
+    warmup = await _park("warmup", 0)
+    feedback_broker.publish("warmup", "looks good")
+    await warmup
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    store_before = slide_store.stats()["memory_bytes"]
+    tasks = [await _park(f"bench-mem-{i}", rounds) for i in range(sessions)]
+    await asyncio.sleep(0)
+    parked = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    store = slide_store.stats()["memory_bytes"] - store_before
+    checkpoint = sum(checkpoint_bytes(graph.checkpointer, f"bench-mem-{i}") for i in range(sessions))
+    print(f"{sessions} parked sessions, {outlines} outlines x {pages} pages, {rounds} feedback round(s) each")
+    print(f"per session : {parked / sessions / 1024:8.1f} KiB")
+    print(f"checkpoint  : {checkpoint / sessions / 1024:8.1f} KiB")
+    print(f"slide store : {store / sessions / 1024:8.1f} KiB")
+
+    for i in range(sessions):
+        feedback_broker.publish(f"bench-mem-{i}", "looks good")
+    results = await asyncio.gather(*tasks)
+    expected = outlines * pages
+    bad = [r for r in results if r.get("slides_marp", "").count("\n---\n") != expected]
+    assert not bad, f"{len(bad)} session(s) produced an incomplete deck"
+    store_limits()
+    print(f"OK: {sessions} sessions resumed and produced {expected}-slide decks")
+
+
+if __name__ == "__main__":
+    args = [int(a) for a in sys.argv[1:]]
+    asyncio.run(main(*args))
@@ -0,0 +1,40 @@
+"""
+parallel_slides_node 에서 슬라이드 작업이 실제로 겹쳐 실행되는지 확인.
+
+    python -m benchmarks.bench_slide_overlap [슬라이드 수] [호출 지연(초)]
+
+슬라이드마다 디자인 LLM → 이미지 설명 LLM → DALL·E 를 순서대로 호출하므로
+순차 실행이면 약 슬라이드 수 × 3 × 지연, 완전히 겹치면 약 3 × 지연이 걸린다.
+"""
+import asyncio
+import sys
+from time import perf_counter
+
+from benchmarks.fakes import install_fakes
+from backend.workflow import nodes
+from backend.workflow.llm_cache import llm_cache
+
+
+async def main(n_slides: int = 20, latency: float = 0.1):
+    install_fakes(latency=latency, image_latency=latency)
+    llm_cache.enabled = False
+
+    state = {
+        "slides": [f"# Slide {i}\n\n- point" for i in range(n_slides)],
+        "style": "modern",
+        "topic": "overlap",
+        "thread_id": "bench-overlap",
+    }
+    s = perf_counter()
+    await nodes.parallel_slides_node(state)
+    wall = perf_counter() - s
+
+    sequential = n_slides * 3 * latency
+    print(f"{n_slides} slides, {latency * 1000:.0f}ms per call")
+    print(f"wall={wall:.2f}s  sequential≈{sequential:.2f}s  fully overlapped≈{3 * latency:.2f}s")
+    print(f"overlap factor x{sequential / wall:.1f}")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    asyncio.run(main(int(args[0]) if args else 20, float(args[1]) if len(args) > 1 else 0.1))
@@ -0,0 +1,106 @@
+"""
+프레젠테이션 저장: 요청 처리 중 동기 저장 vs write-behind 묶음 저장.
+
+    python -m benchmarks.bench_storage [동시 요청 수] [MongoDB 왕복 지연(초)]
+
+- sync  : 예전처럼 async 핸들러 안에서 insert_one + 파일 쓰기 (이벤트 루프 차단)
+- async : save_presentation_async 로 대기열에 넣고 바로 반환, 파일/인덱스는 묶어서 기록
+요청 지연은 핸들러가 저장 단계에서 보낸 시간, round trips 는 MongoDB 호출 수.
+저장 후 history() 로 모든 버전이 인덱스에 남았는지도 확인한다.
+- flaky : 인덱스 쓰기가 두 번 실패 → 재시도로 모두 기록 (버전 번호 중복 없음)
+- outage: 재시도 횟수보다 오래 실패 → wait=True 저장은 예외, 실패한 기록은 보관했다가 flush() 때 다시 기록
+- down  : 저장소가 돌아오지 않은 채 종료 → flush() 가 기록하지 못한 수를 돌려준다 (종료 시 로그)
+"""
+import asyncio
+import sys
+from time import perf_counter
+
+from benchmarks.fakes import FakeMongoFileManager
+
+
+def _pct(samples, p):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * p))]
+
+
+async def _run(mode: str, n: int, latency: float):
+    fm = FakeMongoFileManager(latency=latency)
+    fm.save_presentation("warmup", "warmup")  # 인덱스 생성은 측정에서 제외
+
+    async def request(i: int):
+        # 모든 요청이 동시에 도착했다고 보고 도착 시점부터 저장 완료(응답 가능)까지 측정
+        content = f"---\nmarp: true\n---\n# deck {i}\n" + "slide body\n" * 200
+        if mode == "sync":
+            fm.save_presentation(f"t{i % 10}", content)
+        else:
+            await fm.save_presentation_async(f"t{i % 10}", content)
+        return perf_counter() - s
+
+    s = perf_counter()
+    latencies = await asyncio.gather(*(request(i) for i in range(n)))
+    respond = perf_counter() - s
+    await fm.flush()
+    durable = perf_counter() - s
+
+    versions = 0
+    for t in range(min(n, 10)):
+        versions += len(await fm.history(f"t{t}", limit=n))
+    trips = sum(c.round_trips for c in fm.db.values())
+    print(
+        f"{mode:>5}: p50={_pct(latencies, 0.5) * 1000:7.1f}ms  p99={_pct(latencies, 0.99) * 1000:7.1f}ms  "
+        f"all responded={respond:.3f}s  durable={durable:.3f}s  round trips={trips}  versions={versions}"
+    )
+    assert versions == n, f"expected {n} versions in the index, got {versions}"
+
+
+async def _failures(name: str, n: int, fail_inserts: int):
+    fm = FakeMongoFileManager()
+    fm.save_presentation("warmup", "warmup")
+    fm._versions.retry_backoff, fm._versions.requeue_delay = 0.01, 0.2
+    for c in fm.db.values():
+        c.fail_inserts = fail_inserts
+
+    saves = [fm.save_presentation_async(f"t{i % 10}", f"# deck {i}\n", wait=True) for i in range(n)]
+    results = await asyncio.gather(*saves, return_exceptions=True)
+    errors = sum(isinstance(r, Exception) for r in results)
+    after_failure = fm.stats()
+    unwritten = await fm.flush()  # 다시 넣기를 기다리던 기록도 바로 다시 시도 (종료 시와 같음)
+    assert unwritten == 0, f"{unwritten} records left after flush"
+
+    versions = []
+    for t in range(10):
+        versions += [(t, d["version"]) for d in await fm.history(f"t{t}", limit=n)]
+    print(f"{name:>6}: {fail_inserts} failed inserts -> {errors}/{n} saves reported failure, "
+          f"stats after failure={after_failure}, finally indexed={len(versions)}")
+    assert len(versions) == len(set(versions)) == n, "lost or duplicated versions"
+    return errors, after_failure
+
+
+async def _down(n: int):
+    fm = FakeMongoFileManager()
+    fm.save_presentation("warmup", "warmup")
+    fm._versions.retry_backoff = 0.001
+    for c in fm.db.values():
+        c.fail_inserts = 10 ** 9
+    await asyncio.gather(*(fm.save_presentation_async(f"t{i % 10}", f"# deck {i}\n") for i in range(n)))
+    unwritten = await fm.flush()
+    print(f"  down: storage never recovered -> flush() reports {unwritten}/{n} unwritten")
+    assert unwritten == n, unwritten
+
+
+async def main(n: int = 200, latency: float = 0.002):
+    print(f"{n} concurrent saves, {latency * 1000:.1f}ms per MongoDB round trip")
+    await _run("sync", n, latency)
+    await _run("async", n, latency)
+
+    errors, _ = await _failures("flaky", n, fail_inserts=2)
+    assert errors == 0
+    errors, stats = await _failures("outage", n, fail_inserts=8)
+    assert errors > 0 and stats["retrying"] == errors
+    await _down(n)
+    print("OK: every version written once, failures retried, reported and requeued; unwritten records reported on flush")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    asyncio.run(main(int(args[0]) if args else 200, float(args[1]) if len(args) > 1 else 0.002))
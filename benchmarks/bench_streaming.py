@@ -0,0 +1,62 @@
+"""
+디자인 / 요약 / 스크립트 응답 스트리밍: 첫 내용까지의 시간(TTFT) vs 완료 시간.
+
+    python -m benchmarks.bench_streaming [슬라이드 수] [호출 지연(초)]
+
+stream_presentation 으로 워크플로우를 끝까지 실행하면서 stream 별(slide-N / summary / narration)
+stream_start → 첫 token → stream_end 시각을 기록한다.
+- 스트리밍이 없으면 사용자는 stream_end(= 응답 완료) 시점에야 내용을 본다
+- token 조각을 이어 붙인 텍스트가 stream_end 의 텍스트 및 노드 출력(state)과 같은지 확인한다
+"""
+import asyncio
+import statistics
+import sys
+from time import perf_counter
+
+from benchmarks.fakes import install_fakes
+from backend.workflow import stream_presentation
+from backend.workflow.llm_cache import llm_cache
+
+
+async def main(slides: int = 10, latency: float = 1.0):
+    llm_cache.enabled = False
+    install_fakes(latency=latency, outline_items=slides, text_size=1200)
+    user_input = {"message": "deck", "topic": "streaming", "style": "modern", "skip_feedback": True}
+
+    streams, outputs = {}, {}
+    async for event in stream_presentation(user_input, "bench-streaming"):
+        now, kind = perf_counter(), event["event"]
+        if kind == "stream_start":
+            streams[event["stream"]] = {"start": now, "first": None, "text": ""}
+        elif kind == "token":
+            s = streams[event["stream"]]
+            s["first"] = s["first"] or now
+            s["text"] += event["delta"]
+        elif kind == "stream_end":
+            s = streams[event["stream"]]
+            s["end"] = now
+            assert s["text"] == event["text"], event["stream"]
+        elif kind == "node":
+            outputs.update(event["output"] or {})
+
+    print(f"{slides} slides, {latency * 1000:.0f}ms per call")
+    groups = {
+        "design": [s for name, s in streams.items() if name.startswith("slide-")],
+        "summary": [streams["summary"]],
+        "narration": [streams["narration"]],
+    }
+    for name, group in groups.items():
+        ttft = statistics.median(s["first"] - s["start"] for s in group)
+        done = statistics.median(s["end"] - s["start"] for s in group)
+        print(f"{name:<10} streams={len(group):>3}  first token={ttft * 1000:6.0f}ms  complete={done * 1000:6.0f}ms")
+        assert ttft < done / 2
+
+    assert len(groups["design"]) == slides
+    assert outputs["summary"] == streams["summary"]["text"]
+    assert outputs["script"] == streams["narration"]["text"]
+    print("OK: streamed text matches the final state")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    asyncio.run(main(*(int(a) for a in args[:1]), *(float(a) for a in args[1:2])))
@@ -0,0 +1,75 @@
+"""
+슬라이드 지정 피드백: 덱 전체 재생성 vs 지정한 개요만 재생성.
+
+    python -m benchmarks.bench_targeted_feedback [개요 수] [개요당 페이지] [호출 지연(초)]
+
+- full    : "modify ..." 피드백 → generate_outline 부터 다시 (새 개요로 모든 슬라이드 재작업)
+- targeted: {"feedback": ..., "slides": [3]} → 3번 슬라이드가 속한 개요만 refine → 분할 → 디자인/이미지
+피드백 라운드에서 추가로 발생한 LLM / 이미지 호출 수와 라운드 소요 시간을 비교하고,
+지정하지 않은 슬라이드는 초안 결과가 그대로 유지되는지 확인한다.
+"""
+import asyncio
+import sys
+from time import perf_counter
+
+from benchmarks.fakes import install_fakes
+from backend.workflow import event_bus, feedback_broker, generate_presentation
+from backend.workflow.llm_cache import llm_cache
+
+
+async def _run(thread_id: str, feedback, outlines: int, pages: int, latency: float):
+    fakes = install_fakes(latency=latency, image_latency=latency, outline_items=outlines, pages=pages,
+                          vary_outlines=True)
+    llm, llm_json, dalle = fakes["llm"], fakes["llm_json"], fakes["dalle"]
+    user_input = {"message": "deck", "topic": f"topic {thread_id}", "style": "modern"}
+    events = event_bus.subscribe(thread_id)
+    draft = {}
+
+    async def wait_for_feedback_prompt():
+        while (event := await events.get())["event"] != "feedback_wait":
+            if event["event"] == "slide":
+                draft[event["index"]] = event["markdown"]
+
+    # 초안이 나오고 피드백을 기다리는 시점부터 다음 피드백 대기까지가 한 라운드
+    task = asyncio.create_task(generate_presentation(user_input, thread_id))
+    await wait_for_feedback_prompt()
+    draft_slides = [draft[i] for i in sorted(draft)]
+    before = llm.total_calls + llm_json.total_calls, dalle.calls
+
+    s = perf_counter()
+    feedback_broker.publish(thread_id, feedback)
+    await wait_for_feedback_prompt()
+    round_time = perf_counter() - s
+    calls = llm.total_calls + llm_json.total_calls - before[0], dalle.calls - before[1]
+
+    feedback_broker.publish(thread_id, "looks good")
+    result = await task
+    event_bus.unsubscribe(thread_id, events)
+    final_slides = result["slides_marp"].split("\n---\n")[1:]  # 맨 앞은 Marp 헤더
+    return draft_slides, final_slides, round_time, calls
+
+
+async def main(outlines: int = 10, pages: int = 2, latency: float = 0.2):
+    llm_cache.enabled = False
+    print(f"{outlines} outlines x {pages} pages, {latency * 1000:.0f}ms per call")
+
+    _, _, t_full, c_full = await _run("bench-full", "please modify slide 3", outlines, pages, latency)
+    draft, final, t_targeted, c_targeted = await _run(
+        "bench-targeted", {"feedback": "make it shorter", "slides": [3]}, outlines, pages, latency
+    )
+    print(f"full    : round={t_full:.2f}s  llm calls={c_full[0]}  image calls={c_full[1]}")
+    print(f"targeted: round={t_targeted:.2f}s  llm calls={c_targeted[0]}  image calls={c_targeted[1]}  "
+          f"(x{t_full / t_targeted:.1f} faster)")
+
+    # 3번 슬라이드가 속한 개요의 슬라이드만 바뀌고 나머지는 초안 그대로
+    target = set(range((2 // pages) * pages, (2 // pages + 1) * pages))
+    changed = {i for i, (a, b) in enumerate(zip(draft, final)) if a.strip() != b.strip()}
+    assert len(final) == len(draft) == outlines * pages, (len(draft), len(final))
+    assert changed == target, (changed, target)
+    assert c_targeted == (1 + pages, 0), c_targeted  # refine 1 + 디자인 pages, 이미지는 같은 개념이라 재사용
+    print(f"OK: only slides {sorted(i + 1 for i in target)} were regenerated")
+
+
+if __name__ == "__main__":
+    args = sys.argv[1:]
+    asyncio.run(main(*(int(a) for a in args[:2]), *(float(a) for a in args[2:3])))
@@ -0,0 +1,183 @@
+"""
+오프라인 end-to-end 벤치마크: 가짜 LLM / 이미지 / 저장소로 전체 워크플로우 그래프를 실행.
+
+    python -m benchmarks.bench_workflow [--slides 5,20,50,200] [--sessions 1,10,100]
+                                        [--latency 0.05] [--image-latency 0.2] [--text-size 400]
+                                        [--out results.json] [--compare baseline.json]
+
+(덱 크기 × 동시 세션 수) 조합마다 generate_presentation 을 세션 수만큼 동시에 실행하고
+처리량, 세션 지연 백분위, tracemalloc 최대 메모리, 프로세스 RSS 최대치를 기록한다.
+결과는 JSON 으로 저장되며, --compare 로 이전 결과와 조합별 변화율을 비교할 수 있다.
+tracemalloc 은 실행 속도를 늦추므로 처리량만 볼 때는 --no-tracemalloc 을 사용한다.
+"""
+import argparse
+import asyncio
+import gc
+import json
+import platform
+import resource
+import subprocess
+import sys
+import time
+import tracemalloc
+from time import perf_counter
+
+from benchmarks.fakes import install_fakes
+from backend.workflow import generate_presentation
+from backend.workflow.llm_cache import llm_cache
+from backend.workflow.scheduler import scheduler
+
+
+def _pct(samples, p):
+    samples = sorted(samples)
+    return samples[min(len(samples) - 1, int(len(samples) * p))] if samples else 0.0
+
+
+def _deck_shape(slides: int):
+    """슬라이드 수를 (개요 항목 수, 항목당 페이지 수) 로 분해 (항목은 최대 20개)"""
+    pages = max(1, -(-slides // 20))
+    return max(1, slides // pages), pages
+
+
+def _git_rev() -> str:
+    try:
+        return subprocess.check_output(["git", "rev-parse", "--short", "HEAD"], text=True).strip()
+    except Exception:
+        return "unknown"
+
+
+async def run_scenario(slides: int, sessions: int, args, seq: int):
+    items, pages = _deck_shape(slides)
+    fakes = install_fakes(
+        latency=args.latency, image_latency=args.image_latency,
+        outline_items=items, pages=pages, text_size=args.text_size,
+    )
+
+    async def session(i: int):
+        s = perf_counter()
+        result = await generate_presentation(
+            {"message": f"deck {i}", "topic": f"topic {seq}-{i}", "style": "modern", "skip_feedback": True},
+            thread_id=f"bench-{seq}-{i}",
+        )
+        return perf_counter() - s, result
+
+    gc.collect()
+    if args.tracemalloc:
+        tracemalloc.start()
+    s = perf_counter()
+    results = await asyncio.gather(*(session(i) for i in range(sessions)))
+    wall = perf_counter() - s
+    peak = tracemalloc.get_traced_memory()[1] if args.tracemalloc else 0
+    if args.tracemalloc:
+        tracemalloc.stop()
+
+    latencies = [lat for lat, _ in results]
+    produced = [r.get("metrics", {}).get("slides", 0) for _, r in results]
+    failed = sum(1 for _, r in results if "slides_marp" not in r)
+    return {
+        "slides": slides,
+        "sessions": sessions,
+        "slides_per_deck": round(sum(produced) / len(produced), 1),
+        "failed": failed,
+        "wall_sec": round(wall, 4),
+        "decks_per_sec": round(sessions / wall, 3),
+        "slides_per_sec": round(sum(produced) / wall, 2),
+        "latency_sec": {
+            "p50": round(_pct(latencies, 0.5), 4),
+            "p90": round(_pct(latencies, 0.9), 4),
+            "p99": round(_pct(latencies, 0.99), 4),
+            "max": round(max(latencies), 4),
+        },
+        "tracemalloc_peak_mb": round(peak / 2**20, 2),
+        # ru_maxrss 는 프로세스 전체의 최대치 (Linux: KB 단위) 이므로 조합 간에 단조 증가한다
+        "rss_max_mb": round(resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024, 1),
+        "llm_calls": dict(fakes["llm"].calls + fakes["llm_json"].calls),
+        "image_calls": fakes["dalle"].calls,
+    }
+
+
+def compare(current, baseline):
+    """같은 (slides, sessions) 조합끼리 처리량 / p99 / 메모리 변화율 출력"""
+    base = {(r["slides"], r["sessions"]): r for r in baseline["scenarios"]}
+    print(f"\nvs {baseline['meta'].get('git_rev', '?')}:")
+    for r in current["scenarios"]:
+        b = base.get((r["slides"], r["sessions"]))
+        if not b:
+            continue
+
+        def delta(new, old):
+            return f"{(new - old) / old * 100:+.1f}%" if old and new else "n/a"
+
+        print(
+            f"  slides={r['slides']:>4} sessions={r['sessions']:>4}  "
+            f"throughput {delta(r['slides_per_sec'], b['slides_per_sec'])}  "
+            f"p99 {delta(r['latency_sec']['p99'], b['latency_sec']['p99'])}  "
+            f"peak mem {delta(r['tracemalloc_peak_mb'], b['tracemalloc_peak_mb'])}"
+        )
+
+
+async def main(args):
+    # 세션마다 주제가 달라도 가짜 응답이 같으면 캐시가 결과를 왜곡하므로 기본은 끔
+    llm_cache.enabled = args.cache
+    scheduler.max_in_flight = args.max_in_flight
+
+    scenarios = []
+    seq = 0
+    for slides in args.slides:
+        for sessions in args.sessions:
+            seq += 1
+            r = await run_scenario(slides, sessions, args, seq)
+            scenarios.append(r)
+            print(
+                f"slides={slides:>4} sessions={sessions:>4}  wall={r['wall_sec']:.2f}s  "
+                f"{r['slides_per_sec']:.1f} slides/s  p50={r['latency_sec']['p50']:.2f}s  "
+                f"p99={r['latency_sec']['p99']:.2f}s  peak={r['tracemalloc_peak_mb']:.1f}MB  "
+                f"failed={r['failed']}",
+                flush=True,
+            )
+
+    report = {
+        "meta": {
+            "timestamp": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "git_rev": _git_rev(),
+            "python": platform.python_version(),
+            "latency": args.latency,
+            "image_latency": args.image_latency,
+            "text_size": args.text_size,
+            "max_in_flight": args.max_in_flight,
+            "cache": args.cache,
+            "tracemalloc": args.tracemalloc,
+        },
+        "scenarios": scenarios,
+    }
+    if args.out:
+        with open(args.out, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"wrote {args.out}")
+    if args.compare:
+        with open(args.compare, encoding="utf-8") as f:
+            compare(report, json.load(f))
+    return report
+
+
+def _ints(value: str):
+    return [int(v) for v in value.split(",") if v]
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description="Offline end-to-end workflow benchmark")
+    parser.add_argument("--slides", type=_ints, default=[5, 20, 50, 200])
+    parser.add_argument("--sessions", type=_ints, default=[1, 10, 100])
+    parser.add_argument("--latency", type=float, default=0.05, help="가짜 LLM 호출 지연(초)")
+    parser.add_argument("--image-latency", type=float, default=0.2, help="가짜 이미지 생성 지연(초)")
+    parser.add_argument("--text-size", type=int, default=400, help="가짜 LLM 응답 길이(문자)")
+    parser.add_argument("--max-in-flight", type=int, default=scheduler.max_in_flight)
+    parser.add_argument("--cache", action="store_true", help="LLM 캐시 사용")
+    parser.add_argument("--no-tracemalloc", dest="tracemalloc", action="store_false")
+    parser.add_argument("--out", help="결과 JSON 경로")
+    parser.add_argument("--compare", help="비교할 이전 결과 JSON")
+    return parser.parse_args(argv)
+
+
+if __name__ == "__main__":
+    asyncio.run(main(parse_args(sys.argv[1:])))
@@ -0,0 +1,251 @@
+"""
+벤치마크용 가짜 LLM / DALL·E / 저장소.
+실제 API나 MongoDB 없이 워크플로우를 끝까지 실행하고 호출 횟수를 센다.
+"""
+import asyncio
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+from collections import Counter, defaultdict
+
+# 실제 클라이언트는 쓰지 않지만, 실수로 만들어져도 설정 오류 없이 동작하도록 더미 값으로 채움
+os.environ.setdefault("OPENAI_API_KEY", "sk-bench")
+os.environ.setdefault("DB_NAME", "bench")
+os.environ.setdefault("COLLECTION_NAME", "bench")
+os.environ.setdefault("CHECKPOINT_BACKEND", "memory")
+os.environ.setdefault("LLM_CACHE_PATH", os.path.join(tempfile.mkdtemp(prefix="bench-"), "llm_cache.sqlite"))
+
+
+class FakeMessage:
+    def __init__(self, content: str):
+        self.content = content
+
+
+# 프롬프트 앞부분 → 호출 종류 (agents.py 의 프롬프트 기준)
+PROMPT_KINDS = [
+    ("Expand and enrich", "refine"),
+    ("Apply a ", "design"),
+    ("Create a detailed description", "image_prompt"),
+    ("Generate a concise summary", "summary"),
+    ("Write a professional", "narration"),
+    ("Condense the following", "condense"),
+]
+
+
+class FakeChatModel:
+    """프롬프트 종류에 따라 정해진 응답을 돌려주는 ChatOpenAI 대역"""
+
+    def __init__(self, latency: float = 0.0, outline_items: int = 5, pages: int = 1,
+                 text_size: int = 400, vary_outlines: bool = False, jitter: float = 0.0,
+                 broken_items=(), temperature: float = 0.7, model_kwargs=None):
+        self.latency = latency
+        # 호출마다 지연을 latency × (1 ~ 1 + jitter) 로 흩뜨림 (프롬프트 기준으로 결정적)
+        self.jitter = jitter
+        self.broken_items = tuple(broken_items)  # 개요 응답에서 깨뜨릴 항목 번호 (1부터)
+        self.outline_items = outline_items
+        self.pages = pages
+        self.text_size = text_size
+        # True면 개요 내용이 프롬프트(사용자 메시지/피드백 포함)에 따라 달라짐 (실제 LLM처럼)
+        self.vary_outlines = vary_outlines
+        self.model_name = "fake-chat"
+        self.temperature = temperature
+        self.model_kwargs = model_kwargs or {}
+        self.calls = Counter()
+        self.prompts = {}  # 종류별 마지막 프롬프트
+
+    def _respond(self, prompt: str) -> str:
+        if "JSON array of outline items" in prompt:
+            self.calls["outline"] += 1
+            variant = " " + hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:6] if self.vary_outlines else ""
+            items = [json.dumps(self._outline_item(i, variant)) for i in range(1, self.outline_items + 1)]
+            for i in self.broken_items:  # 고칠 수 없게 깨진 항목 (그 항목만 다시 요청되어야 함)
+                items[i - 1] = '{"title": "Section %d", "content": <<truncated>>}' % i
+            return '{"outlines": [' + ", ".join(items) + "]}"
+        if "JSON object for outline item" in prompt:
+            self.calls["outline_item"] += 1
+            index = int(re.search(r"outline item #(\d+)", prompt).group(1))
+            return json.dumps(self._outline_item(index, ""))
+        if prompt.startswith("Does the following outline"):
+            self.calls["relevance"] += 1
+            return "Yes"
+        kind = next((k for prefix, k in PROMPT_KINDS if prompt.startswith(prefix)), "other")
+        self.calls[kind] += 1
+        self.prompts[kind] = prompt
+        # 프롬프트마다 다른 (하지만 결정적인) 응답
+        tag = hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:8]
+        text = (f"{kind} {tag} " + "lorem ipsum " * (self.text_size // 12 + 1))[: self.text_size]
+        # 실제 응답처럼 여러 줄 (슬라이드 분할이 줄 단위), 줄마다 달라져야 분할된 슬라이드도 모두 바뀜
+        words = text.split(" ")
+        return "\n".join(f"{tag} " + " ".join(words[i: i + 8]) for i in range(0, len(words), 8))
+
+    def _outline_item(self, i: int, variant: str) -> dict:
+        return {
+            "title": f"Section {i}",
+            "content": "\n".join(f"- point {i}.{j}{variant}" for j in range(self.pages * 3)),
+            "images": 1,
+            "image_positions": ["right"],
+            "pages": self.pages,
+        }
+
+    @property
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+    def _delay(self, prompt: str) -> float:
+        if not self.jitter:
+            return self.latency
+        spread = int(hashlib.sha256(prompt.encode("utf-8")).hexdigest()[:4], 16) / 0xFFFF
+        return self.latency * (1 + self.jitter * spread)
+
+    def invoke(self, prompt: str) -> FakeMessage:
+        time.sleep(self._delay(prompt))
+        return FakeMessage(self._respond(prompt))
+
+    async def ainvoke(self, prompt: str) -> FakeMessage:
+        await asyncio.sleep(self._delay(prompt))
+        return FakeMessage(self._respond(prompt))
+
+    async def astream(self, prompt: str):
+        # 전체 지연을 조각 수만큼 나눠, 첫 조각은 지연의 일부만 지나면 도착
+        delay = self._delay(prompt)
+        text = self._respond(prompt)
+        pieces = [text[i: i + 16] for i in range(0, len(text), 16)] or [""]
+        for piece in pieces:
+            await asyncio.sleep(delay / len(pieces))
+            yield FakeMessage(piece)
+
+
+class FakeDalle:
+    """AsyncImageGenerator 대역"""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.model_name = "fake-dalle"
+        self.calls = 0
+
+    async def arun(self, description: str) -> str:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        return f"https://images.invalid/{self.calls}.png"
+
+
+class FakeImageStore:
+    """ImageStore 를 임시 디렉터리에 두고, 다운로드 대신 URL 기반의 가짜 바이트를 저장"""
+
+    def __new__(cls):
+        from backend.storage.image_store import ImageStore
+
+        class _Store(ImageStore):
+            async def put_from_url(self, image_url, keys=()):
+                data = image_url.encode("utf-8")
+                digest = hashlib.sha256(data).hexdigest()
+                with open(self.path(digest), "wb") as f:
+                    f.write(data)
+                self._register(digest, len(data))
+                if keys:
+                    await self.link(digest, *keys)
+                return digest
+
+        return _Store(base_dir=tempfile.mkdtemp(prefix="bench-images-"))
+
+
+class FakeCollection:
+    """pymongo Collection 대역 (벤치마크에서 쓰는 메서드만, 호출마다 왕복 지연 latency 초)"""
+
+    def __init__(self, latency: float = 0.0):
+        self.latency = latency
+        self.docs = []
+        self.round_trips = 0
+        self.fail_inserts = 0  # 다음 insert_many 몇 번을 실패시킬지 (장애 재현용)
+
+    def _rtt(self):
+        self.round_trips += 1
+        time.sleep(self.latency)
+
+    def create_index(self, *args, **kwargs):
+        self._rtt()
+
+    def insert_one(self, doc):
+        self._rtt()
+        self.docs.append(dict(doc))
+
+    def insert_many(self, docs, ordered=True):
+        self._rtt()
+        if self.fail_inserts:
+            from pymongo.errors import AutoReconnect
+
+            self.fail_inserts -= 1
+            raise AutoReconnect("fake primary stepped down")
+        self.docs.extend(dict(d) for d in docs)
+
+    def find_one_and_update(self, query, update, upsert=False, return_document=None):
+        self._rtt()
+        doc = next((d for d in self.docs if d["_id"] == query["_id"]), None)
+        if doc is None:
+            doc = {"_id": query["_id"], "seq": 0}
+            self.docs.append(doc)
+        for k, v in update["$inc"].items():
+            doc[k] = doc.get(k, 0) + v
+        return dict(doc)
+
+    def _match(self, query):
+        return [d for d in self.docs if all(d.get(k) == v for k, v in query.items())]
+
+    def find(self, query, projection=None):
+        self._rtt()
+        return _FakeCursor(self._match(query))
+
+    def find_one(self, query, projection=None, sort=None):
+        docs = self.find(query).sort(*sort[0]).docs if sort else self.find(query).docs
+        return docs[0] if docs else None
+
+
+class _FakeCursor:
+    def __init__(self, docs):
+        self.docs = docs
+
+    def sort(self, key, direction=1):
+        self.docs = sorted(self.docs, key=lambda d: d.get(key), reverse=direction < 0)
+        return self
+
+    def limit(self, n):
+        self.docs = self.docs[:n]
+        return self
+
+    def __iter__(self):
+        return iter(self.docs)
+
+
+class FakeMongoFileManager:
+    """실제 FileManager 에 MongoDB 대신 메모리 컬렉션을 붙여 만든다 (파일은 임시 디렉터리)"""
+
+    def __new__(cls, latency: float = 0.0):
+        from backend.storage.file_manager import FileManager
+
+        collections = defaultdict(lambda: FakeCollection(latency))
+
+        class _FileManager(FileManager):
+            @property
+            def db(self):
+                return collections
+
+        base = tempfile.mkdtemp(prefix="bench-storage-")
+        return _FileManager(presentations_dir=os.path.join(base, "presentations"))
+
+
+def install_fakes(latency: float = 0.0, image_latency: float = 0.0, **chat_kwargs):
+    """workflow 모듈의 LLM/DALL·E/저장소를 가짜 객체로 교체하고 반환"""
+    from backend.workflow import agents, nodes
+
+    llm = FakeChatModel(latency=latency, **chat_kwargs)
+    llm_json = FakeChatModel(latency=latency, temperature=0,
+                             model_kwargs={"response_format": {"type": "json_object"}}, **chat_kwargs)
+    dalle = FakeDalle(latency=image_latency)
+    image_store = FakeImageStore()
+
+    agents.configure_providers(llm=llm, llm_json=llm_json, image=dalle)
+    nodes.configure_storage(image_store=image_store)
+    return {"llm": llm, "llm_json": llm_json, "dalle": dalle, "image_store": image_store}